@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__-based instances.
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
 from openmail.email_query import EmailQuery
 from openmail.imap import IMAPQuery
+from openmail.imap.query import _imap_date, _q
 from openmail.llm import get_model
 
 if TYPE_CHECKING:
@@ -517,110 +519,106 @@ User request:
 """
 
 
-def _apply_imap_clauses(q: IMAPQuery, c: IMAPClauses) -> None:
+# (clause field, SEARCH key) tables; order matches the emitted criteria
+_TEXT_KEYS = (
+    ("from_", "FROM"),
+    ("to", "TO"),
+    ("cc", "CC"),
+    ("bcc", "BCC"),
+    ("subject", "SUBJECT"),
+    ("text", "TEXT"),
+    ("body", "BODY"),
+)
+_DATE_KEYS = (
+    ("since", "SINCE"),
+    ("before", "BEFORE"),
+    ("on", "ON"),
+    ("sent_since", "SENTSINCE"),
+    ("sent_before", "SENTBEFORE"),
+    ("sent_on", "SENTON"),
+)
+_FLAG_KEYS = tuple(
+    (name, name.upper())
+    for name in (
+        "seen",
+        "unseen",
+        "answered",
+        "unanswered",
+        "flagged",
+        "unflagged",
+        "deleted",
+        "undeleted",
+        "draft",
+        "undraft",
+        "recent",
+        "new",
+    )
+)
+
+
+def _clause_tokens(c: IMAPClauses) -> List[str]:
     """
-    Apply the low-level IMAPQuery part of one clause to an IMAPQuery instance.
+    Emit the SEARCH tokens for the low-level part of one clause directly,
+    without going through the IMAPQuery builder methods.
     """
+    out: List[str] = []
 
     # basic positive fields
-    for s in c.from_:
-        q.from_(s)
-    for s in c.to:
-        q.to(s)
-    for s in c.cc:
-        q.cc(s)
-    for s in c.bcc:
-        q.bcc(s)
-    for s in c.subject:
-        q.subject(s)
-    for s in c.text:
-        q.text(s)
-    for s in c.body:
-        q.body(s)
+    for attr, key in _TEXT_KEYS:
+        for s in getattr(c, attr):
+            out += [key, _q(s)]
     for hf in c.header:
         if hf.name and hf.value:
-            q.header(hf.name, hf.value)
+            out += ["HEADER", _q(hf.name), _q(hf.value)]
 
     # dates
-    if c.since:
-        q.since(c.since)
-    if c.before:
-        q.before(c.before)
-    if c.on:
-        q.on(c.on)
-    if c.sent_since:
-        q.sent_since(c.sent_since)
-    if c.sent_before:
-        q.sent_before(c.sent_before)
-    if c.sent_on:
-        q.sent_on(c.sent_on)
+    for attr, key in _DATE_KEYS:
+        value = getattr(c, attr)
+        if value:
+            out += [key, _imap_date(value)]
 
     # flags
     f = c.flags
-    if f.seen:
-        q.seen()
-    if f.unseen:
-        q.unseen()
-    if f.answered:
-        q.answered()
-    if f.unanswered:
-        q.unanswered()
-    if f.flagged:
-        q.flagged()
-    if f.unflagged:
-        q.unflagged()
-    if f.deleted:
-        q.deleted()
-    if f.undeleted:
-        q.undeleted()
-    if f.draft:
-        q.draft()
-    if f.undraft:
-        q.undraft()
-    if f.recent:
-        q.recent()
-    if f.new:
-        q.new()
+    out += [key for attr, key in _FLAG_KEYS if getattr(f, attr)]
 
     # size
     if c.larger is not None:
-        q.larger(c.larger)
+        out += ["LARGER", str(c.larger)]
     if c.smaller is not None:
-        q.smaller(c.smaller)
+        out += ["SMALLER", str(c.smaller)]
 
     # keyword / unkeyword
     for kw in c.keyword:
-        q.keyword(kw)
+        out += ["KEYWORD", _q(kw)]
     for kw in c.unkeyword:
-        q.unkeyword(kw)
+        out += ["UNKEYWORD", _q(kw)]
 
     # uid
     if c.uid:
-        q.uid(*c.uid)
+        out += ["UID", ",".join(map(str, c.uid))]
 
     # excludes
     ex = c.excludes
-    for s in ex.from_:
-        q.exclude_from(s)
-    for s in ex.to:
-        q.exclude_to(s)
-    for s in ex.cc:
-        q.exclude_cc(s)
-    for s in ex.bcc:
-        q.exclude_bcc(s)
-    for s in ex.subject:
-        q.exclude_subject(s)
+    for attr, key in _TEXT_KEYS[:5]:
+        for s in getattr(ex, attr):
+            out += ["NOT", key, _q(s)]
     for hf in ex.header:
         if hf.name and hf.value:
-            q.exclude_header(hf.name, hf.value)
-    for s in ex.text:
-        q.exclude_text(s)
-    for s in ex.body:
-        q.exclude_body(s)
+            out += ["NOT", "HEADER", _q(hf.name), _q(hf.value)]
+    for attr, key in _TEXT_KEYS[5:]:
+        for s in getattr(ex, attr):
+            out += ["NOT", key, _q(s)]
 
     # clause-local raw tokens
-    if c.raw_tokens:
-        q.raw(*c.raw_tokens)
+    out += c.raw_tokens
+    return out
+
+
+def _apply_imap_clauses(q: IMAPQuery, c: IMAPClauses) -> None:
+    """
+    Apply the low-level IMAPQuery part of one clause to an IMAPQuery instance.
+    """
+    q.raw(*_clause_tokens(c))
 
 
 def _apply_clause_to_easy(easy: EmailQuery, c: IMAPClauses) -> None:
@@ -679,6 +677,18 @@ def _apply_low_level_to_easy_query(easy: EmailQuery, low: IMAPLowLevelPlan) -> N
         easy.raw(*low.raw_tokens)
 
 
+@lru_cache(maxsize=128)
+def _compile_plan(plan_json: str) -> Tuple[str, ...]:
+    """
+    Compile a serialized IMAPLowLevelPlan into its final SEARCH tokens.
+    Cached, so asking the same question again skips the plan walk entirely.
+    """
+    plan = IMAPLowLevelPlan.model_validate_json(plan_json)
+    scratch = EmailQuery(None, "INBOX")
+    _apply_low_level_to_easy_query(scratch, plan)
+    return tuple(scratch.query.parts)
+
+
 def llm_easy_imap_query_from_nl(
     user_request: str,
     *,
@@ -694,6 +704,6 @@ def llm_easy_imap_query_from_nl(
     result, llm_call_info = chain(EMAIL_IMAP_QUERY_PROMPT.format(user_request=user_request))
     plan = result
     easy = EmailQuery(manager=None, mailbox=mailbox)
-    _apply_low_level_to_easy_query(easy, plan)
+    easy.query = IMAPQuery(parts=list(_compile_plan(plan.model_dump_json())))
 
     return easy, llm_call_info
@@ -8,18 +8,15 @@ from openmail.llm import get_model
 from openmail.models import EmailMessage
 from openmail.utils import build_email_context
 
+# Stable parts first (instructions, then the email being answered), so
+# repeated refinements of one reply share a byte-identical prompt prefix
+# that provider-side prompt caching can reuse. Per-turn fields go last.
 EMAIL_REPLY_PROMPT = """
 You are an assistant that drafts concise, polite email replies.
 
-The previous suggested reply (for reference or editing):
-{previous_reply}
-
-The user's instruction about how to change or generate the reply:
-{reply_context}
-
 Instructions (follow all):
 - Either improve/refine the previous reply, or write a new one if needed.
-- Follow the user's instruction above as much as possible.
+- Follow the user's instruction below as much as possible.
 - Be professional but friendly.
 - Keep it short and to the point.
 - Do NOT explain what you are doing.
@@ -27,6 +24,12 @@ Instructions (follow all):
 
 Email context:
 {email_context}
+
+The previous suggested reply (for reference or editing):
+{previous_reply}
+
+The user's instruction about how to change or generate the reply:
+{reply_context}
 """
 
 
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import base64
-from dataclasses import dataclass
-from typing import Callable
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Tuple
 
+from openmail._compat import DATACLASS_SLOTS
 from openmail.auth.base import AuthContext
 from openmail.errors import AuthError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class OAuth2Auth:
     """
     XOAUTH2-based auth. You provide a function that returns a fresh access token.
@@ -18,16 +19,35 @@ class OAuth2Auth:
     username: str
     token_provider: Callable[..., str]
 
+    # (token, raw XOAUTH2 bytes, base64 of it); providers usually hand back the
+    # same token until it expires, so reconnects can skip re-encoding.
+    _cached: Optional[Tuple[str, bytes, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def _raw_xoauth2(self, access_token: str) -> str:
         return f"user={self.username}\x01auth=Bearer {access_token}\x01\x01"
 
+    def _xoauth2(self, access_token: str) -> Tuple[bytes, str]:
+        """
+        Return (raw bytes, base64 str) of the XOAUTH2 initial response for `access_token`.
+        """
+        cached = self._cached
+        if cached is not None and cached[0] == access_token:
+            return cached[1], cached[2]
+
+        raw = self._raw_xoauth2(access_token).encode("utf-8")
+        b64 = base64.b64encode(raw).decode("ascii")
+        object.__setattr__(self, "_cached", (access_token, raw, b64))
+        return raw, b64
+
     def apply_imap(self, conn, ctx: AuthContext) -> None:
         try:
             token = self.token_provider()
             if not token:
                 raise AuthError("OAuth2 token provider returned empty token")
 
-            auth_bytes = self._raw_xoauth2(token).encode("utf-8")
+            auth_bytes, _ = self._xoauth2(token)
 
             def auth_cb(_):
                 return auth_bytes
@@ -48,8 +68,7 @@ class OAuth2Auth:
             if not token:
                 raise AuthError("OAuth2 token provider returned empty token")
 
-            raw = self._raw_xoauth2(token)
-            auth_b64 = base64.b64encode(raw.encode("utf-8")).decode("ascii")
+            _, auth_b64 = self._xoauth2(token)
 
             code, resp = server.docmd("AUTH", "XOAUTH2 " + auth_b64)
             if code != 235:
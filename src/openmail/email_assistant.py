@@ -23,6 +23,7 @@ from openmail.assistants import (
     llm_translate_email,
 )
 from openmail.email_query import EmailQuery
+from openmail.llm import clear_model_cache
 from openmail.models import EmailMessage, Task
 
 
@@ -416,3 +417,17 @@ class EmailAssistant:
             provider=provider,
             model_name=model_name,
         )
+
+    def close(self) -> None:
+        """
+        Release the cached LLM chains. They are shared process-wide and
+        rebuilt on the next call, so this is only worth it when done
+        with the assistant for good.
+        """
+        clear_model_cache()
+
+    def __enter__(self) -> EmailAssistant:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -4,7 +4,8 @@ import html as _html
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from email.message import EmailMessage as PyEmailMessage
-from typing import Dict, List, Optional, Sequence, Set
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
 
 from openmail.imap import IMAPClient, PagedSearchResult
 from openmail.imap.query import IMAPQuery
@@ -17,7 +18,7 @@ from openmail.models import (
 )
 from openmail.smtp import SMTPClient
 from openmail.subscription import SubscriptionDetector, SubscriptionService
-from openmail.types import EmailRef, SendResult
+from openmail.types import EmailRef, EmailRefBatch, SendResult
 from openmail.utils import (
     build_references,
     dedup_addrs,
@@ -41,11 +42,26 @@ DELETED = r"\Deleted"
 DRAFT = r"\Draft"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class EmailManager:
+    """
+    Facade over one SMTPClient and one IMAPClient.
+
+    Compared and hashed by identity: it wraps live connections, and the
+    generated field-wise __hash__ would fail on the (unhashable) clients.
+    """
+
     smtp: SMTPClient
     imap: IMAPClient
 
+    @cached_property
+    def _subscription_detector(self) -> SubscriptionDetector:
+        return SubscriptionDetector(self.imap)
+
+    @cached_property
+    def _subscription_service(self) -> SubscriptionService:
+        return SubscriptionService(self.smtp)
+
     def _set_body(
         self,
         msg: PyEmailMessage,
@@ -584,13 +600,11 @@ class EmailManager:
                     q2 = IMAPQuery().raw("X-GM-THRID", thrid)
                     if date:
                         q2.and_(q)
-                    uids = self.imap.uid_search(mailbox=mailbox, query=q2)
-                    if not uids:
-                        return []
-                    # newest 20
-                    uids = sorted(uids)
-                    refs = [EmailRef(uid=u, mailbox=mailbox) for u in reversed(uids)]
-                    return self.imap.fetch(refs, include_attachment_meta=include_attachment_meta)
+                    return self.imap.search_and_fetch(
+                        mailbox=mailbox,
+                        query=q2,
+                        include_attachment_meta=include_attachment_meta,
+                    )
         except Exception:
             # if anything odd with capabilities/thrid, fall back
             pass
@@ -604,24 +618,25 @@ class EmailManager:
         end = root.uid + window
         q_thread.uid(f"{start}:{end}")
 
-        uids = self.imap.uid_search(mailbox=mailbox, query=q_thread)
-        if not uids:
+        messages = self.imap.search_and_fetch(
+            mailbox=mailbox,
+            query=q_thread,
+            include_attachment_meta=include_attachment_meta,
+        )
+        if not messages:
             return [
                 self.fetch_message_by_ref(root, include_attachment_meta=include_attachment_meta)
             ]
+        return messages
 
-        uids = sorted(uids)
-        refs = [EmailRef(uid=u, mailbox=mailbox) for u in reversed(uids)]
-        return self.imap.fetch(refs, include_attachment_meta=include_attachment_meta)
-
-    def add_flags(self, refs: Sequence[EmailRef], flags: Set[str]) -> None:
-        """Bulk add flags to refs."""
+    def add_flags(self, refs: Union[Sequence[EmailRef], EmailRefBatch], flags: Set[str]) -> None:
+        """Bulk add flags to refs (a list of EmailRef or an EmailRefBatch)."""
         if not refs:
             return
         self.imap.add_flags(refs, flags=set(flags))
 
-    def remove_flags(self, refs: Sequence[EmailRef], flags: Set[str]) -> None:
-        """Bulk remove flags from refs."""
+    def remove_flags(self, refs: Union[Sequence[EmailRef], EmailRefBatch], flags: Set[str]) -> None:
+        """Bulk remove flags from refs (a list of EmailRef or an EmailRefBatch)."""
         if not refs:
             return
         self.imap.remove_flags(refs, flags=set(flags))
@@ -630,30 +645,25 @@ class EmailManager:
         self.add_flags(refs, {SEEN})
 
     def mark_all_seen(self, mailbox: str = "INBOX", *, chunk_size: int = 500) -> int:
-        total = 0
-
-        # Build a reusable EmailQuery for UNSEEN messages in this mailbox
-        q = self.imap_query(mailbox).limit(chunk_size)
-        q.query.unseen()
-
-        before_uid: Optional[int] = None
-
-        while True:
-            page = q.search(before_uid=before_uid)
-
-            refs = page.refs
-            if not refs:
-                break
-
-            self.add_flags(refs, {SEEN})
-            total += len(refs)
+        """
+        Mark every UNSEEN message in `mailbox` as seen.
 
-            if not page.has_next or page.next_before_uid is None:
-                break
+        Runs a single UID SEARCH UNSEEN, then sets \\Seen with at most
+        `chunk_size` UIDs per command; the search and the pipelined STOREs
+        share one connection and one read-write SELECT.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
 
-            before_uid = page.next_before_uid
+        query = IMAPQuery().unseen()
+        with self.imap.session(mailbox, readonly=False):
+            uids = self.imap.uid_search(mailbox=mailbox, query=query)
+            if not uids:
+                return 0
 
-        return total
+            batch = EmailRefBatch.from_uids(uids, mailbox=mailbox)
+            self.imap.add_flags(batch, flags={SEEN}, chunk_size=chunk_size)
+        return len(batch)
 
     def mark_unseen(self, refs: Sequence[EmailRef]) -> None:
         self.remove_flags(refs, {SEEN})
@@ -678,11 +688,12 @@ class EmailManager:
     def undelete(self, refs: Sequence[EmailRef]) -> None:
         self.remove_flags(refs, {DELETED})
 
-    def expunge(self, mailbox: str = "INBOX") -> None:
+    def expunge(self, mailbox: str = "INBOX", refs: Optional[Sequence[EmailRef]] = None) -> None:
         """
         Permanently remove messages flagged as \\Deleted.
+        With `refs`, only those (requires server UIDPLUS).
         """
-        self.imap.expunge(mailbox)
+        self.imap.expunge(mailbox, refs)
 
     def list_mailboxes(self) -> List[str]:
         """
@@ -698,7 +709,7 @@ class EmailManager:
 
     def move(
         self,
-        refs: Sequence[EmailRef],
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
         *,
         src_mailbox: str,
         dst_mailbox: str,
@@ -712,7 +723,7 @@ class EmailManager:
 
     def copy(
         self,
-        refs: Sequence[EmailRef],
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
         *,
         src_mailbox: str,
         dst_mailbox: str,
@@ -747,8 +758,7 @@ class EmailManager:
         """
         Returns emails that expose List-Unsubscribe.
         """
-        detector = SubscriptionDetector(self.imap)
-        return detector.find(
+        return self._subscription_detector.find(
             mailbox=mailbox,
             limit=limit,
             since=since,
@@ -757,7 +767,7 @@ class EmailManager:
 
     def unsubscribe_selected(
         self,
-        candidates: Sequence[UnsubscribeCandidate],
+        candidates: Iterable[UnsubscribeCandidate],
         *,
         prefer: str = "mailto",
         from_addr: Optional[str] = None,
@@ -765,9 +775,8 @@ class EmailManager:
         """
         Delegates unsubscribe execution to SubscriptionService.
         """
-        service = SubscriptionService(self.smtp)
-        return service.unsubscribe(
-            list(candidates),
+        return self._subscription_service.unsubscribe(
+            candidates,
             prefer=prefer,
             from_addr=from_addr,
         )
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List, Optional
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
 
+from openmail.errors import IMAPError
 from openmail.imap import IMAPQuery, PagedSearchResult
+from openmail.logger import get_logger
 from openmail.models import EmailMessage, EmailOverview
+from openmail.types import EmailRef
 from openmail.utils import iso_days_ago
 
 if TYPE_CHECKING:
     from openmail.email_manager import EmailManager
 
+logger = get_logger()
+
 
 class EmailQuery:
     """
@@ -68,49 +75,35 @@ class EmailQuery:
         self._q.since(iso_days_ago(days))
         return self
 
+    def _any(
+        self, field: Callable[[IMAPQuery, str], IMAPQuery], values: Sequence[str]
+    ) -> EmailQuery:
+        """
+        AND (field v1 OR field v2 ...), skipping empty values.
+        A single value is ANDed in directly without an OR wrapper.
+        """
+        qs = [field(IMAPQuery(), v) for v in values if v]
+        if len(qs) == 1:
+            self._q.and_(qs[0])
+        elif qs:
+            self._q.and_(IMAPQuery().or_(*qs))
+        return self
+
     def from_any(self, *senders: str) -> EmailQuery:
         """
         FROM any of the senders (nested OR). Equivalent to:
             OR FROM a OR FROM b FROM c ...
         """
-        qs = [IMAPQuery().from_(s) for s in senders if s]
-        if len(qs) == 0:
-            return self
-        if len(qs) == 1:
-            self._q.parts += qs[0].parts
-            return self
-        self._q.and_(IMAPQuery().or_(*qs))
-        return self
+        return self._any(IMAPQuery.from_, senders)
 
     def to_any(self, *recipients: str) -> EmailQuery:
-        qs = [IMAPQuery().to(s) for s in recipients if s]
-        if len(qs) == 0:
-            return self
-        if len(qs) == 1:
-            self._q.parts += qs[0].parts
-            return self
-        self._q.and_(IMAPQuery().or_(*qs))
-        return self
+        return self._any(IMAPQuery.to, recipients)
 
     def subject_any(self, *needles: str) -> EmailQuery:
-        qs = [IMAPQuery().subject(s) for s in needles if s]
-        if len(qs) == 0:
-            return self
-        if len(qs) == 1:
-            self._q.parts += qs[0].parts
-            return self
-        self._q.and_(IMAPQuery().or_(*qs))
-        return self
+        return self._any(IMAPQuery.subject, needles)
 
     def text_any(self, *needles: str) -> EmailQuery:
-        qs = [IMAPQuery().text(s) for s in needles if s]
-        if len(qs) == 0:
-            return self
-        if len(qs) == 1:
-            self._q.parts += qs[0].parts
-            return self
-        self._q.and_(IMAPQuery().or_(*qs))
-        return self
+        return self._any(IMAPQuery.text, needles)
 
     def recent_unread(self, days: int = 7) -> EmailQuery:
         """UNSEEN AND SINCE (days ago)."""
@@ -227,14 +220,98 @@ class EmailQuery:
         before_uid: Optional[int] = None,
         after_uid: Optional[int] = None,
         include_attachment_meta: bool = False,
+        batch_size: int = 100,
     ) -> tuple[PagedSearchResult, List[EmailMessage]]:
         """
         Fetch a page of full EmailMessage objects plus its paging metadata.
+
+        Refs are fetched in batches of `batch_size`; a batch that fails is
+        skipped (and logged) so one bad message does not sink the whole page.
+        If every batch fails, the last error is raised.
         """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+
         page = self.search(before_uid=before_uid, after_uid=after_uid)
         if not page.refs:
             return page, []
-        messages = self._m.imap.fetch(page.refs, include_attachment_meta=include_attachment_meta)
+
+        refs = page.refs
+        messages: List[EmailMessage] = []
+        last_exc: Optional[IMAPError] = None
+        failed = 0
+        batches = range(0, len(refs), batch_size)
+
+        for i in batches:
+            batch = refs[i : i + batch_size]
+            try:
+                messages.extend(
+                    self._m.imap.fetch(batch, include_attachment_meta=include_attachment_meta)
+                )
+            except IMAPError as e:
+                logger.warning("FETCH batch of %d refs failed: %s", len(batch), e)
+                last_exc = e
+                failed += 1
+
+        if last_exc is not None and failed == len(batches):
+            raise last_exc
+        return page, messages
+
+    async def afetch(
+        self,
+        *,
+        before_uid: Optional[int] = None,
+        after_uid: Optional[int] = None,
+        include_attachment_meta: bool = False,
+        batch_size: int = 100,
+    ) -> tuple[PagedSearchResult, List[EmailMessage]]:
+        """
+        Async variant of .fetch().
+
+        The blocking IMAP calls run on the event loop's default executor, at
+        most one per pooled connection at a time, so FETCH batches for the
+        page are in flight concurrently instead of back to back. Results keep
+        the page order. Failed batches are skipped as in .fetch().
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be > 0")
+
+        loop = asyncio.get_running_loop()
+        imap = self._m.imap
+        limit = asyncio.Semaphore(max(1, getattr(imap, "pool_size", 1)))
+
+        page = await loop.run_in_executor(
+            None, partial(self.search, before_uid=before_uid, after_uid=after_uid)
+        )
+        if not page.refs:
+            return page, []
+
+        async def _fetch(batch: List[EmailRef]) -> List[EmailMessage]:
+            async with limit:
+                return await loop.run_in_executor(
+                    None,
+                    partial(imap.fetch, batch, include_attachment_meta=include_attachment_meta),
+                )
+
+        refs = page.refs
+        batches = [refs[i : i + batch_size] for i in range(0, len(refs), batch_size)]
+        results = await asyncio.gather(*(_fetch(b) for b in batches), return_exceptions=True)
+
+        messages: List[EmailMessage] = []
+        last_exc: Optional[IMAPError] = None
+        failed = 0
+        for batch, result in zip(batches, results):
+            if isinstance(result, IMAPError):
+                logger.warning("FETCH batch of %d refs failed: %s", len(batch), result)
+                last_exc = result
+                failed += 1
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                messages.extend(result)
+
+        if last_exc is not None and failed == len(batches):
+            raise last_exc
         return page, messages
 
     def fetch_overview(
@@ -1,5 +1,6 @@
 from openmail.imap.client import IMAPClient
+from openmail.imap.idle import MailboxEvent, MailboxWatcher
 from openmail.imap.pagination import PagedSearchResult
 from openmail.imap.query import IMAPQuery
 
-__all__ = ["IMAPQuery", "IMAPClient", "PagedSearchResult"]
+__all__ = ["IMAPQuery", "IMAPClient", "MailboxEvent", "MailboxWatcher", "PagedSearchResult"]
@@ -7,6 +7,7 @@ from email.policy import default as default_policy
 from typing import Optional
 
 from openmail.errors import IMAPError
+from openmail.imap.fetch_response import iter_fetch_pieces, match_section_body, match_section_mime
 from openmail.imap.parser import decode_transfer
 
 
@@ -20,36 +21,39 @@ def fetch_part_bytes(
     Fetch a single BODY part and decode it according to its MIME headers'
     Content-Transfer-Encoding.
 
-    This is used for:
-      - downloading attachments
-      - fetching inline CID images for HTML rewriting
+    The MIME header and the body come back from one
+        UID FETCH <uid> (UID BODY.PEEK[<part>.MIME] BODY.PEEK[<part>])
+    rather than a round trip each.
+
+    This is used for downloading attachments.
     """
-    typ, mime_data = conn.uid("FETCH", str(uid), f"(UID BODY.PEEK[{part}.MIME])")
-    if typ != "OK" or not mime_data:
-        raise IMAPError(f"FETCH attachment MIME failed uid={uid} part={part}: {mime_data}")
+    typ, data = conn.uid("FETCH", str(uid), f"(UID BODY.PEEK[{part}.MIME] BODY.PEEK[{part}])")
+    if typ != "OK" or not data:
+        raise IMAPError(f"FETCH attachment failed uid={uid} part={part}: {data}")
 
     mime_bytes: Optional[bytes] = None
-    for item in mime_data:
-        if isinstance(item, tuple) and len(item) > 1 and isinstance(item[1], (bytes, bytearray)):
-            mime_bytes = bytes(item[1])
-            break
-
-    cte = None
-    if mime_bytes:
-        msg = BytesParser(policy=default_policy).parsebytes(mime_bytes)
-        cte = msg.get("Content-Transfer-Encoding")
-
-    typ, body_data = conn.uid("FETCH", str(uid), f"(UID BODY.PEEK[{part}])")
-    if typ != "OK" or not body_data:
-        raise IMAPError(f"FETCH attachment failed uid={uid} part={part}: {body_data}")
-
     payload: Optional[bytes] = None
-    for item in body_data:
-        if isinstance(item, tuple) and len(item) > 1 and isinstance(item[1], (bytes, bytearray)):
-            payload = bytes(item[1])
-            break
+    for piece in iter_fetch_pieces(data):
+        if piece.payload is None:
+            continue
+        if match_section_mime(piece.meta) == part:
+            mime_bytes = piece.payload
+        elif match_section_body(piece.meta) == part:
+            payload = piece.payload
 
     if payload is None:
         raise IMAPError(f"Attachment payload not found uid={uid} part={part}")
 
+    return decode_part(mime_bytes, payload)
+
+
+def decode_part(mime_bytes: Optional[bytes], payload: bytes) -> bytes:
+    """
+    Decode a fetched part body according to the Content-Transfer-Encoding in
+    its BODY[<part>.MIME] header (raw bytes if the header is missing).
+    """
+    cte = None
+    if mime_bytes:
+        msg = BytesParser(policy=default_policy).parsebytes(mime_bytes)
+        cte = msg.get("Content-Transfer-Encoding")
     return decode_transfer(payload, cte)
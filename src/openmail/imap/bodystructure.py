@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from openmail.models import AttachmentMeta
@@ -294,3 +295,19 @@ def pick_best_text_parts(
 def extract_bodystructure_from_fetch_meta(meta_str: str) -> Optional[str]:
     m = BODYSTRUCTURE_RE.search(meta_str)
     return m.group(1) if m else None
+
+
+@lru_cache(maxsize=1024)
+def plan_bodystructure(
+    bodystructure_str: str,
+) -> Tuple[Optional[TextPartRef], Optional[TextPartRef], Tuple[AttachmentMeta, ...]]:
+    """
+    parse_bodystructure + extract_text_and_attachments + pick_best_text_parts
+    for one raw BODYSTRUCTURE, memoized on the string itself: re-fetching a
+    message (overview, then full body) or messages sharing a layout skips
+    the parse. Raises ValueError on malformed input (not cached).
+    """
+    tree = parse_bodystructure(bodystructure_str)
+    text_parts, atts = extract_text_and_attachments(tree)
+    plain, html = pick_best_text_parts(text_parts)
+    return plain, html, tuple(atts)
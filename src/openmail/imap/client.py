@@ -2,91 +2,385 @@
 from __future__ import annotations
 
 import imaplib
+import random
 import re
+import socket
 import ssl
 import threading
 import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from contextlib import contextmanager
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from email.message import EmailMessage as PyEmailMessage
 from email.parser import BytesParser
 from email.policy import default as default_policy
-from queue import Empty, Queue
-from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, TypeVar
+from functools import lru_cache, partial
+from itertools import chain
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from openmail import IMAPConfig
+from openmail._compat import DATACLASS_SLOTS
 from openmail.auth import AuthContext
 from openmail.errors import ConfigError, IMAPError
-from openmail.imap.attachment_parts import fetch_part_bytes
+from openmail.imap.attachment_parts import decode_part, fetch_part_bytes
 from openmail.imap.bodystructure import (
     extract_bodystructure_from_fetch_meta,
-    extract_text_and_attachments,
-    parse_bodystructure,
-    pick_best_text_parts,
+    plan_bodystructure,
 )
 from openmail.imap.fetch_response import (
     has_header_peek,
+    iter_fetch_messages,
     iter_fetch_pieces,
+    match_literal_section,
     match_section_body,
     match_section_mime,
     parse_flags,
     parse_internaldate,
     parse_uid,
 )
-from openmail.imap.inline_cid import inline_cids_as_data_uris
+from openmail.imap.idle import MailboxEvent, MailboxWatcher
+from openmail.imap.inline_cid import inline_cids_as_data_uris, referenced_inline_parts
 from openmail.imap.pagination import PagedSearchResult
 from openmail.imap.parser import (
-    decode_body_chunk,
+    decode_section,
     parse_headers_and_bodies,
     parse_overview,
 )
-from openmail.imap.query import IMAPQuery
+from openmail.imap.pipeline import Arg, pipeline
+from openmail.imap.query import IMAPQuery, criteria_reads_flags
+from openmail.imap.uidset import (
+    covering_range,
+    expand_uid_set,
+    merge_ranges,
+    pack_uid_sets,
+    parse_uid_list,
+    subtract_ranges,
+)
 from openmail.models import AttachmentMeta, EmailMessage, EmailOverview
-from openmail.types import EmailRef
-from openmail.utils import parse_list_mailbox_name
+from openmail.types import _UID_TYPECODE, EmailRef, EmailRefBatch
 
 REPLACE_ON = (imaplib.IMAP4.abort, TimeoutError, OSError, ssl.SSLError)
 
+_ESEARCH_ALL_RE = re.compile(rb"\bALL\s+([0-9:,]+)")
+_UIDNEXT_RE = re.compile(rb"UIDNEXT\s+(\d+)")
+_APPENDUID_RE = re.compile(rb"APPENDUID\s+\d+\s+(\d+)")
+_GM_THRID_RE = re.compile(rb"X-GM-THRID\s+(\d+)")
+# Unfolded "Message-ID: <...>" line; folded or odd ones go through BytesParser.
+_MESSAGE_ID_RE = re.compile(
+    rb"^Message-ID:[ \t]*(<[^<>\s]+>)[ \t]*\r?$", re.IGNORECASE | re.MULTILINE
+)
+
+# imaplib reads responses through sock.makefile("rb") with the 8 KiB default
+# buffer; large FETCH literals then cost thousands of small recv() calls.
+READ_BUFFER_SIZE = 128 * 1024
+
+# Lock stripes for the search_page cache.
+_SEARCH_CACHE_SHARDS = 8
+
 T = TypeVar("T")
 
 
-@dataclass
+def _as_bytes(raw: object) -> bytes:
+    if type(raw) is bytes:
+        return raw
+    return bytes(raw) if isinstance(raw, bytearray) else str(raw).encode()
+
+
+_ref_uid = attrgetter("uid")
+_ref_mailbox = attrgetter("mailbox")
+
+# (mailbox, criteria, page_size, before_uid, after_uid)
+_SearchKey = Tuple[str, str, int, Optional[int], Optional[int]]
+
+# (uid, section) -> (MIME header, body), as returned by _fetch_sections_bulk
+_SectionBytes = Dict[Tuple[int, str], Tuple[Optional[bytes], Optional[bytes]]]
+
+
+@lru_cache(maxsize=256)
+def _store_args(mode: str, flags: FrozenSet[str]) -> Tuple[bytes, bytes]:
+    """
+    Prebuilt STORE arguments, e.g. (b"+FLAGS", b"(\\Deleted \\Seen)"). The
+    same few (mode, flags) pairs repeat, and passing bytes spares imaplib an
+    encode per argument: only the UID set is formatted per call.
+    """
+    return mode.encode("ascii"), ("(" + " ".join(sorted(flags)) + ")").encode("ascii")
+
+
+# LIST reply: (flags) delimiter name, with the name quoted or a bare atom.
+# Lines whose flags include \Noselect never match, so they are skipped inside
+# the regex engine without slicing, upper-casing or decoding anything.
+_LIST_RE = re.compile(
+    rb'^\((?![^)]*\\Noselect\b)[^)]*\)[ \t]+(?:NIL|"(?:[^"\\]|\\.)*"|\S+)[ \t]+'
+    rb'(?:"((?:[^"\\]|\\.)*)"|(\S+))[ \t]*$',
+    re.MULTILINE | re.IGNORECASE,
+)
+_QUOTED_ESCAPE_RE = re.compile(rb"\\(.)")
+
+_STATUS_KEYS = {
+    b"MESSAGES": "messages",
+    b"UNSEEN": "unseen",
+    b"UIDNEXT": "uidnext",
+    b"UIDVALIDITY": "uidvalidity",
+    b"HIGHESTMODSEQ": "highestmodseq",
+}
+# One "KEY 123" pair of a STATUS item list; pairs with non-numeric values
+# (MAILBOXID (...)) simply don't match.
+_STATUS_ITEM_RE = re.compile(rb"(?<![^\s(])([^\s()]+)[ \t]+(\d+)(?!\S)")
+
+
+def _status_key(mailbox: str) -> str:
+    """Normalize a mailbox name as sent in, or echoed by, STATUS."""
+    name = mailbox.strip()
+    if len(name) >= 2 and name[0] == name[-1] == '"':
+        name = name[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    return "INBOX" if name.upper() == "INBOX" else name
+
+
+class _BufferedReadMixin:
+    """
+    Re-open the socket reader with a larger buffer right after connect,
+    before imaplib reads the greeting (so nothing is buffered yet), and
+    turn off Nagle. Every connection, including replacements for dead
+    ones, goes through open(), so this applies to all of them.
+    """
+
+    def open(self, *args, **kwargs):
+        super().open(*args, **kwargs)
+        try:
+            # Pipelined commands go out as separate small writes; with Nagle
+            # each one after the first waits for the server's (delayed) ACK.
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+        self.file.close()
+        self.file = self.sock.makefile("rb", buffering=READ_BUFFER_SIZE)
+
+
+class _IMAP4(_BufferedReadMixin, imaplib.IMAP4):
+    pass
+
+
+class _IMAP4_SSL(_BufferedReadMixin, imaplib.IMAP4_SSL):
+    """
+    Offers `tls_session` (saved from an earlier connection made with the same
+    ssl_context) for resumption, which skips most of the TLS handshake. The
+    server is free to refuse it and do a full handshake instead.
+    """
+
+    def __init__(self, *args, tls_session: Optional[ssl.SSLSession] = None, **kwargs):
+        self._tls_session = tls_session
+        super().__init__(*args, **kwargs)
+
+    def _create_socket(self, timeout):
+        sock = imaplib.IMAP4._create_socket(self, timeout)
+        return self.ssl_context.wrap_socket(
+            sock, server_hostname=self.host, session=self._tls_session
+        )
+
+
+# eq=False: pool bookkeeping (`in`, remove) must compare connections by identity.
+@dataclass(eq=False, **DATACLASS_SLOTS)
 class _ConnState:
     conn: imaplib.IMAP4
     selected_mailbox: Optional[str] = None
     selected_readonly: Optional[bool] = None
     capabilities: Optional[Set[str]] = None
+    # time.monotonic() of the last checkin
+    last_used: float = field(default_factory=time.monotonic)
+    # The last reconnect failed: `conn` is dead and must be replaced before use.
+    broken: bool = False
 
 
-@dataclass
+class _PoolWaiter:
+    """
+    A thread blocked in _checkout(). Returned connections are handed straight
+    into `state` and only this waiter is woken (its condition shares the pool
+    lock), instead of going through the idle list and a broadcast wakeup.
+    """
+
+    __slots__ = ("state", "cv")
+
+    def __init__(self, lock: threading.Lock) -> None:
+        self.state: Optional[_ConnState] = None
+        self.cv = threading.Condition(lock)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class _UIDWindow:
     start: int  # inclusive
     end: int  # inclusive
 
 
+@dataclass(**DATACLASS_SLOTS)
+class _SearchedRanges:
+    """
+    What windowed SEARCHes for one (mailbox, criteria) have already covered:
+    the UID ranges searched, and the matches found inside them.
+    """
+
+    stored_at: float
+    ranges: List[Tuple[int, int]] = field(default_factory=list)  # merged, ascending
+    uids: array = field(default_factory=lambda: array(_UID_TYPECODE))  # ascending
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _FetchPartial:
+    """
+    Per-UID accumulator while walking a FETCH response.
+    """
+
+    headers: Optional[bytes] = None
+    internaldate: Optional[str] = None
+    bodystructure: Optional[str] = None
+    # section -> [MIME header, body] from speculative_sections
+    sections: Optional[Dict[str, List[Optional[bytes]]]] = None
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _PendingOp:
+    """
+    A write queued by IMAPClient.batch(): "store" with key (mailbox, mode,
+    flags, chunk_size), or "copy"/"move" with key (src_mailbox, dst_mailbox).
+    """
+
+    kind: str
+    key: tuple
+    uids: List[int]
+
+
+@dataclass(**DATACLASS_SLOTS)
+class _MessagePlan:
+    """
+    One message between the header FETCH and the body section FETCHes.
+    """
+
+    ref: EmailRef
+    header_bytes: bytes
+    internaldate_raw: Optional[str]
+    plain_part: Optional[str] = None
+    html_part: Optional[str] = None
+    attachments: List[AttachmentMeta] = field(default_factory=list)
+    text: str = ""
+    html: str = ""
+    # sections that came back with the header FETCH
+    prefetched: Optional[Dict[str, List[Optional[bytes]]]] = None
+
+    def missing_parts(self) -> Tuple[str, ...]:
+        """
+        Text/html sections still to be fetched.
+        """
+        have = self.prefetched or {}
+        return tuple(
+            p for p in (self.plain_part, self.html_part) if p is not None and p not in have
+        )
+
+
 @dataclass
 class IMAPClient:
     config: IMAPConfig
 
     # ---- perf knobs ----
     pool_size: int = 2  # 2–4 is usually plenty
-    max_concurrent_searches: int = 1  # keep SEARCH serialized-ish
-    max_retries: int = 1
-    backoff_seconds: float = 0.2
+    # Extra cap on concurrent SEARCHes below pool_size; None lets the pool
+    # itself be the limit.
+    max_concurrent_searches: Optional[int] = None
+    max_concurrent_fetches: int = 4  # body FETCH workers per fetch() (also capped by pool_size)
+    max_retries: int = 2
+    backoff_seconds: float = 0.2  # first retry delay; doubles per attempt, with jitter
+    backoff_max: float = 2.0
+    # A connection idle longer than this gets a NOOP before it is handed out,
+    # and is reconnected if that fails; 0 disables the check.
+    idle_check_seconds: float = 5 * 60
 
     max_uids_per_key: int = 10_000  # cap UID list size stored
+    max_command_bytes: int = 8192  # split UID sets so command lines stay under server limits
+    # SELECT (read-write) even for reads, so a write that follows on the same
+    # connection needs no EXAMINE -> SELECT round trip. Reads only use
+    # BODY.PEEK either way; the cost is that SELECT clears \Recent.
+    select_readwrite_for_reads: bool = False
 
     # ---- progressive SEARCH knobs ----
     search_window_factor: int = 4  # initial window ~= page_size * factor
     search_max_rounds: int = 6  # window doubles each round
     search_max_window_uids: int = 200_000  # hard guard against huge UID SEARCH windows
-
-    _pool: Queue[_ConnState] = field(default_factory=Queue, init=False, repr=False)
+    uidnext_cache_ttl: float = 2.0  # seconds a STATUS UIDNEXT is reused across pages; 0 disables
+
+    # ---- search_page() result cache ----
+    search_cache_ttl: float = 0.0  # seconds a page may be reused; 0 disables the cache
+    search_cache_max_entries: int = 256  # split evenly across the lock shards
+
+    # ---- fetch() ----
+    # Body sections requested speculatively with the BODYSTRUCTURE FETCH, e.g.
+    # ("1", "2", "1.1", "1.2"). When the structure puts the text parts there,
+    # fetch() needs no second round trip; the cost is downloading those
+    # sections even when they turn out to be attachments. The default covers
+    # single-part mail and text-first multiparts; () turns it off.
+    speculative_sections: Tuple[str, ...] = ("1",)
+
+    # TLS context and session of earlier connections, so new and replacement
+    # connections can resume instead of doing a full handshake.
+    _ssl_context: Optional[ssl.SSLContext] = field(default=None, init=False, repr=False)
+    _tls_session: Optional[ssl.SSLSession] = field(default=None, init=False, repr=False)
+
+    _idle: Deque[_ConnState] = field(default_factory=deque, init=False, repr=False)
+    _waiters: Deque[_PoolWaiter] = field(default_factory=deque, init=False, repr=False)
     _pool_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
     pool_acquire_timeout: float = 5.0
     _closing: bool = field(default=False, init=False, repr=False)
-
-    _search_sem: threading.Semaphore = field(init=False, repr=False)
+    _fetch_executor: Optional[ThreadPoolExecutor] = field(default=None, init=False, repr=False)
+    # connection pinned to the current thread by session()
+    _tls: threading.local = field(default_factory=threading.local, init=False, repr=False)
+
+    _search_sem: Optional[threading.Semaphore] = field(default=None, init=False, repr=False)
+    # Search cache split into lock-striped shards, chosen by hash(key).
+    # Each entry: (stored_at, page without refs, page UIDs packed into an array).
+    _search_cache_shards: List[
+        Tuple[
+            OrderedDict[_SearchKey, Tuple[float, PagedSearchResult, EmailRefBatch]], threading.Lock
+        ]
+    ] = field(
+        default_factory=lambda: [
+            (OrderedDict(), threading.Lock()) for _ in range(_SEARCH_CACHE_SHARDS)
+        ],
+        init=False,
+        repr=False,
+    )
+
+    # (mailbox, criteria) -> UID ranges already searched, so page turns only
+    # SEARCH the part of a window no earlier page covered.
+    _searched_ranges: OrderedDict[Tuple[str, str], _SearchedRanges] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _searched_ranges_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+    # CAPABILITY of the (authenticated) server, shared by all connections
+    _server_capabilities: Optional[Set[str]] = field(default=None, init=False, repr=False)
+    # mailbox -> UIDVALIDITY seen on the last SELECT of it
+    _uidvalidity: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    # mailbox -> (fetched_at, UIDNEXT), dropped whenever the mailbox changes
+    _uidnext_cache: Dict[str, Tuple[float, int]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     @classmethod
     def from_config(cls, config: IMAPConfig) -> IMAPClient:
@@ -97,11 +391,12 @@ class IMAPClient:
         return cls(config)
 
     def __post_init__(self) -> None:
-        self._search_sem = threading.Semaphore(self.max_concurrent_searches)
+        if self.max_concurrent_searches is not None:
+            self._search_sem = threading.Semaphore(max(1, self.max_concurrent_searches))
 
         # initialize pool
         for _ in range(max(1, self.pool_size)):
-            self._pool.put(_ConnState(self._open_new_connection()))
+            self._idle.append(_ConnState(self._open_new_connection()))
 
     # -----------------------
     # Connection management
@@ -111,15 +406,27 @@ class IMAPClient:
         cfg = self.config
         try:
             conn = (
-                imaplib.IMAP4_SSL(cfg.host, cfg.port, timeout=cfg.timeout)
+                _IMAP4_SSL(
+                    cfg.host,
+                    cfg.port,
+                    timeout=cfg.timeout,
+                    ssl_context=self._ssl_context,
+                    tls_session=self._tls_session,
+                )
                 if cfg.use_ssl
-                else imaplib.IMAP4(cfg.host, cfg.port, timeout=cfg.timeout)
+                else _IMAP4(cfg.host, cfg.port, timeout=cfg.timeout)
             )
 
             if cfg.auth is None:
                 raise ConfigError("IMAPConfig.auth is required (PasswordAuth or OAuth2Auth)")
 
             cfg.auth.apply_imap(conn, AuthContext(host=cfg.host, port=cfg.port))
+            if cfg.use_ssl:
+                # Share the context (sessions only resume within one) and keep
+                # the newest session; TLS 1.3 tickets arrive after the
+                # handshake, so by now LOGIN has read them.
+                self._ssl_context = conn.ssl_context
+                self._tls_session = conn.sock.session or self._tls_session
             return conn
 
         except imaplib.IMAP4.error as e:
@@ -127,91 +434,218 @@ class IMAPClient:
         except OSError as e:
             raise IMAPError(f"IMAP network error: {e}") from e
 
-    def _replace_bad_conn(self, state: _ConnState) -> _ConnState:
-        try:
-            state.conn.logout()
-        except Exception:
-            pass
-        return _ConnState(self._open_new_connection())
-
-    @contextmanager
-    def _acquire(self):
-        if self._closing:
-            raise IMAPError("IMAPClient is closed")
-
-        state = self._pool.get(timeout=self.pool_acquire_timeout)
-        try:
-            if self._closing:
+    def _checkout(
+        self, prefer: Optional[_ConnState] = None, mailbox: Optional[str] = None
+    ) -> _ConnState:
+        # Fast path without the pool lock: deque pop/remove are atomic.
+        # Prefer an idle connection that already has `mailbox` SELECTed, then
+        # the connection this thread used last, then the most recently
+        # returned one (LIFO keeps a few warm connections busy rather than
+        # cycling through all).
+        if not self._closing:
+            if mailbox is not None and (prefer is None or prefer.selected_mailbox != mailbox):
+                # Scan a copy: other threads append/remove while we look.
+                for state in reversed(self._idle.copy()):
+                    if state.selected_mailbox == mailbox:
+                        try:
+                            self._idle.remove(state)
+                            return state
+                        except ValueError:
+                            pass
+            if prefer is not None:
                 try:
-                    state.conn.logout()
-                except Exception:
+                    self._idle.remove(prefer)
+                    return prefer
+                except ValueError:
                     pass
-                raise IMAPError("IMAPClient is closed")
-
-            yield state
+            try:
+                return self._idle.pop()
+            except IndexError:
+                pass
 
-        except REPLACE_ON:
-            # Replace bad conn; only return to pool if not closing.
-            new_state = self._replace_bad_conn(state)
+        with self._pool_lock:
             if self._closing:
-                try:
-                    new_state.conn.logout()
-                except Exception:
-                    pass
+                raise IMAPError("IMAPClient is closed")
+
+            # Register before looking at _idle: _checkin appends without the
+            # lock and then looks for waiters, so one of us sees the other.
+            waiter = _PoolWaiter(self._pool_lock)
+            self._waiters.append(waiter)
+            try:
+                state = self._idle.pop()
+            except IndexError:
+                pass
             else:
-                self._pool.put(new_state)
-            raise
+                self._waiters.remove(waiter)
+                return state
+
+            waiter.cv.wait_for(
+                lambda: waiter.state is not None or self._closing,
+                timeout=self.pool_acquire_timeout,
+            )
+            if waiter.state is not None:
+                return waiter.state
 
-        except Exception:
-            # Return or close depending on shutdown state.
             if self._closing:
-                try:
-                    state.conn.logout()
-                except Exception:
-                    pass
-            else:
-                self._pool.put(state)
+                raise IMAPError("IMAPClient is closed")
+            self._waiters.remove(waiter)
+            raise IMAPError("IMAP connection pool exhausted")
+
+    def _checkin(self, state: _ConnState) -> None:
+        state.last_used = time.monotonic()
+        if self._closing:
+            # Closing: don't return to the pool.
+            self._logout_quietly(state)
+            return
+
+        # Uncontended returns take no lock.
+        self._idle.append(state)
+
+        if self._closing:
+            # close() drained _idle before or after our append; whoever
+            # removes `state` logs it out.
+            try:
+                self._idle.remove(state)
+            except ValueError:
+                return
+            self._logout_quietly(state)
+            return
+
+        if self._waiters:
+            with self._pool_lock:
+                while self._waiters and not self._closing:
+                    try:
+                        idle = self._idle.pop()
+                    except IndexError:
+                        break
+                    waiter = self._waiters.popleft()
+                    waiter.state = idle
+                    waiter.cv.notify()
+
+    def _pinned(self) -> Optional[_ConnState]:
+        return getattr(self._tls, "state", None)
+
+    def _reset_conn(self, state: _ConnState) -> None:
+        # Swap a dead connection in place, so whoever holds `state` keeps going.
+        # If no replacement can be opened, `state` is flagged instead, and the
+        # next _acquire tries again rather than handing out the dead one.
+        state.selected_mailbox = None
+        state.selected_readonly = None
+        state.capabilities = None
+        old = state.conn
+        try:
+            state.conn = self._open_new_connection()
+            state.broken = False
+        except BaseException:
+            state.broken = True
             raise
+        finally:
+            try:
+                old.logout()
+            except Exception:
+                pass
+
+    def _revive_if_stale(self, state: _ConnState) -> None:
+        # A connection whose last reconnect failed is dead: try again now.
+        # If that fails too, `state` stays flagged for the next checkout,
+        # whatever last_used says.
+        if state.broken:
+            self._reset_conn(state)
+            return
+        # Servers log out idle sessions (RFC 3501 allows it after 30 min) and
+        # NATs forget them sooner. One NOOP here is cheaper than letting the
+        # real command fail and retrying it after a backoff.
+        if not self.idle_check_seconds:
+            return
+        if time.monotonic() - state.last_used < self.idle_check_seconds:
+            return
+        try:
+            typ, _ = state.conn.noop()
+        except (*REPLACE_ON, imaplib.IMAP4.error):
+            typ = "BAD"
+        if typ != "OK":
+            self._reset_conn(state)
 
-        else:
-            # Normal path: return to pool unless we're closing.
-            if self._closing:
-                try:
-                    state.conn.logout()
-                except Exception:
-                    pass
-            else:
-                self._pool.put(state)
+    @contextmanager
+    def _acquire(self, mailbox: Optional[str] = None):
+        """
+        Check out a connection and pin it to the calling thread until the
+        outermost _acquire exits: nested calls on the same thread reuse it
+        instead of taking a second connection (and re-SELECTing). With
+        `mailbox`, a connection that already has it selected is preferred.
+        """
+        pinned = self._pinned()
+        if pinned is not None:
+            if pinned.broken:
+                self._reset_conn(pinned)
+            yield pinned
+            return
+
+        state = self._checkout(prefer=getattr(self._tls, "last", None), mailbox=mailbox)
+        self._tls.state = state
+        try:
+            self._revive_if_stale(state)
+            yield state
+        finally:
+            self._tls.state = None
+            self._tls.last = state
+            self._checkin(state)
+
+    @contextmanager
+    def session(self, mailbox: str, *, readonly: bool = True) -> Iterator[None]:
+        """
+        Keep one pooled connection, with `mailbox` selected, for a sequence
+        of calls:
 
-    def _run(self, op: Callable[[_ConnState], T]) -> T:
+            with imap.session("INBOX"):
+                page = imap.search_page(mailbox="INBOX", query=q)
+                overviews = imap.fetch_overview(page.refs)
+
+        Every call made by this thread inside the block reuses that
+        connection instead of checking one out (and possibly re-SELECTing)
+        each time. Use readonly=False when the block also writes. Nested
+        sessions reuse the outer one.
+        """
+        with self._acquire():
+            self._run(lambda state: self._ensure_selected(state, mailbox, readonly))
+            yield
+
+    def _run(self, op: Callable[[_ConnState], T], mailbox: Optional[str] = None) -> T:
         """
         Run an operation with retries. Pool handles reconnect by replacing bad conns.
+        Pass the `mailbox` op will SELECT so the pool can hand out a
+        connection that has it selected already.
         """
         last_exc: Optional[BaseException] = None
-        retryable = (imaplib.IMAP4.abort, TimeoutError, OSError, ssl.SSLError)
 
         for attempt in range(self.max_retries + 1):
             try:
-                with self._acquire() as state:
-                    return op(state)
-            except Empty as e:
-                if self._closing:
-                    raise IMAPError("IMAPClient is closed") from e
-                raise IMAPError("IMAP connection pool exhausted") from e
-            except retryable as e:
+                with self._acquire(mailbox) as state:
+                    try:
+                        return op(state)
+                    except REPLACE_ON:
+                        # Only failures of the IMAP work itself replace the
+                        # connection; errors raised by caller code inside a
+                        # session() block leave it alone.
+                        self._reset_conn(state)
+                        raise
+            except REPLACE_ON as e:
                 last_exc = e
                 if attempt < self.max_retries and self.backoff_seconds > 0:
-                    time.sleep(self.backoff_seconds)
+                    # Jitter keeps pool workers from reconnecting in lockstep.
+                    delay = min(self.backoff_max, self.backoff_seconds * (2**attempt))
+                    time.sleep(delay * random.uniform(0.5, 1.5))
                 continue
             except imaplib.IMAP4.error as e:
                 raise IMAPError(f"IMAP operation failed: {e}") from e
 
         raise IMAPError(f"IMAP operation failed after retries: {last_exc}") from last_exc
 
-    def _run_search(self, op: Callable[[_ConnState], T]) -> T:
-        # throttle searches
+    def _run_search(self, op: Callable[[_ConnState], T], mailbox: Optional[str] = None) -> T:
+        if self._search_sem is None:
+            return self._run(op, mailbox)
         with self._search_sem:
-            return self._run(op)
+            return self._run(op, mailbox)
 
     # -----------------------
     # Mailbox selection helpers
@@ -228,7 +662,7 @@ class IMAPClient:
         """
         Per-connection SELECT cache.
         RW selection satisfies both RW and RO.
-        RO satisfies only RO.
+        RO satisfies only RO; a write then upgrades it with a plain SELECT.
         """
         if state.selected_mailbox == mailbox:
             if state.selected_readonly is False:
@@ -236,67 +670,102 @@ class IMAPClient:
             if readonly and state.selected_readonly is True:
                 return
 
+        if self.select_readwrite_for_reads:
+            readonly = False
+
         imap_mailbox = self._format_mailbox_arg(mailbox)
         typ, _ = state.conn.select(imap_mailbox, readonly=readonly)
         if typ != "OK":
+            # A failed SELECT/EXAMINE leaves no mailbox selected at all.
+            state.selected_mailbox = None
+            state.selected_readonly = None
             raise IMAPError(f"select({mailbox!r}, readonly={readonly}) failed")
 
         state.selected_mailbox = mailbox
         state.selected_readonly = readonly
+        self._note_uidvalidity(mailbox, state.conn.response("UIDVALIDITY")[1])
+
+    def _note_uidvalidity(self, mailbox: str, data: Optional[List[Any]]) -> None:
+        """
+        Remember the UIDVALIDITY a SELECT reported. If it changed, UIDs cached
+        for that mailbox refer to other messages now, so drop them.
+        """
+        try:
+            uidvalidity = int(data[0]) if data and data[0] is not None else None
+        except (TypeError, ValueError):
+            uidvalidity = None
+        if uidvalidity is None:
+            return
+
+        previous = self._uidvalidity.get(mailbox)
+        self._uidvalidity[mailbox] = uidvalidity
+        if previous is not None and previous != uidvalidity:
+            self._invalidate_search_cache(mailbox)
 
     def _assert_same_mailbox(self, refs: Sequence[EmailRef], op_name: str) -> str:
         if not refs:
             raise IMAPError(f"{op_name} called with empty refs")
         mailbox = refs[0].mailbox
-        for r in refs:
-            if r.mailbox != mailbox:
-                raise IMAPError(
-                    f"All EmailRef.mailbox must match for {op_name} "
-                    f"(got {refs[0].mailbox!r} and {r.mailbox!r})"
-                )
+        # map/any keep the scan in C and stop at the first mismatch.
+        if any(map(mailbox.__ne__, map(_ref_mailbox, refs))):
+            other = next(r.mailbox for r in refs if r.mailbox != mailbox)
+            raise IMAPError(
+                f"All EmailRef.mailbox must match for {op_name} " f"(got {mailbox!r} and {other!r})"
+            )
         return mailbox
 
-    # -----------------------
-    # LIST parsing
-    # -----------------------
-
-    def _parse_list_flags(self, raw: bytes) -> Set[str]:
-        try:
-            s = raw.decode(errors="ignore")
-        except Exception:
-            return set()
-
-        start = s.find("(")
-        end = s.find(")", start + 1)
-        if start == -1 or end == -1 or end <= start + 1:
-            return set()
-
-        flags_str = s[start + 1 : end].strip()
-        if not flags_str:
-            return set()
-
-        return {f.upper() for f in flags_str.split() if f.strip()}
+    def _uids_in(
+        self, refs: Union[Sequence[EmailRef], EmailRefBatch], mailbox: str, op_name: str
+    ) -> Sequence[int]:
+        """
+        UIDs of `refs`, which must all be in `mailbox`. An EmailRefBatch
+        carries one mailbox for all its UIDs, so it needs no per-ref check.
+        """
+        if isinstance(refs, EmailRefBatch):
+            if refs.mailbox != mailbox:
+                raise IMAPError(f"EmailRefBatch.mailbox must match {mailbox!r} for {op_name}()")
+            return refs.uids
+        if any(map(mailbox.__ne__, map(_ref_mailbox, refs))):
+            raise IMAPError(f"All EmailRef.mailbox must match {mailbox!r} for {op_name}()")
+        return list(map(_ref_uid, refs))
 
     # -----------------------
     # Progressive SEARCH helpers
     # -----------------------
 
-    def _clone_query(self, base: IMAPQuery) -> IMAPQuery:
-        return IMAPQuery(parts=list(base.parts))
+    @staticmethod
+    def _with_uid_set(base: str, base_bytes: bytes, uid_set: str) -> Tuple[str, bytes]:
+        """
+        Criteria for (base AND UID uid_set), as str and wire bytes.
+
+        `base` is the query's build() output, computed once per search so each
+        window only appends its UID clause.
+        """
+        term = f"UID {uid_set}"
+        if base == "ALL":
+            return term, term.encode("ascii")
+        return f"{base} {term}", base_bytes + b" " + term.encode("ascii")
 
     def _capabilities(self, state: _ConnState) -> Set[str]:
         if state.capabilities is not None:
             return state.capabilities
+        # Capabilities belong to the server, not the connection: fresh and
+        # replacement connections reuse what the first one reported.
+        if self._server_capabilities is not None:
+            state.capabilities = self._server_capabilities
+            return state.capabilities
         typ, data = state.conn.capability()
         if typ != "OK":
             state.capabilities = set()
             return state.capabilities
-        caps: Set[str] = set()
-        for item in data or []:
-            s = item.decode(errors="ignore") if isinstance(item, (bytes, bytearray)) else str(item)
-            for tok in s.split():
-                caps.add(tok.upper())
-        state.capabilities = caps
+        # Upper-case and split the raw line; only the short tokens get decoded.
+        caps: Set[str] = {
+            tok.decode("ascii", "ignore")
+            for item in data or []
+            if item
+            for tok in _as_bytes(item).upper().split()
+        }
+        state.capabilities = self._server_capabilities = caps
         return caps
 
     def supports_gmail_ext(self) -> bool:
@@ -314,28 +783,78 @@ class IMAPClient:
             for raw in data:
                 if not raw:
                     continue
-                s = raw.decode(errors="ignore") if isinstance(raw, (bytes, bytearray)) else str(raw)
-                m = re.search(r"X-GM-THRID\s+(\d+)", s)
+                m = _GM_THRID_RE.search(_as_bytes(raw))
                 if m:
-                    return m.group(1)
+                    return m.group(1).decode()
             return None
 
-        return self._run(_impl)
+        return self._run(_impl, ref.mailbox)
 
-    def _uidnext(self, state: _ConnState, mailbox: str) -> int:
+    def _uidnext(self, state: _ConnState, mailbox: str, *, fresh: bool = False) -> int:
         """
-        Return UIDNEXT for mailbox via STATUS (cheap).
+        Return UIDNEXT for mailbox via STATUS (cheap). Reused for
+        uidnext_cache_ttl seconds so quick page turns skip the round trip;
+        fresh=True always asks the server.
         """
+        cached = None if fresh else self._uidnext_cache.get(mailbox)
+        if cached is not None and time.monotonic() - cached[0] < self.uidnext_cache_ttl:
+            return cached[1]
+
         imap_mailbox = self._format_mailbox_arg(mailbox)
         typ, data = state.conn.status(imap_mailbox, "(UIDNEXT)")
         if typ != "OK" or not data or not data[0]:
             raise IMAPError(f"STATUS UIDNEXT failed for {mailbox!r}: {data}")
 
-        raw = data[0].decode(errors="ignore") if isinstance(data[0], bytes) else str(data[0])
-        m = re.search(r"UIDNEXT\s+(\d+)", raw)
+        raw = _as_bytes(data[0])
+        m = _UIDNEXT_RE.search(raw)
         if not m:
             raise IMAPError(f"Could not parse UIDNEXT from STATUS response: {raw!r}")
-        return int(m.group(1))
+        uidnext = int(m.group(1))
+        if self.uidnext_cache_ttl > 0:
+            self._uidnext_cache[mailbox] = (time.monotonic(), uidnext)
+        return uidnext
+
+    def _uid_search_raw(self, state: _ConnState, criteria: bytes) -> bytes:
+        """
+        UID SEARCH with pre-encoded criteria (handed to imaplib as bytes, so it
+        is sent as-is). Non-ASCII criteria are flagged with CHARSET UTF-8.
+        Returns the raw space-separated UID list.
+        """
+        if criteria.isascii():
+            typ, data = state.conn.uid("SEARCH", None, criteria)
+        else:
+            typ, data = state.conn.uid("SEARCH", "CHARSET", "UTF-8", criteria)
+        if typ != "OK":
+            raise IMAPError(f"SEARCH failed: {data}")
+        return data[0] or b""
+
+    def _uid_search_uids(self, state: _ConnState, criteria: bytes) -> List[int]:
+        """
+        UID SEARCH returning ascending UIDs. With ESEARCH (RFC 4731) the
+        server answers with a compact sequence set (RETURN (ALL)) instead of
+        one number per match, which is far smaller for dense result sets.
+        """
+        if "ESEARCH" not in self._capabilities(state):
+            # RFC 3501 doesn't promise any order. Servers answer ascending in
+            # practice, and sort() only scans a list that already is, but the
+            # progressive search concatenates windows relying on it.
+            uids = parse_uid_list(self._uid_search_raw(state, criteria))
+            uids.sort()
+            return uids
+
+        if criteria.isascii():
+            typ, data = state.conn.uid("SEARCH", "RETURN", "(ALL)", criteria)
+        else:
+            typ, data = state.conn.uid("SEARCH", "RETURN", "(ALL)", "CHARSET", "UTF-8", criteria)
+        _, esearch = state.conn._untagged_response(typ, data, "ESEARCH")
+        if typ != "OK":
+            raise IMAPError(f"SEARCH failed: {data}")
+
+        for item in reversed(esearch or []):
+            if isinstance(item, (bytes, bytearray)):
+                m = _ESEARCH_ALL_RE.search(item)
+                return expand_uid_set(m.group(1).decode()) if m else []
+        return []
 
     def _make_window(
         self,
@@ -345,12 +864,15 @@ class IMAPClient:
         before_uid: Optional[int],
         after_uid: Optional[int],
         window_size: int,
+        newest: Optional[int] = None,
     ) -> _UIDWindow:
         """
         Create a finite UID window [start:end] inclusive.
         - before_uid: want UIDs < before_uid (older)
         - after_uid: want UIDs > after_uid (newer)
         - neither: want newest page (tail window near UIDNEXT-1)
+
+        `newest` (UIDNEXT-1) is looked up via STATUS when not supplied.
         """
         if before_uid is not None and after_uid is not None:
             raise ValueError("Cannot specify both before_uid and after_uid")
@@ -360,8 +882,8 @@ class IMAPClient:
             start = max(1, end - window_size + 1)
             return _UIDWindow(start=start, end=end)
 
-        uidnext = self._uidnext(state, mailbox)
-        newest = max(1, uidnext - 1)
+        if newest is None:
+            newest = max(1, self._uidnext(state, mailbox) - 1)
 
         if after_uid is not None:
             start = after_uid + 1
@@ -379,31 +901,74 @@ class IMAPClient:
         *,
         state: _ConnState,
         mailbox: str,
-        base_query: IMAPQuery,
+        base: str,
+        base_bytes: bytes,
         win: _UIDWindow,
     ) -> Tuple[str, List[int]]:
         """
-        Run UID SEARCH for (base_query AND UID start:end). Returns (criteria_str, uids_asc).
+        Run UID SEARCH for (base AND UID start:end). Returns (criteria_str, uids_asc).
         """
-        q = self._clone_query(base_query)
-
         # empty window
         if win.end < win.start:
-            criteria = q.build() or "ALL"
-            return criteria, []
+            return base, []
 
-        q.uid(f"{win.start}:{win.end}")
-        criteria = q.build() or "ALL"
+        criteria, criteria_bytes = self._with_uid_set(base, base_bytes, f"{win.start}:{win.end}")
+
+        if self.search_cache_ttl <= 0:
+            self._ensure_selected(state, mailbox, readonly=True)
+            return criteria, self._uid_search_uids(state, criteria_bytes)
 
+        # Only SEARCH the parts of the window earlier calls haven't covered.
+        key = (mailbox, base)
+        known, missing = self._searched_ranges_lookup(key, win.start, win.end)
+        if not missing:
+            return criteria, known
+
+        _, missing_bytes = self._with_uid_set(
+            base, base_bytes, ",".join(f"{lo}:{hi}" for lo, hi in missing)
+        )
         self._ensure_selected(state, mailbox, readonly=True)
+        found = self._uid_search_uids(state, missing_bytes)
+        self._searched_ranges_add(key, missing, found)
 
-        typ, data = state.conn.uid("SEARCH", None, criteria)
-        if typ != "OK":
-            raise IMAPError(f"SEARCH failed: {data}")
+        # `found` lies in ranges `known` doesn't cover, so the two are disjoint
+        # ascending runs; sorted() merges those in one linear pass.
+        return criteria, sorted(known + found)
 
-        raw = data[0] or b""
-        uids = [int(x) for x in raw.split() if x]
-        return criteria, uids  # server returns ascending
+    def _searched_ranges_lookup(
+        self, key: Tuple[str, str], lo: int, hi: int
+    ) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """
+        Known matches in [lo, hi] and the sub-ranges still to be searched.
+        """
+        with self._searched_ranges_lock:
+            entry = self._searched_ranges.get(key)
+            if entry is not None and time.monotonic() - entry.stored_at > self.search_cache_ttl:
+                del self._searched_ranges[key]
+                entry = None
+            if entry is None:
+                return [], [(lo, hi)]
+
+            self._searched_ranges.move_to_end(key)
+            uids = entry.uids
+            known = uids[bisect_left(uids, lo) : bisect_right(uids, hi)].tolist()
+            return known, subtract_ranges(lo, hi, entry.ranges)
+
+    def _searched_ranges_add(
+        self, key: Tuple[str, str], ranges: List[Tuple[int, int]], uids: List[int]
+    ) -> None:
+        with self._searched_ranges_lock:
+            entry = self._searched_ranges.get(key)
+            if entry is None:
+                entry = self._searched_ranges[key] = _SearchedRanges(stored_at=time.monotonic())
+            self._searched_ranges.move_to_end(key)
+
+            entry.ranges = merge_ranges(entry.ranges + ranges)
+            if uids:
+                entry.uids = array(_UID_TYPECODE, sorted(chain(entry.uids, uids)))
+
+            while len(self._searched_ranges) > max(1, self.search_cache_max_entries):
+                self._searched_ranges.popitem(last=False)
 
     def _search_progressive(
         self,
@@ -413,17 +978,19 @@ class IMAPClient:
         page_size: int,
         before_uid: Optional[int],
         after_uid: Optional[int],
-    ) -> Tuple[str, List[int]]:
+    ) -> Tuple[str, Sequence[int]]:
 
-        def _impl(state: _ConnState) -> Tuple[str, List[int]]:
+        def _impl(state: _ConnState) -> Tuple[str, Sequence[int]]:
             want = max(1, page_size * self.search_window_factor)
 
             # IMPORTANT: chunk size is page-sized, so windows look like 100-91, 90-81, ...
             chunk_size = want
 
-            # Track newest for "after_uid" forward scanning and for bounds checks.
-            uidnext = self._uidnext(state, mailbox)
-            newest = max(1, uidnext - 1)
+            # Newest UID bounds the tail window and "after_uid" forward scanning;
+            # "before_uid" paging only walks down, so it skips the STATUS call.
+            newest: Optional[int] = None
+            if before_uid is None:
+                newest = max(1, self._uidnext(state, mailbox) - 1)
 
             # Start with the first window as before (tail, or before_uid, or after_uid).
             win = self._make_window(
@@ -432,17 +999,24 @@ class IMAPClient:
                 before_uid=before_uid,
                 after_uid=after_uid,
                 window_size=chunk_size,
+                newest=newest,
             )
 
-            # Accumulate across windows.
-            acc: List[int] = []
-            seen: Set[int] = set()
+            # Accumulate across windows. Windows never overlap and march in one
+            # direction, so their results are disjoint and each is ascending:
+            # concatenating them in window order needs no dedup or re-sort.
+            chunks: List[List[int]] = []
+            found = 0
+            newer = after_uid is not None
 
             # Track total UID span scanned to enforce search_max_window_uids.
             scanned_low = win.start if win.end >= win.start else None
             scanned_high = win.end if win.end >= win.start else None
 
-            last_criteria = query.build() or "ALL"
+            # The base criteria don't change between windows; build them once.
+            base = query.build()
+            base_bytes = query.build_bytes()
+            last_criteria = base
 
             for _round in range(self.search_max_rounds):
                 # empty window => nothing more in that direction
@@ -452,23 +1026,21 @@ class IMAPClient:
                 criteria, uids = self._search_in_window(
                     state=state,
                     mailbox=mailbox,
-                    base_query=query,
+                    base=base,
+                    base_bytes=base_bytes,
                     win=win,
                 )
                 last_criteria = criteria
 
-                # add (dedupe) while preserving ascending order overall
-                for u in uids:
-                    if u not in seen:
-                        seen.add(u)
-                        acc.append(u)
-
-                # keep acc ascending (each window SEARCH returns ascending,
-                # but across windows we might append older/newer chunks)
-                acc.sort()
+                # Disjointness rests on results staying inside their window;
+                # drop anything a misbehaving server sent from outside it.
+                if uids and (uids[0] < win.start or uids[-1] > win.end):
+                    uids = uids[bisect_left(uids, win.start) : bisect_right(uids, win.end)]
+                chunks.append(uids)
+                found += len(uids)
 
                 # enough to fill the page: stop early
-                if len(acc) >= want:
+                if found >= want:
                     break
 
                 # update scanned span
@@ -484,10 +1056,10 @@ class IMAPClient:
 
                 # Compute the next non-overlapping window in the right direction.
                 chunk_size *= self.search_window_factor
-                if after_uid is not None:
+                if newer:
                     # move newer: [end+1 : end+chunk]
                     next_start = win.end + 1
-                    if next_start > newest:
+                    if newest is None or next_start > newest:
                         break
                     next_end = min(newest, next_start + chunk_size - 1)
                     win = _UIDWindow(start=next_start, end=next_end)
@@ -500,13 +1072,16 @@ class IMAPClient:
                     next_start = max(1, next_end - chunk_size + 1)
                     win = _UIDWindow(start=next_start, end=next_end)
 
+            # One compact buffer instead of a list of boxed ints.
+            result = array(_UID_TYPECODE, chain.from_iterable(chunks if newer else chunks[::-1]))
+
             # memory guard: keep tail (most useful for "older" paging)
-            if len(acc) > self.max_uids_per_key:
-                acc = acc[-self.max_uids_per_key :]
+            if len(result) > self.max_uids_per_key:
+                result = result[-self.max_uids_per_key :]
 
-            return last_criteria, acc
+            return last_criteria, result
 
-        return self._run_search(_impl)
+        return self._run_search(_impl, mailbox)
 
     # -----------------------
     # SEARCH + pagination
@@ -517,17 +1092,100 @@ class IMAPClient:
         Single UID SEARCH with the given query (no progressive windowing).
         Returns ascending UIDs.
         """
-        criteria = query.build() or "ALL"
+        criteria = query.build_bytes()
 
         def _impl(state: _ConnState) -> List[int]:
             self._ensure_selected(state, mailbox, readonly=True)
-            typ, data = state.conn.uid("SEARCH", None, criteria)
-            if typ != "OK":
-                raise IMAPError(f"SEARCH failed: {data}")
-            raw = data[0] or b""
-            return [int(x) for x in raw.split() if x]
+            return self._uid_search_uids(state, criteria)
+
+        return self._run_search(_impl, mailbox)
+
+    def _search_cache_shard(self, key: _SearchKey):
+        return self._search_cache_shards[hash(key) % _SEARCH_CACHE_SHARDS]
+
+    def _search_cache_get(self, key: _SearchKey) -> Optional[PagedSearchResult]:
+        cache, lock = self._search_cache_shard(key)
+        with lock:
+            hit = cache.get(key)
+            if hit is None:
+                return None
+            stored_at, meta, batch = hit
+            if time.monotonic() - stored_at > self.search_cache_ttl:
+                del cache[key]
+                return None
+            cache.move_to_end(key)
+        return replace(meta, refs=batch.to_refs())
+
+    def _search_cache_put(self, key: _SearchKey, page: PagedSearchResult) -> None:
+        # Keep a packed UID array instead of an EmailRef object per message.
+        batch = EmailRefBatch.from_uids((r.uid for r in page.refs), mailbox=key[0])
+        meta = replace(page, refs=[])
+        # LRU bound is enforced per shard.
+        per_shard = max(1, self.search_cache_max_entries // _SEARCH_CACHE_SHARDS)
+        cache, lock = self._search_cache_shard(key)
+        with lock:
+            cache[key] = (time.monotonic(), meta, batch)
+            cache.move_to_end(key)
+            while len(cache) > per_shard:
+                cache.popitem(last=False)
+
+    def _invalidate_search_cache(
+        self, *mailboxes: str, where: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        """
+        Drop cached pages and searched ranges for `mailboxes`; with `where`,
+        only those whose criteria string it accepts. Without `where` the
+        mailboxes' cached UIDNEXT goes too.
+        """
+        self._drop_cached_pages(mailboxes, where)
+        if where is None:
+            for mailbox in mailboxes:
+                self._uidnext_cache.pop(mailbox, None)
+
+        if self._searched_ranges:
+            with self._searched_ranges_lock:
+                for rkey in [
+                    k
+                    for k in self._searched_ranges
+                    if k[0] in mailboxes and (where is None or where(k[1]))
+                ]:
+                    del self._searched_ranges[rkey]
+
+    def _drop_cached_pages(
+        self, mailboxes: Sequence[str], where: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        for cache, lock in self._search_cache_shards:
+            if not cache:
+                continue
+            with lock:
+                for key in [
+                    k for k in cache if k[0] in mailboxes and (where is None or where(k[1]))
+                ]:
+                    del cache[key]
+
+    def _forget_search_uids(self, mailbox: str, uids: Iterable[int]) -> None:
+        """
+        `uids` are gone from `mailbox` (moved, or expunged by UID). Cached
+        pages are dropped, since their fill and totals shift, but searched
+        ranges stay valid minus those UIDs, so rebuilding a page needs no
+        new SEARCH.
+        """
+        self._drop_cached_pages((mailbox,))
 
-        return self._run_search(_impl)
+        gone = set(uids)
+        if not gone or not self._searched_ranges:
+            return
+        with self._searched_ranges_lock:
+            for key, entry in self._searched_ranges.items():
+                if key[0] == mailbox:
+                    entry.uids = array(_UID_TYPECODE, [u for u in entry.uids if u not in gone])
+
+    def clear_search_cache(self) -> None:
+        for cache, lock in self._search_cache_shards:
+            with lock:
+                cache.clear()
+        with self._searched_ranges_lock:
+            self._searched_ranges.clear()
 
     def search_page(
         self,
@@ -537,14 +1195,50 @@ class IMAPClient:
         page_size: int = 50,
         before_uid: Optional[int] = None,
         after_uid: Optional[int] = None,
+        refresh: bool = False,
     ) -> PagedSearchResult:
         """
         Efficient paging: uses progressive widening UID windows to avoid huge SEARCH responses.
-        (Cache removed.)
+
+        With search_cache_ttl > 0, pages are cached by (mailbox, criteria, page
+        bounds) and a hit costs no server round trip. A miss only SEARCHes the
+        UID ranges no earlier page with the same criteria covered. Writes through this
+        client drop the affected mailbox's entries: flag changes only those
+        whose criteria look at flags, and moves only prune the moved UIDs
+        from the searched ranges. Changes made elsewhere show up once the
+        TTL expires, or immediately with refresh=True.
         """
         if before_uid is not None and after_uid is not None:
             raise ValueError("Cannot specify both before_uid and after_uid")
 
+        key: Optional[_SearchKey] = None
+        if self.search_cache_ttl > 0:
+            key = (mailbox, query.build() or "ALL", page_size, before_uid, after_uid)
+            if not refresh:
+                cached = self._search_cache_get(key)
+                if cached is not None:
+                    return cached
+
+        page = self._search_page_uncached(
+            mailbox=mailbox,
+            query=query,
+            page_size=page_size,
+            before_uid=before_uid,
+            after_uid=after_uid,
+        )
+        if key is not None:
+            self._search_cache_put(key, page)
+        return page
+
+    def _search_page_uncached(
+        self,
+        *,
+        mailbox: str,
+        query: IMAPQuery,
+        page_size: int,
+        before_uid: Optional[int],
+        after_uid: Optional[int],
+    ) -> PagedSearchResult:
         criteria, uids = self._search_progressive(
             mailbox=mailbox,
             query=query,
@@ -607,46 +1301,319 @@ class IMAPClient:
     # FETCH helpers
     # -----------------------
 
-    def _fetch_section_mime_and_body(
-        self, state: _ConnState, *, uid: int, section: str
-    ) -> Tuple[Optional[bytes], Optional[bytes]]:
-        want = f"(UID BODY.PEEK[{section}.MIME] BODY.PEEK[{section}])"
-        typ, data = state.conn.uid("FETCH", str(uid), want)
-        if typ != "OK":
-            raise IMAPError(f"FETCH body section failed uid={uid}: {data}")
+    def _fetch_sections_bulk(
+        self, state: _ConnState, sections: Dict[int, Tuple[str, ...]]
+    ) -> _SectionBytes:
+        """
+        Fetch (MIME header, body) for many (uid, section) pairs at once.
+
+        UIDs are grouped by their section list, so each group is a single
+            UID FETCH <uids> (UID BODY.PEEK[p.MIME] BODY.PEEK[p] ...)
+        instead of one round trip per UID and section. When that still takes
+        several commands they are pipelined into one round trip.
+        """
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for uid, parts in sections.items():
+            if parts:
+                groups.setdefault(tuple(sorted(set(parts))), []).append(uid)
+
+        commands: List[Tuple[str, str, str, str]] = []
+        for parts, uids in groups.items():
+            want = "(UID " + " ".join(f"BODY.PEEK[{p}.MIME] BODY.PEEK[{p}]" for p in parts) + ")"
+            for uid_set in pack_uid_sets(uids, max_bytes=self.max_command_bytes):
+                commands.append(("UID", "FETCH", uid_set, want))
+        if not commands:
+            return {}
+
+        if len(commands) == 1:
+            typ, data = state.conn.uid(*commands[0][1:])
+            if typ != "OK":
+                raise IMAPError(f"FETCH body sections failed: {data}")
+        else:
+            results = pipeline(state.conn, commands)
+            _, data = state.conn._untagged_response("OK", [None], "FETCH")
+            for typ, dat in results:
+                if typ != "OK":
+                    raise IMAPError(f"FETCH body sections failed: {dat}")
+
+        # Every response lands in one untagged FETCH list; sort it out by UID
+        # and section name.
+        found: Dict[Tuple[int, str], List[Optional[bytes]]] = {}
+        for uid, pieces in iter_fetch_messages([d for d in data or [] if d is not None]):
+            if uid is None or uid not in sections:
+                continue
+            for piece in pieces:
+                if piece.payload is None:
+                    continue
+                sec_mime = match_section_mime(piece.meta)
+                if sec_mime:
+                    found.setdefault((uid, sec_mime), [None, None])[0] = piece.payload
+                    continue
+                sec_body = match_section_body(piece.meta)
+                if sec_body:
+                    found.setdefault((uid, sec_body), [None, None])[1] = piece.payload
+
+        return {key: (mime, body) for key, (mime, body) in found.items()}
+
+    # -----------------------
+    # FETCH full message
+    # -----------------------
 
-        mime_bytes: Optional[bytes] = None
-        body_bytes: Optional[bytes] = None
+    _FETCH_META_ATTRS = "(UID INTERNALDATE BODYSTRUCTURE BODY.PEEK[HEADER])"
 
-        for piece in iter_fetch_pieces(data or []):
-            sec_mime = match_section_mime(piece.meta)
-            sec_body = match_section_body(piece.meta)
+    def _fetch_meta_attrs(self) -> str:
+        if not self.speculative_sections:
+            return self._FETCH_META_ATTRS
+        extra = " ".join(f"BODY.PEEK[{p}.MIME] BODY.PEEK[{p}]" for p in self.speculative_sections)
+        return self._FETCH_META_ATTRS[:-1] + " " + extra + ")"
 
-            if piece.payload is None:
+    def _collect_fetch_meta(
+        self, data: Sequence[object], required_uids: Optional[Set[int]] = None
+    ) -> Dict[int, _FetchPartial]:
+        """
+        Group a (UID INTERNALDATE BODYSTRUCTURE BODY.PEEK[HEADER]) FETCH response
+        by UID. With `required_uids`, anything else the server sent is dropped.
+        """
+        partial: Dict[int, _FetchPartial] = {}
+        current_uid: Optional[int] = None
+        speculative = bool(self.speculative_sections)
+
+        for piece in iter_fetch_pieces(data):
+            uid = parse_uid(piece.meta)
+            if uid is not None:
+                current_uid = uid if required_uids is None or uid in required_uids else None
+            if current_uid is None:
                 continue
 
-            if sec_mime:
-                mime_bytes = piece.payload
-            elif sec_body:
-                body_bytes = piece.payload
+            bucket = partial.get(current_uid)
+            if bucket is None:
+                bucket = partial[current_uid] = _FetchPartial()
 
-        return mime_bytes, body_bytes
+            internal = parse_internaldate(piece.meta)
+            if internal:
+                bucket.internaldate = internal
 
-    def _decode_section(self, *, mime_bytes: Optional[bytes], body_bytes: Optional[bytes]) -> str:
-        if not body_bytes:
-            return ""
-        if not mime_bytes:
-            try:
-                return body_bytes.decode("utf-8", errors="replace")
-            except Exception:
-                return body_bytes.decode("latin-1", errors="replace")
+            if has_header_peek(piece.meta) and piece.payload is not None:
+                bucket.headers = piece.payload
 
-        msg = BytesParser(policy=default_policy).parsebytes(mime_bytes)
-        return decode_body_chunk(body_bytes, msg)
+            bs = extract_bodystructure_from_fetch_meta(piece.meta)
+            if bs:
+                bucket.bodystructure = bs
 
-    # -----------------------
-    # FETCH full message
-    # -----------------------
+            if speculative and piece.payload is not None:
+                section = match_literal_section(piece.meta)
+                if section is not None:
+                    if bucket.sections is None:
+                        bucket.sections = {}
+                    name, is_mime = section
+                    bucket.sections.setdefault(name, [None, None])[
+                        0 if is_mime else 1
+                    ] = piece.payload
+
+        return partial
+
+    def _plan_messages(
+        self,
+        refs: Sequence[EmailRef],
+        partial: Dict[int, _FetchPartial],
+        *,
+        include_attachment_meta: bool,
+    ) -> List[_MessagePlan]:
+        plans: List[_MessagePlan] = []
+        for r in refs:
+            info = partial.get(r.uid)
+            if info is None:
+                continue
+
+            plan = _MessagePlan(
+                ref=r,
+                header_bytes=info.headers or b"",
+                internaldate_raw=info.internaldate,
+                prefetched=info.sections,
+            )
+
+            bs_raw = info.bodystructure
+            if bs_raw:
+                try:
+                    plain_ref, html_ref, atts = plan_bodystructure(bs_raw)
+                except Exception:
+                    pass
+                else:
+                    plan.plain_part = plain_ref.part if plain_ref is not None else None
+                    plan.html_part = html_ref.part if html_ref is not None else None
+                    if include_attachment_meta:
+                        plan.attachments = list(atts)
+
+            plans.append(plan)
+        return plans
+
+    def _apply_bodies(
+        self,
+        plan: _MessagePlan,
+        bodies: _SectionBytes,
+    ) -> None:
+        uid = plan.ref.uid
+        prefetched = plan.prefetched or {}
+        try:
+            if plan.plain_part is not None:
+                got = bodies.get((uid, plan.plain_part)) or prefetched.get(plan.plain_part)
+                plan.text = decode_section(*(got or (None, None)))
+
+            if plan.html_part is not None:
+                got = bodies.get((uid, plan.html_part)) or prefetched.get(plan.html_part)
+                plan.html = decode_section(*(got or (None, None)))
+        except REPLACE_ON:
+            raise
+        except Exception:
+            pass
+
+    def _inline_images(
+        self,
+        plan: _MessagePlan,
+        parts: Sequence[str],
+        images: _SectionBytes,
+    ) -> None:
+        uid = plan.ref.uid
+        part_bytes: Dict[str, bytes] = {}
+        for part in parts:
+            mime, body = images.get((uid, part), (None, None))
+            if body:
+                try:
+                    part_bytes[part] = decode_part(mime, body)
+                except Exception:
+                    continue
+        if part_bytes:
+            plan.html, plan.attachments = inline_cids_as_data_uris(
+                html=plan.html or "", attachment_metas=plan.attachments, part_bytes=part_bytes
+            )
+
+    def _fetch_bodies(self, mailbox: str, plans: Sequence[_MessagePlan]) -> None:
+        """
+        Fetch text/html sections for `plans`: contiguous shards over up to
+        min(max_concurrent_fetches, pool_size) pooled connections, one bulk
+        FETCH per shard, plus one more for the cid: images the HTML bodies
+        reference. Each worker checks out its own connection, so the caller
+        must not be holding one.
+        """
+        jobs: List[_MessagePlan] = []
+        for p in plans:
+            if p.plain_part is None and p.html_part is None:
+                continue
+            if not p.missing_parts():
+                # Everything already came with the header FETCH; only a
+                # referenced inline image still needs a connection.
+                self._apply_bodies(p, {})
+                if not referenced_inline_parts(p.html or "", p.attachments):
+                    continue
+            jobs.append(p)
+        if not jobs:
+            return
+
+        def _load(shard: Sequence[_MessagePlan]) -> None:
+            def _impl(
+                state: _ConnState,
+            ) -> Tuple[_SectionBytes, List[Tuple[_MessagePlan, List[str]]], _SectionBytes]:
+                self._ensure_selected(state, mailbox, readonly=True)
+                bodies = self._fetch_sections_bulk(
+                    state, {p.ref.uid: p.missing_parts() for p in shard}
+                )
+
+                # cid: images for every message in the shard in one go, rather
+                # than two FETCHes per image per message. Which ones are
+                # referenced only shows in the decoded HTML, so those bodies
+                # are decoded here; the rest waits until the connection is back.
+                wanted: List[Tuple[_MessagePlan, List[str]]] = []
+                for plan in shard:
+                    if plan.html_part is not None and plan.attachments:
+                        self._apply_bodies(plan, bodies)
+                        parts = referenced_inline_parts(plan.html or "", plan.attachments)
+                        if parts:
+                            wanted.append((plan, parts))
+                images: _SectionBytes = {}
+                if wanted:
+                    images = self._fetch_sections_bulk(
+                        state, {p.ref.uid: tuple(parts) for p, parts in wanted}
+                    )
+                return bodies, wanted, images
+
+            # Missing or undecodable sections just leave that message's body
+            # empty (_apply_bodies); a FETCH that fails outright, an
+            # exhausted pool or retries that ran out propagate.
+            bodies, wanted, images = self._run(_impl, mailbox)
+
+            for plan in shard:
+                if plan.html_part is None or not plan.attachments:
+                    self._apply_bodies(plan, bodies)
+            for plan, parts in wanted:
+                self._inline_images(plan, parts, images)
+
+        # Shard by UID, so each connection's FETCH covers one compact,
+        # ascending UID span (a few ranges on the wire, sequential reads on
+        # the server) rather than whatever order the refs came in.
+        jobs.sort(key=lambda p: p.ref.uid)
+
+        workers = min(self._fetch_workers(), len(jobs))
+        if workers == 1 or self._pinned() is not None:
+            # Inside session(): stay on the pinned connection.
+            _load(jobs)
+            return
+
+        # The calling thread loads the first shard itself; the rest go to the
+        # client's long-lived fetch threads.
+        size = -(-len(jobs) // workers)
+        shards = [jobs[i : i + size] for i in range(0, len(jobs), size)]
+        ex = self._fetch_pool()
+        futures = [ex.submit(_load, shard) for shard in shards[1:]]
+        try:
+            _load(shards[0])
+        finally:
+            # Don't return (or raise) while other shards still fill in plans.
+            wait(futures)
+        for f in futures:
+            f.result()
+
+    def _fetch_workers(self) -> int:
+        return min(max(1, self.max_concurrent_fetches), max(1, self.pool_size))
+
+    def _fetch_pool(self) -> ThreadPoolExecutor:
+        """
+        Threads for _fetch_bodies shards, started on first use and kept
+        until close() instead of being spun up for every fetch().
+        """
+        ex = self._fetch_executor
+        if ex is None:
+            with self._pool_lock:
+                if self._closing:
+                    raise IMAPError("IMAPClient is closed")
+                ex = self._fetch_executor
+                if ex is None:
+                    ex = self._fetch_executor = ThreadPoolExecutor(
+                        max_workers=max(1, self._fetch_workers() - 1),
+                        thread_name_prefix="imap-fetch",
+                    )
+        return ex
+
+    def _messages_from_meta(
+        self,
+        mailbox: str,
+        refs: Sequence[EmailRef],
+        partial: Dict[int, _FetchPartial],
+        *,
+        include_attachment_meta: bool,
+    ) -> List[EmailMessage]:
+        plans = self._plan_messages(refs, partial, include_attachment_meta=include_attachment_meta)
+        self._fetch_bodies(mailbox, plans)
+        return [
+            parse_headers_and_bodies(
+                p.ref,
+                p.header_bytes,
+                text=p.text,
+                html=p.html,
+                attachments=p.attachments if include_attachment_meta else [],
+                internaldate_raw=p.internaldate_raw,
+            )
+            for p in plans
+        ]
 
     def fetch(
         self, refs: Sequence[EmailRef], *, include_attachment_meta: bool = False
@@ -655,104 +1622,91 @@ class IMAPClient:
             return []
 
         mailbox = self._assert_same_mailbox(refs, "fetch")
-        required_uids = {r.uid for r in refs}
-
-        def _impl(state: _ConnState) -> List[EmailMessage]:
-            self._ensure_selected(state, mailbox, readonly=True)
-
-            uid_str = ",".join(str(r.uid) for r in refs)
-            attrs = "(UID INTERNALDATE BODYSTRUCTURE BODY.PEEK[HEADER])"
-            typ, data = state.conn.uid("FETCH", uid_str, attrs)
-            if typ != "OK":
-                raise IMAPError(f"FETCH failed: {data}")
-            if not data:
-                return []
 
-            partial: Dict[int, Dict[str, object]] = {}
-            current_uid: Optional[int] = None
+        # Header connection is released before the body fetches fan out.
+        partial = self._fetch_meta(mailbox, refs)
+        if not partial:
+            return []
+        return self._messages_from_meta(
+            mailbox, refs, partial, include_attachment_meta=include_attachment_meta
+        )
 
-            for piece in iter_fetch_pieces(data):
-                uid = parse_uid(piece.meta)
-                if uid is not None:
-                    current_uid = uid if uid in required_uids else None
-                if current_uid is None:
-                    continue
+    def _fetch_meta(self, mailbox: str, refs: Sequence[EmailRef]) -> Dict[int, _FetchPartial]:
+        required_uids = {r.uid for r in refs}
 
-                bucket = partial.setdefault(
-                    current_uid,
-                    {"headers": None, "internaldate": None, "bodystructure": None},
-                )
+        def _impl(state: _ConnState) -> List[object]:
+            self._ensure_selected(state, mailbox, readonly=True)
 
-                internal = parse_internaldate(piece.meta)
-                if internal:
-                    bucket["internaldate"] = internal
+            data: List[object] = []
+            for uid_set in pack_uid_sets(required_uids, max_bytes=self.max_command_bytes):
+                typ, chunk = state.conn.uid("FETCH", uid_set, self._fetch_meta_attrs())
+                if typ != "OK":
+                    raise IMAPError(f"FETCH failed: {chunk}")
+                data.extend(chunk or [])
+            return data
 
-                if has_header_peek(piece.meta) and piece.payload is not None:
-                    bucket["headers"] = piece.payload
+        # Parse after the connection is back in the pool.
+        return self._collect_fetch_meta(self._run(_impl, mailbox), required_uids)
 
-                bs = extract_bodystructure_from_fetch_meta(piece.meta)
-                if bs:
-                    bucket["bodystructure"] = bs
+    def search_and_fetch(
+        self, *, mailbox: str, query: IMAPQuery, include_attachment_meta: bool = False
+    ) -> List[EmailMessage]:
+        """
+        All messages matching `query`, newest first.
 
-            out: List[EmailMessage] = []
-            for r in refs:
-                info = partial.get(r.uid)
-                if not info:
-                    continue
+        With ESEARCH + SEARCHRES the search result is saved server-side as `$`
+        and the header FETCH runs against it in the same round trip:
 
-                header_bytes = info.get("headers") or b""
-                internaldate_raw = info.get("internaldate")
-                bs_raw = info.get("bodystructure")
+            UID SEARCH RETURN (SAVE) <criteria>
+            UID FETCH $ (UID INTERNALDATE BODYSTRUCTURE BODY.PEEK[HEADER])
 
-                text = ""
-                html = ""
-                attachment_metas: List[AttachmentMeta] = []
-                if isinstance(bs_raw, str) and bs_raw:
-                    try:
-                        tree = parse_bodystructure(bs_raw)
-                        text_parts, atts = extract_text_and_attachments(tree)
-                        plain_ref, html_ref = pick_best_text_parts(text_parts)
-
-                        if include_attachment_meta:
-                            attachment_metas = atts
-
-                        if plain_ref is not None:
-                            mime_b, body_b = self._fetch_section_mime_and_body(
-                                state, uid=r.uid, section=plain_ref.part
-                            )
-                            text = self._decode_section(mime_bytes=mime_b, body_bytes=body_b)
-
-                        if html_ref is not None:
-                            mime_b, body_b = self._fetch_section_mime_and_body(
-                                state, uid=r.uid, section=html_ref.part
-                            )
-                            html = self._decode_section(mime_bytes=mime_b, body_bytes=body_b)
-
-                        if html and attachment_metas:
-                            html, attachment_metas = inline_cids_as_data_uris(
-                                conn=state.conn,
-                                uid=r.uid,
-                                html=html,
-                                attachment_metas=attachment_metas,
-                            )
-                    except Exception:
-                        pass
-
-                msg = parse_headers_and_bodies(
-                    r,
-                    header_bytes,
-                    text=text,
-                    html=html,
-                    attachments=attachment_metas if include_attachment_meta else [],
-                    internaldate_raw=(
-                        internaldate_raw if isinstance(internaldate_raw, str) else None
-                    ),
-                )
-                out.append(msg)
+        Otherwise falls back to uid_search() + fetch().
+        """
+        criteria = query.build_bytes()
 
-            return out
+        def _impl(state: _ConnState) -> Optional[List[object]]:
+            caps = self._capabilities(state)
+            if "ESEARCH" not in caps or "SEARCHRES" not in caps:
+                return None
 
-        return self._run(_impl)
+            self._ensure_selected(state, mailbox, readonly=True)
+            if criteria.isascii():
+                search_cmd: Tuple[Union[str, bytes], ...] = ("UID", "SEARCH", "RETURN", "(SAVE)")
+            else:
+                search_cmd = ("UID", "SEARCH", "RETURN", "(SAVE)", "CHARSET", "UTF-8")
+
+            (s_typ, s_data), (f_typ, f_data) = pipeline(
+                state.conn,
+                [
+                    search_cmd + (criteria,),
+                    ("UID", "FETCH", "$", self._fetch_meta_attrs()),
+                ],
+            )
+            if s_typ != "OK":
+                raise IMAPError(f"SEARCH failed: {s_data}")
+            if f_typ != "OK":
+                raise IMAPError(f"FETCH failed: {f_data}")
+
+            state.conn.untagged_responses.pop("ESEARCH", None)
+            _, data = state.conn._untagged_response(f_typ, f_data, "FETCH")
+            return [d for d in data or [] if d is not None]
+
+        with self.session(mailbox):
+            data = self._run_search(_impl, mailbox)
+            if data is None:
+                uids = self.uid_search(mailbox=mailbox, query=query)
+                refs = [EmailRef(uid=u, mailbox=mailbox) for u in reversed(uids)]
+                partial = self._fetch_meta(mailbox, refs) if refs else {}
+
+        if data is not None:
+            partial = self._collect_fetch_meta(data)
+            refs = [EmailRef(uid=u, mailbox=mailbox) for u in sorted(partial, reverse=True)]
+
+        if not partial:
+            return []
+        return self._messages_from_meta(
+            mailbox, refs, partial, include_attachment_meta=include_attachment_meta
+        )
 
     # -----------------------
     # FETCH overview
@@ -763,68 +1717,63 @@ class IMAPClient:
             return []
         mailbox = self._assert_same_mailbox(refs, "fetch_overview")
 
-        def _impl(state: _ConnState) -> List[EmailOverview]:
+        # A dense page (the usual search_page result) goes out as one lo:hi
+        # range; the few extra messages' headers are small and get dropped
+        # below. Otherwise ranges instead of one token per UID, with sets
+        # past the command length limit pipelined.
+        span = covering_range(r.uid for r in refs)
+        uid_sets = (
+            [span]
+            if span is not None
+            else pack_uid_sets((r.uid for r in refs), max_bytes=self.max_command_bytes)
+        )
+
+        def _impl(state: _ConnState) -> List[object]:
             self._ensure_selected(state, mailbox, readonly=True)
 
-            uid_str = ",".join(str(r.uid) for r in refs)
             attrs = (
                 "(UID FLAGS INTERNALDATE "
                 "BODY.PEEK[HEADER.FIELDS (From To Subject Date Message-ID Content-Type Content-Transfer-Encoding)])"
             )
-            typ, data = state.conn.uid("FETCH", uid_str, attrs)
-            if typ != "OK":
-                raise IMAPError(f"FETCH overview failed: {data}")
-            if not data:
-                return []
-
-            partial: Dict[int, Dict[str, object]] = {}
-            current_uid: Optional[int] = None
-
-            for piece in iter_fetch_pieces(data):
-                uid = parse_uid(piece.meta)
-                if uid is not None:
-                    current_uid = uid
-                if current_uid is None:
-                    continue
-
-                bucket = partial.setdefault(
-                    current_uid,
-                    {"flags": set(), "headers": None, "internaldate": None},
-                )
-
-                bucket["flags"] = parse_flags(piece.meta) or bucket["flags"]
+            if len(uid_sets) == 1:
+                typ, data = state.conn.uid("FETCH", uid_sets[0], attrs)
+                if typ != "OK":
+                    raise IMAPError(f"FETCH overview failed: {data}")
+            else:
+                results = pipeline(state.conn, [("UID", "FETCH", s, attrs) for s in uid_sets])
+                _, data = state.conn._untagged_response("OK", [None], "FETCH")
+                for typ, dat in results:
+                    if typ != "OK":
+                        raise IMAPError(f"FETCH overview failed: {dat}")
+                data = [d for d in data or [] if d is not None]
+            return data or []
+
+        # Parse after the connection is back in the pool.
+        data = self._run(_impl, mailbox)
+        if not data:
+            return []
 
-                internal = parse_internaldate(piece.meta)
-                if internal:
-                    bucket["internaldate"] = internal
+        # Parse each message as its response is walked, instead of first
+        # collecting every message's pieces into per-UID buckets.
+        by_uid = {r.uid: r for r in refs}
+        parsed: Dict[int, EmailOverview] = {}
+        for uid, pieces in iter_fetch_messages(data):
+            ref = by_uid.get(uid) if uid is not None else None
+            if ref is None or not pieces:
+                continue
 
+            flags: Set[str] = set()
+            internaldate: Optional[str] = None
+            headers: Optional[bytes] = None
+            for piece in pieces:
+                flags = parse_flags(piece.meta) or flags
+                internaldate = parse_internaldate(piece.meta) or internaldate
                 if piece.payload is not None:
-                    bucket["headers"] = piece.payload
-
-            overviews: List[EmailOverview] = []
-            for r in refs:
-                info = partial.get(r.uid)
-                if not info:
-                    continue
+                    headers = piece.payload
 
-                flags = set(info["flags"]) if isinstance(info["flags"], set) else set()
-                header_bytes = info.get("headers") or b""
-                internaldate_raw = info.get("internaldate")
-
-                overviews.append(
-                    parse_overview(
-                        r,
-                        flags,
-                        header_bytes,
-                        internaldate_raw=(
-                            internaldate_raw if isinstance(internaldate_raw, str) else None
-                        ),
-                    )
-                )
+            parsed[uid] = parse_overview(ref, flags, headers or b"", internaldate_raw=internaldate)
 
-            return overviews
-
-        return self._run(_impl)
+        return [parsed[r.uid] for r in refs if r.uid in parsed]
 
     def fetch_message_id(self, ref: EmailRef) -> Optional[str]:
         mailbox = ref.mailbox
@@ -850,6 +1799,10 @@ class IMAPClient:
             if not header_bytes:
                 return None
 
+            m = _MESSAGE_ID_RE.search(header_bytes)
+            if m:
+                return m.group(1).decode("ascii")
+
             try:
                 msg = BytesParser(policy=default_policy).parsebytes(header_bytes)
                 mid = msg.get("Message-ID")
@@ -857,7 +1810,7 @@ class IMAPClient:
             except Exception:
                 return None
 
-        return self._run(_impl)
+        return self._run(_impl, mailbox)
 
     # -----------------------
     # Attachment fetch
@@ -872,21 +1825,36 @@ class IMAPClient:
             self._ensure_selected(state, mailbox, readonly=True)
             return fetch_part_bytes(state.conn, uid=uid, part=part)
 
-        return self._run(_impl)
+        return self._run(_impl, mailbox)
 
     # -----------------------
     # Mutations
     # -----------------------
 
     def append(
-        self, mailbox: str, msg: PyEmailMessage, *, flags: Optional[Set[str]] = None
+        self,
+        mailbox: str,
+        msg: Union[PyEmailMessage, bytes],
+        *,
+        flags: Optional[Set[str]] = None,
     ) -> EmailRef:
-        def _impl(state: _ConnState) -> EmailRef:
+        """
+        APPEND `msg` (a message, or its already serialized RFC822 bytes) to
+        `mailbox` and return its ref.
+        """
+        # Serialize once, not on every retry; bytes are sent as given.
+        raw_bytes = msg if isinstance(msg, bytes) else msg.as_bytes()
+        flags_arg = "(" + " ".join(sorted(flags)) + ")" if flags else None
+        imap_mailbox = self._format_mailbox_arg(mailbox)
 
-            flags_arg = "(" + " ".join(sorted(flags)) + ")" if flags else None
+        def _impl(state: _ConnState) -> EmailRef:
             date_time = imaplib.Time2Internaldate(time.time())
-            raw_bytes = msg.as_bytes()
-            imap_mailbox = self._format_mailbox_arg(mailbox)
+
+            # Without UIDPLUS there is no APPENDUID; bracket the APPEND with
+            # STATUS UIDNEXT instead (never SEARCH ALL the whole mailbox).
+            uidnext_before: Optional[int] = None
+            if "UIDPLUS" not in self._capabilities(state):
+                uidnext_before = self._uidnext(state, mailbox, fresh=True)
 
             typ, data = state.conn.append(imap_mailbox, flags_arg, date_time, raw_bytes)
             if typ != "OK":
@@ -894,179 +1862,467 @@ class IMAPClient:
 
             uid: Optional[int] = None
             if data and data[0]:
-                resp = (
-                    data[0].decode(errors="ignore") if isinstance(data[0], bytes) else str(data[0])
-                )
-                m = re.search(r"APPENDUID\s+\d+\s+(\d+)", resp)
+                m = _APPENDUID_RE.search(_as_bytes(data[0]))
                 if m:
                     uid = int(m.group(1))
 
+            # Exactly one new UID since the first STATUS: it's ours. Anything
+            # else means a concurrent APPEND, so don't guess.
+            if uid is None and uidnext_before is not None:
+                if self._uidnext(state, mailbox, fresh=True) == uidnext_before + 1:
+                    uid = uidnext_before
+
             if uid is None:
                 raise IMAPError("APPEND succeeded but could not determine UID")
 
             return EmailRef(uid=uid, mailbox=mailbox)
 
-        ref = self._run(_impl)
+        ref = self._run(_impl, mailbox)
+        self._invalidate_search_cache(mailbox)
         return ref
 
-    def add_flags(self, refs: Sequence[EmailRef], *, flags: Set[str]) -> None:
-        self._store(refs, mode="+FLAGS", flags=flags)
+    def add_flags(
+        self,
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
+        *,
+        flags: Set[str],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        self._store(refs, mode="+FLAGS", flags=flags, chunk_size=chunk_size)
 
-    def remove_flags(self, refs: Sequence[EmailRef], *, flags: Set[str]) -> None:
-        self._store(refs, mode="-FLAGS", flags=flags)
+    def remove_flags(
+        self,
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
+        *,
+        flags: Set[str],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        self._store(refs, mode="-FLAGS", flags=flags, chunk_size=chunk_size)
 
-    def _store(self, refs: Sequence[EmailRef], *, mode: str, flags: Set[str]) -> None:
+    def _store(
+        self,
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
+        *,
+        mode: str,
+        flags: Set[str],
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        STORE flags on `refs`, at most `chunk_size` UIDs (and max_command_bytes)
+        per command.
+        """
         if not refs:
             return
-        mailbox = self._assert_same_mailbox(refs, "_store")
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0")
+
+        uids: Sequence[int]
+        if isinstance(refs, EmailRefBatch):
+            mailbox = refs.mailbox
+            uids = refs.uids
+        else:
+            mailbox = self._assert_same_mailbox(refs, "_store")
+            uids = list(map(_ref_uid, refs))
+
+        flag_set = frozenset(flags)
+        if self._queue_op("store", (mailbox, mode, flag_set, chunk_size), uids):
+            return
+        self._store_many(mailbox, [(mode, flag_set, chunk_size, uids)])
+
+    def _store_many(
+        self,
+        mailbox: str,
+        stores: Sequence[Tuple[str, FrozenSet[str], Optional[int], Sequence[int]]],
+    ) -> None:
+        """
+        Run (mode, flags, chunk_size, uids) STOREs on `mailbox`, in order.
+        Every command (all chunks of all stores) is pipelined, so the whole
+        update costs one round trip.
+        """
+        commands: List[Tuple[Tuple[Arg, ...], str]] = []
+        for mode, flag_set, chunk_size, uids in stores:
+            args = _store_args(mode, flag_set)
+            step = chunk_size or len(uids)
+            for i in range(0, len(uids), step):
+                for uid_set in pack_uid_sets(uids[i : i + step], max_bytes=self.max_command_bytes):
+                    commands.append((("STORE", uid_set, *args), "STORE"))
 
         def _impl(state: _ConnState) -> None:
             self._ensure_selected(state, mailbox, readonly=False)
-            uids = ",".join(str(r.uid) for r in refs)
-            flag_list = "(" + " ".join(sorted(flags)) + ")"
-            typ, data = state.conn.uid("STORE", uids, mode, flag_list)
+            self._uid_pipeline(state, commands)
+
+        self._run(_impl, mailbox)
+        # Only searches that look at flags can change; FROM/SUBJECT/SINCE/...
+        # results stay cached.
+        self._invalidate_search_cache(mailbox, where=criteria_reads_flags)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Queue add_flags/remove_flags/copy/move calls made by this thread and
+        send them when the block exits:
+
+            with imap.batch():
+                for ref in refs:
+                    imap.add_flags([ref], flags={SEEN})
+
+        Consecutive calls of the same kind with the same target (mailbox,
+        mode and flags, or source and destination) are merged into one UID set,
+        so the loop above costs a single STORE. Everything runs in call order
+        on one connection. If the block raises, the queued calls are dropped.
+        Nested batches join the outer one.
+        """
+        if getattr(self._tls, "batch", None) is not None:
+            yield
+            return
+
+        self._tls.batch = []
+        try:
+            yield
+            pending: List[_PendingOp] = self._tls.batch
+        finally:
+            self._tls.batch = None
+
+        if not pending:
+            return
+        with self._acquire():
+            i = 0
+            while i < len(pending):
+                op = pending[i]
+                i += 1
+                if op.kind != "store":
+                    src, dst = op.key
+                    run = self.move if op.kind == "move" else self.copy
+                    run(EmailRefBatch.from_uids(op.uids, src), src_mailbox=src, dst_mailbox=dst)
+                    continue
+                # A run of STOREs on one mailbox (different modes or flags)
+                # goes out as a single pipeline.
+                stores = [op]
+                while (
+                    i < len(pending)
+                    and pending[i].kind == "store"
+                    and pending[i].key[0] == op.key[0]
+                ):
+                    stores.append(pending[i])
+                    i += 1
+                self._store_many(op.key[0], [(*o.key[1:], o.uids) for o in stores])
+
+    def _queue_op(self, kind: str, key: tuple, uids: Iterable[int]) -> bool:
+        """
+        Inside batch(): queue the write (merging it into the previous one when
+        kind and key match) and return True. Otherwise return False.
+        """
+        pending: Optional[List[_PendingOp]] = getattr(self._tls, "batch", None)
+        if pending is None:
+            return False
+        if pending and pending[-1].kind == kind and pending[-1].key == key:
+            pending[-1].uids.extend(uids)
+        else:
+            pending.append(_PendingOp(kind=kind, key=key, uids=list(uids)))
+        return True
+
+    def _uid_batch(
+        self, state: _ConnState, command: str, uid_sets: Sequence[str], *args: Arg, what: str
+    ) -> None:
+        """
+        Run `UID <command> <uid_set> <args...>` for every set: a single command
+        as usual, several pipelined into one round trip. Raises IMAPError
+        (prefixed with `what`) if any of them fails.
+        """
+        self._uid_pipeline(state, [((command, s, *args), what) for s in uid_sets])
+
+    def _uid_chain(
+        self,
+        state: _ConnState,
+        uid_sets: Sequence[str],
+        steps: Sequence[Tuple[str, Tuple[Arg, ...], str]],
+    ) -> None:
+        """
+        Pipeline `UID <command> <uid_set> <args...>` for each (command, args,
+        what) step over every set, in order, and read all completions in one
+        round trip. The server still runs them in order, but a later step is
+        sent before an earlier one is known to have succeeded: only chain
+        steps that are harmless if a previous one failed.
+        """
+        self._uid_pipeline(
+            state, [((command, s, *args), what) for command, args, what in steps for s in uid_sets]
+        )
+
+    def _uid_pipeline(
+        self, state: _ConnState, commands: Sequence[Tuple[Tuple[Arg, ...], str]]
+    ) -> None:
+        """
+        Run `UID <args...>` for each (args, what): a single command as usual,
+        several pipelined into one round trip. Raises IMAPError (prefixed with
+        that command's `what`) if any of them fails.
+        """
+        if len(commands) == 1:
+            results = [state.conn.uid(*commands[0][0])]
+        else:
+            results = pipeline(state.conn, [("UID", *args) for args, _ in commands])
+        self._drop_write_echoes(state)
+
+        for (typ, data), (_, what) in zip(results, commands):
             if typ != "OK":
-                raise IMAPError(f"STORE failed: {data}")
+                raise IMAPError(f"{what} failed: {data}")
 
-        self._run(_impl)
+    def _drop_write_echoes(self, state: _ConnState) -> None:
+        # STORE echoes FETCH, MOVE reports EXPUNGE; nobody reads them.
+        state.conn.untagged_responses.pop("FETCH", None)
+        state.conn.untagged_responses.pop("EXPUNGE", None)
+
+    def expunge(
+        self,
+        mailbox: str = "INBOX",
+        refs: Optional[Union[Sequence[EmailRef], EmailRefBatch]] = None,
+    ) -> None:
+        """
+        Permanently remove \\Deleted messages from `mailbox`.
+
+        With `refs`, only those messages are expunged (UID EXPUNGE), leaving
+        other \\Deleted messages alone; this needs the server's UIDPLUS.
+        """
+        uids: Sequence[int] = ()
+        if refs is not None:
+            if not refs:
+                return
+            uids = self._uids_in(refs, mailbox, "expunge")
 
-    def expunge(self, mailbox: str = "INBOX") -> None:
         def _impl(state: _ConnState) -> None:
             self._ensure_selected(state, mailbox, readonly=False)
-            typ, data = state.conn.expunge()
-            if typ != "OK":
-                raise IMAPError(f"EXPUNGE failed: {data}")
+            if refs is None:
+                typ, data = state.conn.expunge()
+                if typ != "OK":
+                    raise IMAPError(f"EXPUNGE failed: {data}")
+                return
 
-        self._run(_impl)
+            # A plain EXPUNGE would take every \Deleted message with it.
+            if "UIDPLUS" not in self._capabilities(state):
+                raise IMAPError("expunge(refs=...) needs UIDPLUS (UID EXPUNGE)")
+            uid_sets = pack_uid_sets(uids, max_bytes=self.max_command_bytes)
+            self._uid_batch(state, "EXPUNGE", uid_sets, what="UID EXPUNGE")
+
+        self._run(_impl, mailbox)
+        if refs is None:
+            self._invalidate_search_cache(mailbox)
+        else:
+            self._forget_search_uids(mailbox, uids)
 
     # -----------------------
     # Mailboxes
     # -----------------------
 
     def list_mailboxes(self) -> List[str]:
-        def _impl(state: _ConnState) -> List[str]:
-            typ, data = state.conn.list()
-            if typ != "OK":
-                raise IMAPError(f"LIST failed: {data}")
+        return self._run(self._list_mailboxes_impl)
 
-            mailboxes: List[str] = []
-            for raw in data or []:
-                if not raw:
-                    continue
+    def _list_mailboxes_impl(self, state: _ConnState) -> List[str]:
+        typ, data = state.conn.list()
+        if typ != "OK":
+            raise IMAPError(f"LIST failed: {data}")
 
-                flags = self._parse_list_flags(raw)
-                if r"\NOSELECT" in flags:
-                    continue
+        # One regex pass over all lines instead of per-line parsing; only the
+        # names of selectable mailboxes are ever decoded.
+        buf = b"\n".join(raw for raw in data or [] if isinstance(raw, (bytes, bytearray)))
 
-                name = parse_list_mailbox_name(raw)
-                if name is not None:
-                    mailboxes.append(name)
+        mailboxes: List[str] = []
+        for m in _LIST_RE.finditer(buf):
+            quoted, atom = m.groups()
+            if quoted is not None:
+                name = _QUOTED_ESCAPE_RE.sub(rb"\1", quoted).decode(errors="ignore")
+            else:
+                name = atom.decode(errors="ignore")
+            if name:
+                mailboxes.append(name)
 
-            return mailboxes
+        return mailboxes
 
-        return self._run(_impl)
+    _STATUS_ITEMS = "(MESSAGES UNSEEN UIDNEXT UIDVALIDITY HIGHESTMODSEQ)"
+
+    def _parse_status(self, raw: object) -> Dict[str, int]:
+        b = _as_bytes(raw)
+
+        # The item list is the last parenthesized group; mailbox names may
+        # themselves contain "(".
+        start = b.rfind(b"(")
+        end = b.find(b")", start + 1)
+        if start == -1 or end == -1:
+            raise IMAPError(f"Unexpected STATUS response: {b!r}")
+
+        status: Dict[str, int] = {}
+        for key, val in _STATUS_ITEM_RE.findall(b, start + 1, end):
+            name = _STATUS_KEYS.get(key) or _STATUS_KEYS.get(key.upper())
+            if name is None:
+                name = key.decode("ascii", "ignore").lower()
+            status[name] = int(val)
+
+        return status
 
     def mailbox_status(self, mailbox: str = "INBOX") -> Dict[str, int]:
-        def _impl(state: _ConnState) -> Dict[str, int]:
-            imap_mailbox = self._format_mailbox_arg(mailbox)
+        return self._run(partial(self._mailbox_status_impl, mailbox=mailbox))
 
-            typ, data = state.conn.status(
-                imap_mailbox,
-                "(MESSAGES UNSEEN UIDNEXT UIDVALIDITY HIGHESTMODSEQ)",
-            )
-            if typ != "OK":
-                raise IMAPError(f"STATUS {mailbox!r} failed: {data}")
-            if not data or not data[0]:
-                raise IMAPError(f"STATUS {mailbox!r} returned empty data")
+    def _mailbox_status_impl(self, state: _ConnState, *, mailbox: str) -> Dict[str, int]:
+        imap_mailbox = self._format_mailbox_arg(mailbox)
 
-            raw = data[0]
-            s = raw.decode(errors="ignore") if isinstance(raw, bytes) else str(raw)
+        typ, data = state.conn.status(imap_mailbox, self._STATUS_ITEMS)
+        if typ != "OK":
+            raise IMAPError(f"STATUS {mailbox!r} failed: {data}")
+        if not data or not data[0]:
+            raise IMAPError(f"STATUS {mailbox!r} returned empty data")
 
-            start = s.find("(")
-            end = s.rfind(")")
-            if start == -1 or end == -1 or end <= start:
-                raise IMAPError(f"Unexpected STATUS response: {s!r}")
+        return self._parse_status(data[0])
 
-            payload = s[start + 1 : end]
-            tokens = payload.split()
+    def mailbox_statuses(self, mailboxes: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """
+        STATUS for several mailboxes in one round trip.
 
-            status: Dict[str, int] = {}
-            for i in range(0, len(tokens) - 1, 2):
-                key = tokens[i].upper()
-                try:
-                    val = int(tokens[i + 1])
-                except ValueError:
-                    continue
+        The commands are pipelined on a single connection; each untagged
+        STATUS reply names its mailbox, which is how replies are matched
+        back to the requested names.
+        """
+        names = list(dict.fromkeys(mailboxes))
+        if len(names) <= 1:
+            return {name: self.mailbox_status(name) for name in names}
+
+        def _impl(state: _ConnState) -> Dict[str, Dict[str, int]]:
+            args = {name: self._format_mailbox_arg(name) for name in names}
+            results = pipeline(
+                state.conn, [("STATUS", args[name], self._STATUS_ITEMS) for name in names]
+            )
+            _, data = state.conn._untagged_response("OK", [None], "STATUS")
+            for name, (typ, dat) in zip(names, results):
+                if typ != "OK":
+                    raise IMAPError(f"STATUS {name!r} failed: {dat}")
 
-                if key == "MESSAGES":
-                    status["messages"] = val
-                elif key == "UNSEEN":
-                    status["unseen"] = val
-                elif key == "UIDNEXT":
-                    status["uidnext"] = val
-                elif key == "UIDVALIDITY":
-                    status["uidvalidity"] = val
-                elif key == "HIGHESTMODSEQ":
-                    status["highestmodseq"] = val
-                else:
-                    status[key.lower()] = val
+            wanted = {_status_key(arg): name for name, arg in args.items()}
+            out: Dict[str, Dict[str, int]] = {}
+            for raw in data or []:
+                if not isinstance(raw, (bytes, bytearray)):
+                    continue
+                head, sep, _ = raw.rpartition(b"(")
+                name = wanted.get(_status_key(head.decode(errors="ignore"))) if sep else None
+                if name is not None:
+                    out[name] = self._parse_status(raw)
 
-            return status
+            missing = [name for name in names if name not in out]
+            if missing:
+                raise IMAPError(f"STATUS returned no data for {missing!r}")
+            return out
 
         return self._run(_impl)
 
-    def move(self, refs: Sequence[EmailRef], *, src_mailbox: str, dst_mailbox: str) -> None:
-        if not refs:
-            return
-        for r in refs:
-            if r.mailbox != src_mailbox:
-                raise IMAPError("All EmailRef.mailbox must match src_mailbox for move()")
+    def mailbox_status_all(self) -> Dict[str, Dict[str, int]]:
+        """
+        STATUS of every selectable mailbox, keyed by name.
 
-        def _impl(state: _ConnState) -> None:
-            self._ensure_selected(state, src_mailbox, readonly=False)
+        Servers with LIST-STATUS (RFC 5819) answer a single
+        LIST "" "*" RETURN (STATUS ...); otherwise this is a LIST followed by
+        pipelined STATUS commands (two round trips).
+        """
 
-            uids = ",".join(str(r.uid) for r in refs)
-            dst_arg = self._format_mailbox_arg(dst_mailbox)
+        def _impl(state: _ConnState) -> Dict[str, Dict[str, int]]:
+            if "LIST-STATUS" not in self._capabilities(state):
+                # Nested calls reuse this connection.
+                return self.mailbox_statuses(self._list_mailboxes_impl(state))
 
-            typ, data = state.conn.uid("MOVE", uids, dst_arg)
-            if typ == "OK":
-                return
+            typ, dat = state.conn._simple_command(
+                "LIST", '""', '"*"', "RETURN", f"(STATUS {self._STATUS_ITEMS})"
+            )
+            state.conn.untagged_responses.pop("LIST", None)
+            _, data = state.conn._untagged_response(typ, dat, "STATUS")
+            if typ != "OK":
+                raise IMAPError(f"LIST-STATUS failed: {data}")
 
-            typ_copy, data_copy = state.conn.uid("COPY", uids, dst_arg)
-            if typ_copy != "OK":
-                raise IMAPError(f"COPY (for MOVE fallback) failed: {data_copy}")
+            # \Noselect mailboxes get a LIST line but no STATUS line.
+            out: Dict[str, Dict[str, int]] = {}
+            for raw in data or []:
+                if not isinstance(raw, (bytes, bytearray)):
+                    continue
+                head, sep, _ = raw.rpartition(b"(")
+                if sep:
+                    out[_status_key(head.decode(errors="ignore"))] = self._parse_status(raw)
+            return out
 
-            typ_store, data_store = state.conn.uid("STORE", uids, "+FLAGS.SILENT", r"(\Deleted)")
-            if typ_store != "OK":
-                raise IMAPError(f"STORE +FLAGS.SILENT \\Deleted failed: {data_store}")
+        return self._run(_impl)
 
-            typ_ue, _data_ue = state.conn.uid("EXPUNGE", uids)
-            if typ_ue == "OK":
-                return
+    def move(
+        self,
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
+        *,
+        src_mailbox: str,
+        dst_mailbox: str,
+    ) -> None:
+        if not refs:
+            return
+        uids = self._uids_in(refs, src_mailbox, "move")
+
+        if self._queue_op("move", (src_mailbox, dst_mailbox), uids):
+            return
+
+        uid_sets = pack_uid_sets(uids, max_bytes=self.max_command_bytes)
 
+        # Returns False when a plain EXPUNGE may have removed other messages too.
+        def _impl(state: _ConnState) -> bool:
+            self._ensure_selected(state, src_mailbox, readonly=False)
+            dst_arg = self._format_mailbox_arg(dst_mailbox)
+            caps = self._capabilities(state)
+
+            # Servers without MOVE answer BAD, which imaplib raises: don't try.
+            if "MOVE" in caps:
+                self._uid_batch(state, "MOVE", uid_sets, dst_arg, what="MOVE")
+                return True
+
+            # COPY must succeed before anything is marked \Deleted, so it gets
+            # its own round trip.
+            self._uid_batch(state, "COPY", uid_sets, dst_arg, what="COPY (for MOVE fallback)")
+            store = ("STORE", ("+FLAGS.SILENT", r"(\Deleted)"), "STORE +FLAGS.SILENT \\Deleted")
+
+            if "UIDPLUS" in caps:
+                # UID EXPUNGE only touches these UIDs, so it can ride along
+                # with the STORE: if the STORE failed it removes nothing new.
+                self._uid_chain(
+                    state,
+                    uid_sets,
+                    [store, ("EXPUNGE", (), "UID EXPUNGE after MOVE fallback")],
+                )
+                return True
+
+            # Plain EXPUNGE removes every \Deleted message in the mailbox:
+            # only send it once the STORE is known to have worked.
+            self._uid_batch(state, store[0], uid_sets, *store[1], what=store[2])
             typ_ex, data_ex = state.conn.expunge()
             if typ_ex != "OK":
                 raise IMAPError(f"EXPUNGE after MOVE fallback failed: {data_ex}")
+            return False
 
-        self._run(_impl)
+        if self._run(_impl, src_mailbox):
+            self._forget_search_uids(src_mailbox, uids)
+        else:
+            self._invalidate_search_cache(src_mailbox)
+        self._invalidate_search_cache(dst_mailbox)
 
-    def copy(self, refs: Sequence[EmailRef], *, src_mailbox: str, dst_mailbox: str) -> None:
+    def copy(
+        self,
+        refs: Union[Sequence[EmailRef], EmailRefBatch],
+        *,
+        src_mailbox: str,
+        dst_mailbox: str,
+    ) -> None:
         if not refs:
             return
-        for r in refs:
-            if r.mailbox != src_mailbox:
-                raise IMAPError("All EmailRef.mailbox must match src_mailbox for copy()")
+        uids = self._uids_in(refs, src_mailbox, "copy")
+
+        if self._queue_op("copy", (src_mailbox, dst_mailbox), uids):
+            return
+
+        uid_sets = pack_uid_sets(uids, max_bytes=self.max_command_bytes)
 
         def _impl(state: _ConnState) -> None:
             self._ensure_selected(state, src_mailbox, readonly=False)
-
-            uids = ",".join(str(r.uid) for r in refs)
             dst_arg = self._format_mailbox_arg(dst_mailbox)
-            typ, data = state.conn.uid("COPY", uids, dst_arg)
-            if typ != "OK":
-                raise IMAPError(f"COPY failed: {data}")
+            self._uid_batch(state, "COPY", uid_sets, dst_arg, what="COPY")
 
-        self._run(_impl)
+        self._run(_impl, src_mailbox)
+        self._invalidate_search_cache(dst_mailbox)
 
     def create_mailbox(self, name: str) -> None:
         def _impl(state: _ConnState) -> None:
@@ -1085,27 +2341,67 @@ class IMAPClient:
                 raise IMAPError(f"DELETE {name!r} failed: {data}")
 
         self._run(_impl)
+        self._invalidate_search_cache(name)
 
+    def watch(
+        self,
+        mailboxes: Sequence[str],
+        callback: Callable[[MailboxEvent], None],
+        *,
+        renew_seconds: float = 25 * 60,
+    ) -> MailboxWatcher:
+        """
+        Get EXISTS/EXPUNGE/FETCH updates for `mailboxes` pushed via IDLE
+        instead of polling mailbox_status(). Each mailbox holds one extra
+        connection outside the pool; `callback` runs on its watcher thread.
+        Cached searches for a mailbox are invalidated as its updates arrive.
+
+            with imap.watch(["INBOX"], on_event):
+                ...
+
+        Call stop() on the returned watcher (or use it as a context manager)
+        to end it.
+        """
+        return MailboxWatcher(self, mailboxes, callback, renew_seconds=renew_seconds).start()
+
+    # Keepalive loops call this constantly; like mailbox_status and
+    # list_mailboxes, its body is a plain method rather than a closure built
+    # per call.
     def ping(self) -> None:
-        def _impl(state: _ConnState) -> None:
-            typ, data = state.conn.noop()
-            if typ != "OK":
-                raise IMAPError(f"NOOP failed: {data}")
+        self._run(self._ping_impl)
 
-        self._run(_impl)
+    def _ping_impl(self, state: _ConnState) -> None:
+        typ, data = state.conn.noop()
+        if typ != "OK":
+            raise IMAPError(f"NOOP failed: {data}")
 
     def close(self) -> None:
         with self._pool_lock:
             self._closing = True
-            while True:
-                try:
-                    state = self._pool.get_nowait()
-                except Empty:
-                    break
-                try:
-                    state.conn.logout()
-                except Exception:
-                    pass
+            idle = list(self._idle)
+            self._idle.clear()
+            for waiter in self._waiters:
+                waiter.cv.notify()
+            self._waiters.clear()
+            fetch_executor, self._fetch_executor = self._fetch_executor, None
+
+        if fetch_executor is not None:
+            fetch_executor.shutdown(wait=False)
+
+        if len(idle) <= 1:
+            for state in idle:
+                self._logout_quietly(state)
+            return
+
+        # Each LOGOUT waits for its BYE/OK; overlap those round trips.
+        with ThreadPoolExecutor(max_workers=len(idle)) as ex:
+            list(ex.map(self._logout_quietly, idle))
+
+    def _logout_quietly(self, state: _ConnState) -> None:
+        try:
+            state.conn.logout()
+        except Exception:
+            pass
 
     def __enter__(self) -> IMAPClient:
         return self
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Iterator, Optional, Sequence, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 UID_RE = re.compile(r"UID\s+(\d+)", re.IGNORECASE)
 INTERNALDATE_RE = re.compile(r'INTERNALDATE\s+"([^"]+)"', re.IGNORECASE)
@@ -13,6 +13,10 @@ FLAGS_RE = re.compile(r"FLAGS\s*\(([^)]*)\)", re.IGNORECASE)
 MIME_TOKEN_RE = re.compile(r"BODY\[(\d+(?:\.\d+)*)\.MIME\]", re.IGNORECASE)
 BODY_TOKEN_RE = re.compile(r"BODY\[(\d+(?:\.\d+)*)\]", re.IGNORECASE)
 HEADER_PEEK_RE = re.compile(r"BODY\[HEADER\]", re.IGNORECASE)
+SECTION_TOKEN_RE = re.compile(r"BODY\[(\d+(?:\.\d+)*)(\.MIME)?\]", re.IGNORECASE)
+
+# "<seq> (" opens one message's FETCH data
+MESSAGE_START_RE = re.compile(rb"^\s*\d+\s+\(")
 
 
 @dataclass(frozen=True)
@@ -78,6 +82,55 @@ def iter_fetch_pieces(data: Sequence[object]) -> Iterator[FetchPiece]:
         i += 2 if used_next else 1
 
 
+def iter_fetch_messages(data: Sequence[object]) -> Iterator[Tuple[Optional[int], List[FetchPiece]]]:
+    """
+    Group FETCH response data per message as (uid, pieces).
+
+    The UID is read wherever the server put it: before the literals, between
+    them, or in the trailing text after the last one (b" UID 7)"), which
+    iter_fetch_pieces() skips.
+    """
+    uid: Optional[int] = None
+    pieces: List[FetchPiece] = []
+    started = False
+
+    i = 0
+    n = len(data)
+    while i < n:
+        item = data[i]
+
+        if isinstance(item, (bytes, bytearray)):
+            if MESSAGE_START_RE.match(item):
+                if started:
+                    yield uid, pieces
+                uid, pieces, started = None, [], True
+            if started and uid is None:
+                uid = parse_uid(item.decode(errors="ignore"))
+            i += 1
+            continue
+
+        if not isinstance(item, tuple) or not item or not isinstance(item[0], (bytes, bytearray)):
+            i += 1
+            continue
+
+        meta_raw = item[0]
+        if MESSAGE_START_RE.match(meta_raw):
+            if started:
+                yield uid, pieces
+            uid, pieces, started = None, [], True
+
+        meta_str = meta_raw.decode(errors="ignore")
+        if uid is None:
+            uid = parse_uid(meta_str)
+        payload, used_next = _extract_payload_from_fetch_item(item, data, i)
+        pieces.append(FetchPiece(meta=meta_str, payload=payload))
+
+        i += 2 if used_next else 1
+
+    if started:
+        yield uid, pieces
+
+
 def parse_uid(meta: str) -> Optional[int]:
     m = UID_RE.search(meta)
     return int(m.group(1)) if m else None
@@ -105,6 +158,19 @@ def match_section_mime(meta: str) -> Optional[str]:
     return m.group(1) if m else None
 
 
+def match_literal_section(meta: str) -> Optional[Tuple[str, bool]]:
+    """
+    (section, is_mime) for the last BODY[<n>] / BODY[<n>.MIME] item in `meta`:
+    the one whose literal follows. Earlier items in the same text were
+    answered inline (e.g. NIL for a part that doesn't exist).
+    """
+    found = SECTION_TOKEN_RE.findall(meta)
+    if not found:
+        return None
+    section, mime = found[-1]
+    return section, bool(mime)
+
+
 def match_section_body(meta: str) -> Optional[str]:
     """
     Returns section id for BODY[...] but NOT BODY[...MIME].
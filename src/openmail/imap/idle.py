@@ -0,0 +1,209 @@
+# openmail/imap/idle.py
+from __future__ import annotations
+
+import imaplib
+import random
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+from openmail._compat import DATACLASS_SLOTS
+from openmail.errors import IMAPError
+from openmail.imap.query import criteria_reads_flags
+from openmail.logger import get_logger
+
+if TYPE_CHECKING:
+    from openmail.imap.client import IMAPClient
+
+logger = get_logger()
+
+# "* 23 EXISTS", "* 5 EXPUNGE", "* 3 FETCH (FLAGS (\Seen))"
+_UNTAGGED_RE = re.compile(rb"^\* (\d+) (EXISTS|EXPUNGE|FETCH)\b", re.IGNORECASE)
+_LITERAL_RE = re.compile(rb"\{(\d+)\}$")
+
+# Slack past renew_seconds for the DONE -> OK exchange before a silent
+# connection is considered dead.
+_IDLE_GRACE_SECONDS = 60.0
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class MailboxEvent:
+    """
+    One untagged update pushed during IDLE.
+
+    kind is "EXISTS" (number = new message count), "EXPUNGE" (number = the
+    removed message's sequence number) or "FETCH" (number = sequence number
+    of a message whose flags changed).
+    """
+
+    mailbox: str
+    kind: str
+    number: int
+    raw: bytes
+
+
+class MailboxWatcher:
+    """
+    Push notifications for mailboxes via IDLE (RFC 2177), instead of polling
+    mailbox_status().
+
+    Each mailbox gets its own connection (outside the client's pool) and
+    thread. Updates are delivered to `callback` on that thread, and the
+    client's cached searches for the mailbox are invalidated as they arrive.
+    IDLE is re-issued every `renew_seconds` (servers drop it after ~30 min).
+    A lost connection is reopened after `retry_seconds`, doubling per failed
+    attempt up to `retry_max_seconds`, with jitter so the watcher threads
+    (and other clients) don't all reconnect in the same instant.
+    """
+
+    def __init__(
+        self,
+        client: IMAPClient,
+        mailboxes: Sequence[str],
+        callback: Callable[[MailboxEvent], None],
+        *,
+        renew_seconds: float = 25 * 60,
+        retry_seconds: float = 5.0,
+        retry_max_seconds: float = 300.0,
+    ) -> None:
+        self.client = client
+        self.mailboxes = list(dict.fromkeys(mailboxes))
+        self.callback = callback
+        self.renew_seconds = renew_seconds
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        # mailbox -> connection currently in IDLE (DONE not yet sent)
+        self._idling: Dict[str, imaplib.IMAP4] = {}
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> MailboxWatcher:
+        if self._threads:
+            return self
+        for mailbox in self.mailboxes:
+            t = threading.Thread(
+                target=self._watch, args=(mailbox,), name=f"imap-idle:{mailbox}", daemon=True
+            )
+            self._threads.append(t)
+            t.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        with self._lock:
+            idling = list(self._idling.items())
+        for mailbox, _ in idling:
+            self._done(mailbox)
+        for t in self._threads:
+            t.join(timeout)
+
+    def __enter__(self) -> MailboxWatcher:
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    # -----------------------
+    # Per-mailbox loop
+    # -----------------------
+
+    def _watch(self, mailbox: str) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            conn: Optional[imaplib.IMAP4] = None
+            try:
+                conn = self.client._open_new_connection()
+                typ, data = conn.select(self.client._format_mailbox_arg(mailbox), readonly=True)
+                if typ != "OK":
+                    raise IMAPError(f"EXAMINE {mailbox!r} failed: {data}")
+                failures = 0
+                # Anything may have changed while we weren't watching.
+                self.client._invalidate_search_cache(mailbox)
+                # Quiet mailboxes send nothing until the renewal; don't let
+                # the normal read timeout cut the IDLE short.
+                conn.sock.settimeout(self.renew_seconds + _IDLE_GRACE_SECONDS)
+                while not self._stop.is_set():
+                    if not self._idle_once(conn, mailbox):
+                        logger.error("Server rejected IDLE; not watching %r", mailbox)
+                        return
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                delay = min(self.retry_max_seconds, self.retry_seconds * (2**failures))
+                failures = min(failures + 1, 16)  # 2**failures stays a sane float
+                logger.warning("IDLE on %r failed, reconnecting: %s", mailbox, e)
+                self._stop.wait(delay * random.uniform(0.5, 1.5))
+            finally:
+                with self._lock:
+                    self._idling.pop(mailbox, None)
+                if conn is not None:
+                    try:
+                        conn.logout()
+                    except Exception:
+                        pass
+
+    def _idle_once(self, conn: imaplib.IMAP4, mailbox: str) -> bool:
+        """
+        One IDLE ... DONE cycle, dispatching updates as they arrive.
+        Returns False if the server rejects IDLE outright.
+        """
+        tag = conn._new_tag()
+        conn.send(tag + b" IDLE\r\n")
+        line = conn._get_line()
+        if line.startswith(tag):
+            return False
+        if not line.startswith(b"+"):
+            raise IMAPError(f"Unexpected reply to IDLE: {line!r}")
+
+        with self._lock:
+            self._idling[mailbox] = conn
+        if self._stop.is_set():
+            self._done(mailbox)
+        timer = threading.Timer(self.renew_seconds, self._done, (mailbox,))
+        timer.daemon = True
+        timer.start()
+        try:
+            while True:
+                line = conn._get_line()
+                if line.startswith(tag):
+                    if line[len(tag) :].split(None, 1)[:1] != [b"OK"]:
+                        raise IMAPError(f"IDLE failed: {line!r}")
+                    return True
+                # Skip any literals so their contents aren't read as responses.
+                m = _LITERAL_RE.search(line)
+                while m:
+                    conn.read(int(m.group(1)))
+                    line += b" " + conn._get_line()
+                    m = _LITERAL_RE.search(line)
+                self._dispatch(mailbox, line)
+        finally:
+            timer.cancel()
+
+    def _done(self, mailbox: str) -> None:
+        # End the IDLE at most once; the loop re-issues it unless stopping.
+        with self._lock:
+            conn = self._idling.pop(mailbox, None)
+        if conn is None:
+            return
+        try:
+            conn.send(b"DONE\r\n")
+        except Exception:
+            pass
+
+    def _dispatch(self, mailbox: str, line: bytes) -> None:
+        m = _UNTAGGED_RE.match(line)
+        if not m:
+            return
+        kind = m.group(2).decode("ascii").upper()
+        if kind == "FETCH":
+            self.client._invalidate_search_cache(mailbox, where=criteria_reads_flags)
+        else:
+            self.client._invalidate_search_cache(mailbox)
+
+        try:
+            self.callback(MailboxEvent(mailbox, kind, int(m.group(1)), line))
+        except Exception:
+            logger.exception("IDLE callback for %r raised", mailbox)
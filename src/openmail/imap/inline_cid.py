@@ -1,12 +1,10 @@
 from __future__ import annotations
 
 import base64
-import imaplib
 import re
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from urllib.parse import unquote
 
-from openmail.imap.attachment_parts import fetch_part_bytes
 from openmail.models import AttachmentMeta
 
 _IMG_SRC_RE = re.compile(r'(<img\b[^>]*\bsrc=["\'])([^"\']+)(["\'])', re.IGNORECASE)
@@ -62,15 +60,43 @@ def build_inline_index(atts: Iterable[AttachmentMeta]) -> Dict[str, AttachmentMe
     return idx
 
 
+def _match_cid(idx: Dict[str, AttachmentMeta], src: str) -> Optional[AttachmentMeta]:
+    if not src.lower().startswith("cid:"):
+        return None
+    for k in _cid_variants(src):
+        hit = idx.get(k)
+        if hit:
+            return hit
+    return None
+
+
+def referenced_inline_parts(html: str, attachment_metas: list[AttachmentMeta]) -> List[str]:
+    """
+    Body parts that <img src="cid:..."> tags in `html` point at, in order of
+    first use. These are the parts inline_cids_as_data_uris() needs bytes for.
+    """
+    if not html or not attachment_metas:
+        return []
+
+    idx = build_inline_index(attachment_metas)
+    parts: Dict[str, None] = {}
+    for m in _IMG_SRC_RE.finditer(html):
+        hit = _match_cid(idx, m.group(2))
+        if hit:
+            parts[hit.part] = None
+    return list(parts)
+
+
 def inline_cids_as_data_uris(
     *,
-    conn: imaplib.IMAP4,
-    uid: int,
     html: str,
     attachment_metas: list[AttachmentMeta],
-) -> str:
+    part_bytes: Mapping[str, bytes],
+) -> Tuple[str, list[AttachmentMeta]]:
     """
-    Rewrite <img src="cid:..."> to data: URIs by fetching the bytes via IMAP.
+    Rewrite <img src="cid:..."> to data: URIs using already fetched (and
+    transfer-decoded) bytes, keyed by part. Images missing from `part_bytes`
+    keep their cid: reference.
     """
     if not html or not attachment_metas:
         return html, attachment_metas
@@ -80,22 +106,11 @@ def inline_cids_as_data_uris(
 
     def repl(m: re.Match) -> str:
         prefix, src, suffix = m.group(1), m.group(2), m.group(3)
-        if not src.lower().startswith("cid:"):
-            return m.group(0)
-
-        hit: Optional[AttachmentMeta] = None
-        for k in _cid_variants(src):
-            hit = idx.get(k)
-            if hit:
-                break
+        hit = _match_cid(idx, src)
         if not hit:
             return m.group(0)
 
-        try:
-            data = fetch_part_bytes(conn, uid=uid, part=hit.part)
-        except Exception:
-            return m.group(0)
-
+        data = part_bytes.get(hit.part)
         if not data:
             return m.group(0)
         used_parts.add(hit.part)
@@ -0,0 +1,42 @@
+# openmail/imap/pipeline.py
+from __future__ import annotations
+
+import imaplib
+from typing import Any, List, Sequence, Tuple, Union
+
+Arg = Union[str, bytes]
+
+
+def pipeline(conn: imaplib.IMAP4, commands: Sequence[Sequence[Arg]]) -> List[Tuple[str, List[Any]]]:
+    """
+    Send several tagged commands in one write, then read their completions
+    in order: one round trip instead of len(commands).
+
+    Each command is (name, *args) as accepted by imaplib's `_command`, e.g.
+    ("UID", "FETCH", "1:5", "(FLAGS)"). Commands must not carry literals.
+
+    Returns one (typ, data) per command. A BAD/NO completion does not stop the
+    remaining tags from being drained, so the connection stays in sync.
+    Untagged data (FETCH, SEARCH, ...) is left in `conn.untagged_responses`;
+    pop it with `conn._untagged_response(typ, data, name)`.
+    """
+    # imaplib writes each command with its own send(); collect them and
+    # hand the whole batch to the socket in a single write.
+    chunks: List[bytes] = []
+    send = conn.send
+    conn.send = chunks.append  # type: ignore[method-assign]
+    try:
+        tags = [conn._command(*cmd) for cmd in commands]
+    finally:
+        del conn.send
+    send(b"".join(chunks))
+
+    results: List[Tuple[str, List[Any]]] = []
+    for cmd, tag in zip(commands, tags):
+        try:
+            results.append(conn._command_complete(str(cmd[0]), tag))
+        except conn.abort:
+            raise
+        except conn.error as e:
+            results.append(("BAD", [str(e).encode()]))
+    return results
@@ -1,27 +1,71 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
+
+@lru_cache(maxsize=256)
 def _imap_date(iso_yyyy_mm_dd: str) -> str:
-    dt = datetime.strptime(iso_yyyy_mm_dd, "%Y-%m-%d")
+    s = iso_yyyy_mm_dd
+    # fast path: canonical zero-padded YYYY-MM-DD
+    if len(s) == 10 and s[4] == "-" and s[7] == "-" and (s[:4] + s[5:7] + s[8:]).isdigit():
+        year, month, day = int(s[:4]), int(s[5:7]), int(s[8:])
+        if year and 1 <= month <= 12 and 1 <= day <= _DAYS_IN_MONTH[month - 1]:
+            leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+            if month != 2 or day < 29 or leap:
+                return f"{s[8:]}-{_MONTHS[month - 1]}-{s[:4]}"
+
+    # anything else (unpadded, invalid, ...) keeps strptime's behavior
+    dt = datetime.strptime(s, "%Y-%m-%d")
     return dt.strftime("%d-%b-%Y")
 
 
+# SEARCH keys whose result a STORE can change.
+_FLAG_SEARCH_KEYS_RE = re.compile(
+    r"(?<![\w-])(?:UN)?(?:ANSWERED|DELETED|DRAFT|FLAGGED|SEEN|KEYWORD)(?![\w-])"
+    r"|(?<![\w-])(?:NEW|OLD|RECENT|MODSEQ|X-GM-RAW|X-GM-LABELS)(?![\w-])",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=256)
+def criteria_reads_flags(criteria: str) -> bool:
+    """
+    Whether a SEARCH criteria string may match differently after a STORE.
+    Errs towards True: a key inside a quoted string only costs a cache miss.
+    """
+    return _FLAG_SEARCH_KEYS_RE.search(criteria) is not None
+
+
+_QUOTE_TR = str.maketrans({"\\": "\\\\", '"': '\\"'})
+
+
 def _q(s: str) -> str:
     """
     Quote/escape a string for IMAP SEARCH.
     """
-    s = s.replace("\\", "\\\\").replace('"', r"\"")
-    return f'"{s}"'
+    return f'"{s.translate(_QUOTE_TR)}"'
 
 
 @dataclass
 class IMAPQuery:
     parts: List[str] = field(default_factory=list)
 
+    # (snapshot of parts, built string); rebuilt whenever parts changes
+    _built: Optional[Tuple[List[str], str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (built string, its wire encoding)
+    _built_bytes: Optional[Tuple[str, bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     # --- basic fields ---
     def from_(self, s: str) -> IMAPQuery:
         self.parts += ["FROM", _q(s)]
@@ -162,7 +206,7 @@ class IMAPQuery:
         """
         Accepts ranges ("1:100") or explicit UIDs (1,2,3)
         """
-        joined = ",".join(str(u) for u in uids)
+        joined = ",".join(map(str, uids))
         self.parts += ["UID", joined]
         return self
 
@@ -255,6 +299,23 @@ class IMAPQuery:
     def build(self) -> str:
         if not self.parts:
             return "ALL"
+        cached = self._built
+        if cached is not None and cached[0] == self.parts:
+            return cached[1]
         s = " ".join(self.parts)
         s = s.replace("( ", "(").replace(" )", ")")
+        self._built = (list(self.parts), s)
         return s
+
+    def build_bytes(self) -> bytes:
+        """
+        build() encoded for the wire (UTF-8, so ASCII criteria are byte-identical).
+        Memoized alongside build(), so repeated sends skip the str -> bytes copy.
+        """
+        s = self.build()
+        cached = self._built_bytes
+        if cached is not None and cached[0] is s:
+            return cached[1]
+        b = s.encode("utf-8")
+        self._built_bytes = (s, b)
+        return b
@@ -0,0 +1,150 @@
+# openmail/imap/uidset.py
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+def compress_uids(uids: Iterable[int]) -> List[str]:
+    """
+    Collapse UIDs into sorted IMAP sequence-set tokens.
+
+        [5, 1, 2, 3, 9] -> ["1:3", "5", "9"]
+    """
+    ordered = sorted(set(uids))
+    if not ordered:
+        return []
+
+    lo = ordered[0]
+    if ordered[-1] - lo == len(ordered) - 1:
+        # No gaps (a whole window, "select all"): skip the per-UID loop.
+        hi = ordered[-1]
+        return [f"{lo}:{hi}" if hi > lo else str(lo)]
+
+    tokens: List[str] = []
+    hi = lo
+    for u in ordered[1:]:
+        if u == hi + 1:
+            hi = u
+            continue
+        tokens.append(f"{lo}:{hi}" if hi > lo else str(lo))
+        lo = hi = u
+    tokens.append(f"{lo}:{hi}" if hi > lo else str(lo))
+    return tokens
+
+
+def pack_uid_sets(uids: Iterable[int], *, max_bytes: int = 8192) -> List[str]:
+    """
+    Build comma-separated UID sets, each at most `max_bytes` long
+    (a single token longer than the limit still gets its own set).
+
+    Keeps command lines below server limits while using as few
+    round trips as possible.
+    """
+    sets: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    for tok in compress_uids(uids):
+        extra = len(tok) + (1 if current else 0)
+        if current and size + extra > max_bytes:
+            sets.append(",".join(current))
+            current = []
+            size = 0
+            extra = len(tok)
+        current.append(tok)
+        size += extra
+
+    if current:
+        sets.append(",".join(current))
+    return sets
+
+
+def covering_range(uids: Iterable[int], *, max_extra: float = 0.5) -> Optional[str]:
+    """
+    One "lo:hi" range spanning `uids` when it holds at most `max_extra` more
+    UIDs than requested (gaps included), else None.
+
+        [3, 5, 6, 8] -> "3:8"      [1, 50, 100] -> None
+
+    Worth it only where the extra messages' responses are small and the
+    caller drops UIDs it didn't ask for.
+    """
+    ordered = set(uids)
+    if not ordered:
+        return None
+    lo, hi = min(ordered), max(ordered)
+    if hi - lo + 1 > len(ordered) * (1 + max_extra):
+        return None
+    return f"{lo}:{hi}" if hi > lo else str(lo)
+
+
+def parse_uid_list(raw: bytes) -> List[int]:
+    """
+    Parse a plain SEARCH response ("1 5 9") into UIDs.
+
+    bytes.split() with no argument already drops empty tokens, and map(int, ...)
+    keeps the conversion loop in C.
+    """
+    return list(map(int, raw.split()))
+
+
+def expand_uid_set(uid_set: str) -> List[int]:
+    """
+    Expand an IMAP sequence set into ascending UIDs.
+
+        "1:3,5,9" -> [1, 2, 3, 5, 9]
+    """
+    uids: List[int] = []
+    for tok in uid_set.split(","):
+        tok = tok.strip()
+        if not tok:
+            continue
+        lo, sep, hi = tok.partition(":")
+        if sep:
+            a, b = int(lo), int(hi)
+            if a > b:
+                a, b = b, a
+            uids.extend(range(a, b + 1))
+        else:
+            uids.append(int(lo))
+    uids.sort()
+    return uids
+
+
+def merge_ranges(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Merge inclusive (lo, hi) ranges, joining ones that overlap or touch.
+
+        [(5, 9), (1, 3), (4, 4)] -> [(1, 9)]
+    """
+    merged: List[Tuple[int, int]] = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def subtract_ranges(lo: int, hi: int, covered: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Parts of [lo, hi] not inside `covered` (merged, ascending ranges).
+
+        subtract_ranges(1, 20, [(5, 9), (15, 30)]) -> [(1, 4), (10, 14)]
+    """
+    missing: List[Tuple[int, int]] = []
+    cur = lo
+    for a, b in covered:
+        if b < cur:
+            continue
+        if a > hi:
+            break
+        if a > cur:
+            missing.append((cur, a - 1))
+        cur = b + 1
+        if cur > hi:
+            break
+    if cur <= hi:
+        missing.append((cur, hi))
+    return missing
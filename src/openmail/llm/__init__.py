@@ -1,3 +1,3 @@
-from openmail.llm.model import get_model
+from openmail.llm.model import clear_model_cache, get_model
 
-__all__ = ["get_model"]
+__all__ = ["get_model", "clear_model_cache"]
@@ -41,6 +41,13 @@ def _get_base_llm(
     raise RuntimeError("LLM not available for the given model_name")
 
 
+def clear_model_cache() -> None:
+    """
+    Drop every cached provider chain (and the HTTP clients they hold).
+    """
+    _get_base_llm.cache_clear()
+
+
 def get_model(
     provider: str,
     model_name: str,
@@ -59,9 +66,15 @@ def get_model(
     PARSE_EXC = (JSONDecodeError, OutputParserException, ValidationError)
 
     history: List[Dict[str, str]] = []
+    # Most chains are called once; only serialize the previous reply when
+    # another turn actually needs it in the history.
+    last_reply: Optional[BaseModel] = None
 
     def run(prompt_text: str) -> Tuple[TModel, Dict[str, Any]]:
-        nonlocal history
+        nonlocal history, last_reply
+        if last_reply is not None:
+            history = history + [{"role": "assistant", "content": last_reply.model_dump_json()}]
+            last_reply = None
         infinite = retries == -1
         max_tries = float("inf") if infinite else max(1, retries)
         delay = base_delay
@@ -87,7 +100,8 @@ def get_model(
                 )
                 out_dict = model_obj.model_dump()
 
-                history = messages + [{"role": "assistant", "content": model_obj.model_dump_json()}]
+                history = messages
+                last_reply = model_obj
 
                 cost_usd = compute_cost_usd(
                     provider,
@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+from openmail._compat import DATACLASS_SLOTS
+
 
 def _normalize_content_id(cid: Optional[str]) -> Optional[str]:
     if not cid:
@@ -23,7 +25,7 @@ def _normalize_disposition(d: Optional[str]) -> Optional[str]:
     return d2 or None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AttachmentMeta:
     idx: int
     part: str
@@ -87,7 +89,7 @@ class AttachmentMeta:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Attachment(AttachmentMeta):
     data: bytes = b""
 
@@ -4,12 +4,29 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Set
 
+from openmail._compat import DATACLASS_SLOTS
 from openmail.types import EmailRef
 
 if TYPE_CHECKING:
     from openmail.models.attachment import Attachment
 
 
+def get_header(headers: Dict[str, str], key: str) -> Optional[str]:
+    """
+    Case-insensitive header lookup from EmailMessage.headers. Parsed headers
+    keep their wire casing, so the usual spelling ("List-Unsubscribe") is a
+    plain dict hit.
+    """
+    value = headers.get(key)
+    if value is not None:
+        return value
+    key_lower = key.lower()
+    for k, v in headers.items():
+        if k.lower() == key_lower:
+            return v
+    return None
+
+
 @dataclass(frozen=True)
 class EmailAddress:
     email: str
@@ -34,7 +51,7 @@ class EmailAddress:
         }
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class EmailMessage:
     ref: EmailRef
     subject: str
@@ -52,6 +69,13 @@ class EmailMessage:
     message_id: Optional[str] = None
     headers: Dict[str, str] = field(default_factory=dict)
 
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Case-insensitive header lookup (see get_header).
+        """
+        value = get_header(self.headers, name)
+        return default if value is None else value
+
     def __repr__(self) -> str:
         return (
             f"EmailMessage("
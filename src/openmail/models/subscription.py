@@ -3,10 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
+from openmail._compat import DATACLASS_SLOTS
 from openmail.types import EmailRef, SendResult
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class UnsubscribeMethod:
     """
     One unsubscribe mechanism from List-Unsubscribe.
@@ -16,7 +17,7 @@ class UnsubscribeMethod:
     value: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class UnsubscribeCandidate:
     """
     An email that supports unsubscribe.
@@ -30,8 +30,7 @@ class SubscriptionDetector:
 
         out: List[UnsubscribeCandidate] = []
         for ref, msg in zip(page.refs, msgs):
-            headers = msg.headers
-            lu = _get_header(headers, "List-Unsubscribe")
+            lu = msg.header("List-Unsubscribe")
             if not lu:
                 continue
 
@@ -48,11 +47,3 @@ class SubscriptionDetector:
                 )
             )
         return out
-
-
-def _get_header(headers: dict, name: str) -> str:
-    name = name.lower()
-    for k, v in headers.items():
-        if k.lower() == name:
-            return v
-    return ""
@@ -1,5 +1,5 @@
 from email.message import EmailMessage as PyEmailMessage
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -125,13 +125,14 @@ class SubscriptionService:
 
     def unsubscribe(
         self,
-        candidates: List[UnsubscribeCandidate],
+        candidates: Iterable[UnsubscribeCandidate],
         *,
         prefer: str = "mailto",
         from_addr: Optional[str] = None,
     ) -> Dict[str, List[UnsubscribeActionResult]]:
         """
-        Executes unsubscribe actions.
+        Executes unsubscribe actions. `candidates` is consumed lazily, so
+        a generator works without being materialized first.
 
         Behavior:
         - mailto: Sends an email to the unsubscribe address.
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+# 32-bit unsigned storage for UIDs ("I" is 4 bytes on all mainstream platforms)
+_UID_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
 
 
 @dataclass(frozen=True)
@@ -16,6 +20,48 @@ class EmailRef:
         }
 
 
+@dataclass(frozen=True, eq=False)
+class EmailRefBatch:
+    """
+    Many UIDs from one mailbox, stored contiguously in an array.
+
+    A cheaper stand-in for a list of EmailRef in bulk operations
+    (flag updates on thousands of messages).
+    """
+
+    uids: array
+    mailbox: str = "INBOX"
+    uidvalidity: Optional[int] = None
+
+    @classmethod
+    def from_uids(
+        cls, uids: Iterable[int], mailbox: str = "INBOX", *, uidvalidity: Optional[int] = None
+    ) -> EmailRefBatch:
+        return cls(uids=array(_UID_TYPECODE, uids), mailbox=mailbox, uidvalidity=uidvalidity)
+
+    @classmethod
+    def from_refs(cls, refs: Sequence[EmailRef]) -> EmailRefBatch:
+        if not refs:
+            return cls.from_uids(())
+        mailbox = refs[0].mailbox
+        if any(r.mailbox != mailbox for r in refs):
+            raise ValueError("All EmailRef.mailbox must match to build an EmailRefBatch")
+        return cls.from_uids((r.uid for r in refs), mailbox)
+
+    def to_refs(self) -> List[EmailRef]:
+        mailbox = self.mailbox
+        return [EmailRef(uid=u, mailbox=mailbox) for u in self.uids]
+
+    def __len__(self) -> int:
+        return len(self.uids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.uids)
+
+    def __repr__(self) -> str:
+        return f"EmailRefBatch(mailbox={self.mailbox!r}, uids={len(self.uids)})"
+
+
 @dataclass(frozen=True)
 class SendResult:
     ok: bool
@@ -2,9 +2,19 @@ import html as _html
 import re
 from datetime import datetime, timedelta, timezone
 from email.utils import formataddr, getaddresses, parsedate_to_datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 
 from openmail.models import EmailMessage
+from openmail.models.message import get_header as get_header
+
+# '(\\HasNoChildren) "/" "INBOX"' -> flags, delimiter, name
+_LIST_LINE_RE = re.compile(r'\((?P<flags>.*?)\)\s+(?P<delim>NIL|".*?"|\S+)\s+(?P<name>.+)')
+_LIST_LINE_BYTES_RE = re.compile(_LIST_LINE_RE.pattern.encode())
+
+try:
+    from imaplib import _decode_utf7  # type: ignore[attr-defined]
+except ImportError:  # private helper, missing from many imaplib versions
+    _decode_utf7 = None
 
 
 def iso_days_ago(days: int) -> str:
@@ -59,15 +69,6 @@ def remove_addr(pairs: List[tuple[str, str]], remove: Optional[str]) -> List[tup
     return [(n, a) for (n, a) in pairs if a.strip().lower() != rm_norm]
 
 
-def get_header(headers: Dict[str, str], key: str) -> Optional[str]:
-    """Case-insensitive header lookup from EmailMessage.headers."""
-    key_lower = key.lower()
-    for k, v in headers.items():
-        if k.lower() == key_lower:
-            return v
-    return None
-
-
 def build_references(existing_refs: Optional[str], orig_mid: str) -> str:
     if not existing_refs:
         return orig_mid
@@ -205,27 +206,25 @@ def parse_list_mailbox_name(raw: bytes | str) -> str | None:
     Returns the decoded mailbox name or None if it can't be parsed.
     """
     if isinstance(raw, bytes):
-        s = raw.decode(errors="ignore")
+        # Match on the bytes; only the name itself gets decoded.
+        mb = _LIST_LINE_BYTES_RE.match(raw.strip())
+        if not mb:
+            return None
+        name = mb.group("name").strip().decode(errors="ignore")
     else:
-        s = str(raw)
-
-    s = s.strip()
-
-    m = re.match(r'\((?P<flags>.*?)\)\s+(?P<delim>NIL|".*?"|\S+)\s+(?P<name>.+)', s)
-    if not m:
-        return None
-
-    name = m.group("name").strip()
+        m = _LIST_LINE_RE.match(str(raw).strip())
+        if not m:
+            return None
+        name = m.group("name").strip()
 
     if name.startswith('"') and name.endswith('"'):
         name = name[1:-1]
 
-    try:
-        from imaplib import _decode_utf7 as decode_utf7  # type: ignore[attr-defined]
-
-        name = decode_utf7(name)
-    except Exception:
-        pass
+    if _decode_utf7 is not None:
+        try:
+            name = _decode_utf7(name)
+        except Exception:
+            pass
 
     return name or None
 
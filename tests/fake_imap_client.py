@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from email.message import EmailMessage as PyEmailMessage
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 from openmail.errors import IMAPError
 from openmail.imap.pagination import PagedSearchResult
 from openmail.imap.parser import parse_overview, parse_rfc822
 from openmail.imap.query import IMAPQuery
 from openmail.models import EmailMessage, EmailOverview
-from openmail.types import EmailRef
+from openmail.types import EmailRef, EmailRefBatch
+
+# SEARCH key -> (flag, whether the message must have it)
+_FLAG_KEYS: Dict[str, Tuple[str, bool]] = {
+    "SEEN": (r"\Seen", True),
+    "UNSEEN": (r"\Seen", False),
+    "DELETED": (r"\Deleted", True),
+    "UNDELETED": (r"\Deleted", False),
+    "DRAFT": (r"\Draft", True),
+    "UNDRAFT": (r"\Draft", False),
+    "FLAGGED": (r"\Flagged", True),
+    "UNFLAGGED": (r"\Flagged", False),
+}
 
 
 @dataclass
@@ -32,13 +46,14 @@ class FakeIMAPClient:
       - append / flag ops / mailbox ops / copy / move / expunge / ping / close / ctx manager
 
     Notes vs old Fake:
-      - SEARCH caching removed (real IMAPClient).
+      - SEARCH result caching (opt-in on the real IMAPClient) is not modeled.
       - PagedSearchResult.total is "window total" (not global total), matching real client.
     """
 
     config: Optional[object] = None
 
-    # mailbox -> uid -> _StoredMessage
+    # mailbox -> uid -> _StoredMessage. Every insert takes a fresh UID from
+    # _next_uid, so each dict's insertion order is ascending UID order.
     _mailboxes: Dict[str, Dict[int, _StoredMessage]] = field(default_factory=dict)
     _next_uid: int = 1
 
@@ -115,41 +130,11 @@ class FakeIMAPClient:
 
     # --- SEARCH + pagination (matches current IMAPClient surface) ---------
 
-    def _matches_query(self, stored: _StoredMessage, parts: List[str]) -> bool:
+    def _matches_headers(self, msg: EmailMessage, parts: List[str]) -> bool:
         """
-        Very small subset of IMAP SEARCH semantics:
-
-        - UNSEEN / SEEN
-        - DELETED / UNDELETED
-        - DRAFT / UNDRAFT
-        - FLAGGED / UNFLAGGED
-        - HEADER "List-Unsubscribe" "" (header present)
-
-        Everything else is ignored (accept).
+        HEADER "List-Unsubscribe" "<value>" probes (an empty value means the
+        header is present).
         """
-        flags = stored.flags
-        msg = stored.msg
-
-        # Flags-based filters
-        if "UNSEEN" in parts and r"\Seen" in flags:
-            return False
-        if "SEEN" in parts and r"\Seen" not in flags:
-            return False
-        if "DELETED" in parts and r"\Deleted" not in flags:
-            return False
-        if "UNDELETED" in parts and r"\Deleted" in flags:
-            return False
-        if "DRAFT" in parts and r"\Draft" not in flags:
-            return False
-        if "UNDRAFT" in parts and r"\Draft" in flags:
-            return False
-        if "FLAGGED" in parts and r"\Flagged" not in flags:
-            return False
-        if "UNFLAGGED" in parts and r"\Flagged" in flags:
-            return False
-
-        # Simple header presence/value check:
-        # IMAPQuery.header("List-Unsubscribe", "")
         for i, token in enumerate(parts):
             if token == "HEADER" and i + 2 < len(parts):
                 name_token = parts[i + 1].strip('"')
@@ -171,15 +156,31 @@ class FakeIMAPClient:
     def _matching_uids_asc(self, *, mailbox: str, query: IMAPQuery) -> Tuple[str, List[int]]:
         """
         Return (criteria_str, matching_uids_asc) for the mailbox/query.
+
+        Very small subset of IMAP SEARCH semantics:
+
+        - SEEN / UNSEEN, DELETED / UNDELETED, DRAFT / UNDRAFT, FLAGGED / UNFLAGGED
+        - HEADER "List-Unsubscribe" "" (header present)
+
+        Everything else is ignored (accept).
         """
         criteria = query.build() or "ALL"
         box = self._mailboxes.get(mailbox, {})
         parts = query.parts
 
-        uids: List[int] = []
-        for uid in sorted(box.keys()):
-            if self._matches_query(box[uid], parts):
-                uids.append(uid)
+        # Turn the flag keys into two sets once, so each message costs two
+        # set operations instead of a scan of `parts` per key.
+        required = {_FLAG_KEYS[t][0] for t in parts if t in _FLAG_KEYS and _FLAG_KEYS[t][1]}
+        forbidden = {_FLAG_KEYS[t][0] for t in parts if t in _FLAG_KEYS and not _FLAG_KEYS[t][1]}
+        headers = "HEADER" in parts
+
+        uids = [
+            uid
+            for uid, stored in box.items()
+            if required <= stored.flags
+            and forbidden.isdisjoint(stored.flags)
+            and (not headers or self._matches_headers(stored.msg, parts))
+        ]
         return criteria, uids
 
     def search_page(
@@ -190,6 +191,7 @@ class FakeIMAPClient:
         page_size: int = 50,
         before_uid: Optional[int] = None,
         after_uid: Optional[int] = None,
+        refresh: bool = False,
     ) -> PagedSearchResult:
         """
         Mirrors current IMAPClient.search_page contract:
@@ -206,9 +208,9 @@ class FakeIMAPClient:
 
         # Define the "window" similar to the real client semantics.
         if before_uid is not None:
-            window_uids = [u for u in all_uids if u < before_uid]
+            window_uids = all_uids[: bisect_left(all_uids, before_uid)]
         elif after_uid is not None:
-            window_uids = [u for u in all_uids if u > after_uid]
+            window_uids = all_uids[bisect_right(all_uids, after_uid) :]
         else:
             # Real client uses a tail window that widens progressively; for the fake,
             # we just treat the whole match-set as the window.
@@ -315,6 +317,20 @@ class FakeIMAPClient:
                 )
         return out
 
+    @contextmanager
+    def session(self, mailbox: str, *, readonly: bool = True) -> Iterator[None]:
+        yield
+
+    def search_and_fetch(
+        self, *, mailbox: str, query: IMAPQuery, include_attachment_meta: bool = False
+    ) -> List[EmailMessage]:
+        """
+        Mirror IMAPClient.search_and_fetch(): all matches, newest first.
+        """
+        uids = self.uid_search(mailbox=mailbox, query=query)
+        refs = [EmailRef(uid=u, mailbox=mailbox) for u in reversed(uids)]
+        return self.fetch(refs, include_attachment_meta=include_attachment_meta)
+
     # --- FETCH overview ---------------------------------------------------
 
     def fetch_overview(self, refs: Sequence[EmailRef]) -> List[EmailOverview]:
@@ -439,7 +455,7 @@ class FakeIMAPClient:
     def append(
         self,
         mailbox: str,
-        msg: PyEmailMessage,
+        msg: Union[PyEmailMessage, bytes],
         *,
         flags: Optional[Set[str]] = None,
     ) -> EmailRef:
@@ -451,15 +467,19 @@ class FakeIMAPClient:
         uid = self._alloc_uid()
         ref = EmailRef(uid=uid, mailbox=mailbox)
 
-        raw = msg.as_bytes()
+        raw = msg if isinstance(msg, bytes) else msg.as_bytes()
         parsed = parse_rfc822(ref, raw, include_attachments=True)
         box[uid] = _StoredMessage(parsed, set(flags or set()))
         return ref
 
-    def add_flags(self, refs: Sequence[EmailRef], *, flags: Set[str]) -> None:
+    def add_flags(
+        self, refs: Sequence[EmailRef], *, flags: Set[str], chunk_size: Optional[int] = None
+    ) -> None:
         self._maybe_fail()
         if not refs:
             return
+        if isinstance(refs, EmailRefBatch):
+            refs = refs.to_refs()
         mailbox = self._assert_same_mailbox(refs, "add_flags")
         box = self._mailboxes.get(mailbox, {})
         for r in refs:
@@ -467,10 +487,14 @@ class FakeIMAPClient:
             if stored:
                 stored.flags |= set(flags)
 
-    def remove_flags(self, refs: Sequence[EmailRef], *, flags: Set[str]) -> None:
+    def remove_flags(
+        self, refs: Sequence[EmailRef], *, flags: Set[str], chunk_size: Optional[int] = None
+    ) -> None:
         self._maybe_fail()
         if not refs:
             return
+        if isinstance(refs, EmailRefBatch):
+            refs = refs.to_refs()
         mailbox = self._assert_same_mailbox(refs, "remove_flags")
         box = self._mailboxes.get(mailbox, {})
         for r in refs:
@@ -480,13 +504,18 @@ class FakeIMAPClient:
 
     # --- mailbox maintenance ---------------------------------------------
 
-    def expunge(self, mailbox: str = "INBOX") -> None:
+    def expunge(self, mailbox: str = "INBOX", refs: Optional[Sequence[EmailRef]] = None) -> None:
         """
-        Remove messages flagged as \\Deleted from a mailbox.
+        Remove messages flagged as \\Deleted from a mailbox (only `refs`, if given).
         """
         self._maybe_fail()
         box = self._mailboxes.get(mailbox, {})
-        to_delete = [uid for uid, s in box.items() if r"\Deleted" in s.flags]
+        only = None if refs is None else {r.uid for r in refs}
+        to_delete = [
+            uid
+            for uid, s in box.items()
+            if r"\Deleted" in s.flags and (only is None or uid in only)
+        ]
         for uid in to_delete:
             del box[uid]
 
@@ -514,6 +543,8 @@ class FakeIMAPClient:
         self._maybe_fail()
         if not refs:
             return
+        if isinstance(refs, EmailRefBatch):
+            refs = refs.to_refs()
         for r in refs:
             if r.mailbox != src_mailbox:
                 raise IMAPError("All EmailRef.mailbox must match src_mailbox for move()")
@@ -542,6 +573,8 @@ class FakeIMAPClient:
         self._maybe_fail()
         if not refs:
             return
+        if isinstance(refs, EmailRefBatch):
+            refs = refs.to_refs()
         for r in refs:
             if r.mailbox != src_mailbox:
                 raise IMAPError("All EmailRef.mailbox must match src_mailbox for copy()")
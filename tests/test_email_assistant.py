@@ -823,3 +823,33 @@ def test_evaluate_sender_trust_uses_llm(monkeypatch):
 
     assert score == 0.75
     assert info["model"] == "fake-model"
+
+
+def test_nl_query_plan_compiles_to_cached_search_tokens(monkeypatch):
+    import openmail.assistants.natural_language_query as nlq_mod
+
+    plan = nlq_mod.IMAPLowLevelPlan(
+        clauses=[
+            nlq_mod.IMAPClauses(from_=["a@example.com"], flags=nlq_mod.IMAPFlagsPlan(unseen=True)),
+            nlq_mod.IMAPClauses(subject=["invoice"]),
+        ]
+    )
+
+    def fake_get_model(provider, model_name, pydantic_model):
+        return lambda prompt: (plan, {"model": model_name})
+
+    monkeypatch.setattr(nlq_mod, "get_model", fake_get_model)
+    nlq_mod._compile_plan.cache_clear()
+
+    easy, info = nlq_mod.llm_easy_imap_query_from_nl(
+        "unread from a or invoices", provider="fake", model_name="fake-model"
+    )
+    again, _ = nlq_mod.llm_easy_imap_query_from_nl(
+        "unread from a or invoices", provider="fake", model_name="fake-model"
+    )
+
+    assert easy.query.build() == 'OR (FROM "a@example.com" UNSEEN) (SUBJECT "invoice")'
+    assert again.query.parts == easy.query.parts
+    assert again.query.parts is not easy.query.parts
+    assert nlq_mod._compile_plan.cache_info().hits == 1
+    assert info["model"] == "fake-model"
@@ -10,7 +10,7 @@ import pytest
 
 from openmail.email_manager import EmailManager
 from openmail.models import Attachment, EmailMessage, UnsubscribeCandidate, UnsubscribeMethod
-from openmail.types import EmailRef
+from openmail.types import EmailRef, EmailRefBatch
 from openmail.utils import ensure_forward_subject, ensure_reply_subject
 from tests.fake_imap_client import FakeIMAPClient
 from tests.fake_smtp_client import FakeSMTPClient
@@ -565,3 +565,40 @@ def test_health_check_with_failures(
 
     status = manager.health_check()
     assert status == {"imap": False, "smtp": False}
+
+
+def test_flags_accept_email_ref_batch(manager: EmailManager, fake_imap: FakeIMAPClient):
+    r1 = fake_imap.add_parsed_message("INBOX", make_email_message(uid=1))
+    r2 = fake_imap.add_parsed_message("INBOX", make_email_message(uid=2))
+
+    batch = EmailRefBatch.from_refs([r1, r2])
+    assert len(batch) == 2
+    assert batch.to_refs() == [r1, r2]
+
+    manager.add_flags(batch, {r"\Flagged"})
+    assert all(r"\Flagged" in fake_imap._mailboxes["INBOX"][r.uid].flags for r in (r1, r2))
+
+    manager.remove_flags(batch, {r"\Flagged"})
+    assert not any(r"\Flagged" in fake_imap._mailboxes["INBOX"][r.uid].flags for r in (r1, r2))
+
+    with pytest.raises(ValueError):
+        EmailRefBatch.from_refs([r1, EmailRef(uid=3, mailbox="Archive")])
+
+
+def test_manager_hashes_and_compares_by_identity(
+    manager: EmailManager, fake_imap: FakeIMAPClient, fake_smtp: FakeSMTPClient
+):
+    other = EmailManager(smtp=fake_smtp, imap=fake_imap)
+
+    assert manager == manager
+    assert manager != other
+    assert len({manager, other, manager}) == 2
+
+
+def test_subscription_helpers_are_built_once(manager: EmailManager):
+    manager.list_unsubscribe_candidates()
+    detector = manager._subscription_detector
+    manager.list_unsubscribe_candidates()
+
+    assert manager._subscription_detector is detector
+    assert manager._subscription_service is manager._subscription_service
@@ -324,6 +324,98 @@ def test_fetch_calls_search_then_fetch():
     assert include_attachment_meta is True
 
 
+def test_fetch_splits_refs_into_batches_and_skips_failed_batch():
+    from openmail.errors import IMAPError
+
+    mgr = FakeEmailManager()
+    easy = EmailQuery(mgr, mailbox="INBOX")
+
+    calls = []
+
+    def fetch(refs, *, include_attachment_meta=False):
+        calls.append(list(refs))
+        if refs == ["ref-2"]:
+            raise IMAPError("boom")
+        return [f"msg-{r}" for r in refs]
+
+    mgr.imap.fetch = fetch
+
+    page, msgs = easy.fetch(batch_size=1)
+
+    assert calls == [["ref-1"], ["ref-2"]]
+    assert msgs == ["msg-ref-1"]
+
+
+def test_afetch_fetches_batches_in_page_order():
+    import asyncio
+
+    mgr = FakeEmailManager()
+    easy = EmailQuery(mgr, mailbox="INBOX")
+
+    mgr.imap.fetch = lambda refs, *, include_attachment_meta=False: [f"msg-{r}" for r in refs]
+
+    page, msgs = asyncio.run(easy.afetch(batch_size=1))
+
+    assert page.refs == ["ref-1", "ref-2"]
+    assert msgs == ["msg-ref-1", "msg-ref-2"]
+
+
+def test_afetch_skips_failed_batch_like_fetch():
+    import asyncio
+
+    from openmail.errors import IMAPError
+
+    mgr = FakeEmailManager()
+    easy = EmailQuery(mgr, mailbox="INBOX")
+
+    def fetch(refs, *, include_attachment_meta=False):
+        if refs == ["ref-2"]:
+            raise IMAPError("boom")
+        return [f"msg-{r}" for r in refs]
+
+    mgr.imap.fetch = fetch
+
+    page, msgs = asyncio.run(easy.afetch(batch_size=1))
+
+    assert msgs == ["msg-ref-1"]
+
+    def always_fails(refs, *, include_attachment_meta=False):
+        raise IMAPError("down")
+
+    mgr.imap.fetch = always_fails
+
+    with pytest.raises(IMAPError, match="down"):
+        asyncio.run(easy.afetch(batch_size=1))
+
+
+def test_afetch_runs_at_most_pool_size_fetches_at_once():
+    import asyncio
+    import threading
+    import time
+
+    mgr = FakeEmailManager()
+    mgr.imap.pool_size = 1
+    easy = EmailQuery(mgr, mailbox="INBOX")
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def fetch(refs, *, include_attachment_meta=False):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return [f"msg-{r}" for r in refs]
+
+    mgr.imap.fetch = fetch
+
+    page, msgs = asyncio.run(easy.afetch(batch_size=1))
+
+    assert msgs == ["msg-ref-1", "msg-ref-2"]
+    assert peak[0] == 1
+
+
 def test_fetch_overview_calls_search_then_fetch_overview():
     mgr = FakeEmailManager()
     easy = EmailQuery(mgr, mailbox="INBOX")
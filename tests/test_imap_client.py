@@ -0,0 +1,1445 @@
+import queue
+import threading
+import time
+from email.message import EmailMessage as PyEmailMessage
+from typing import List
+
+import pytest
+
+from openmail import IMAPConfig
+from openmail.auth import PasswordAuth
+from openmail.errors import IMAPError
+from openmail.imap.bodystructure import plan_bodystructure
+from openmail.imap.client import IMAPClient, _MessagePlan, _UIDWindow
+from openmail.imap.idle import MailboxWatcher
+from openmail.imap.pagination import PagedSearchResult
+from openmail.imap.query import IMAPQuery
+from openmail.imap.uidset import (
+    compress_uids,
+    covering_range,
+    expand_uid_set,
+    merge_ranges,
+    parse_uid_list,
+    subtract_ranges,
+)
+from openmail.models import AttachmentMeta
+from openmail.types import EmailRef, EmailRefBatch
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """
+    IMAPClient whose pool holds dummy connections; tests stub out the
+    methods that would talk to a server.
+    """
+    monkeypatch.setattr(IMAPClient, "_open_new_connection", lambda self: object())
+
+    def _make(**kwargs) -> IMAPClient:
+        cfg = IMAPConfig(
+            host="imap.example.com",
+            port=993,
+            auth=PasswordAuth(username="u", password="p"),
+        )
+        return IMAPClient(cfg, **kwargs)
+
+    return _make
+
+
+def _count_searches(monkeypatch, client: IMAPClient) -> List[str]:
+    calls: List[str] = []
+
+    def fake_uncached(*, mailbox, query, page_size, before_uid, after_uid):
+        calls.append(mailbox)
+        return PagedSearchResult(refs=[EmailRef(uid=len(calls), mailbox=mailbox)], total=1)
+
+    monkeypatch.setattr(client, "_search_page_uncached", fake_uncached)
+    return calls
+
+
+def test_search_page_cache_disabled_by_default(make_client, monkeypatch):
+    client = make_client()
+    calls = _count_searches(monkeypatch, client)
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+
+    assert len(calls) == 2
+
+
+def test_search_page_cache_hit_skips_server(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    calls = _count_searches(monkeypatch, client)
+
+    first = client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    again = client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    other_page = client.search_page(mailbox="INBOX", query=IMAPQuery().unseen(), before_uid=10)
+    refreshed = client.search_page(mailbox="INBOX", query=IMAPQuery().unseen(), refresh=True)
+
+    assert again == first
+    assert again.refs == [EmailRef(uid=1, mailbox="INBOX")]
+    assert other_page.refs != first.refs
+    assert refreshed.refs != first.refs
+    assert len(calls) == 3
+
+
+def test_search_page_cache_invalidated_per_mailbox(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    calls = _count_searches(monkeypatch, client)
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery())
+    client.search_page(mailbox="Archive", query=IMAPQuery())
+    client._invalidate_search_cache("INBOX")
+    client.search_page(mailbox="INBOX", query=IMAPQuery())
+    client.search_page(mailbox="Archive", query=IMAPQuery())
+
+    assert calls == ["INBOX", "Archive", "INBOX"]
+
+
+def test_flag_changes_only_drop_searches_that_read_flags(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    calls = _count_searches(monkeypatch, client)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    monkeypatch.setattr(client, "_uid_pipeline", lambda *args, **kwargs: None)
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    client.search_page(mailbox="INBOX", query=IMAPQuery().subject("unseen"))
+    client.search_page(mailbox="INBOX", query=IMAPQuery().from_("a@example.com"))
+
+    client.add_flags([EmailRef(uid=1, mailbox="INBOX")], flags={"\\Seen"})
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    client.search_page(mailbox="INBOX", query=IMAPQuery().subject("unseen"))
+    client.search_page(mailbox="INBOX", query=IMAPQuery().from_("a@example.com"))
+
+    # UNSEEN reruns; so does the SUBJECT search whose text merely looks like a flag key
+    assert len(calls) == 5
+
+
+def test_pool_hands_returned_connection_to_waiter(make_client):
+    client = make_client(pool_size=1, pool_acquire_timeout=5)
+    got: List[object] = []
+
+    with client._acquire() as state:
+        t = threading.Thread(target=lambda: got.append(client._run(lambda s: s)))
+        t.start()
+        while not client._waiters:
+            time.sleep(0.001)
+
+    t.join()
+    assert got == [state]
+    assert list(client._idle) == [state]
+
+
+def test_pool_survives_contended_lock_free_checkins(make_client):
+    client = make_client(pool_size=2, pool_acquire_timeout=5)
+    errors: List[Exception] = []
+
+    def worker() -> None:
+        try:
+            for _ in range(300):
+                client._run(lambda s: s)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert not client._waiters
+    assert len(set(map(id, client._idle))) == 2
+
+
+def test_pool_exhausted_raises_after_timeout(make_client):
+    client = make_client(pool_size=1, pool_acquire_timeout=0.05)
+
+    errors: List[Exception] = []
+
+    def borrow() -> None:
+        try:
+            client._run(lambda s: s)
+        except IMAPError as e:
+            errors.append(e)
+
+    with client._acquire():
+        t = threading.Thread(target=borrow)
+        t.start()
+        t.join()
+
+    assert len(errors) == 1 and "exhausted" in str(errors[0])
+
+    assert not client._waiters
+
+
+def test_session_pins_one_connection_for_nested_calls(make_client, monkeypatch):
+    client = make_client(pool_size=2)
+    selects: List[tuple] = []
+    monkeypatch.setattr(
+        client,
+        "_ensure_selected",
+        lambda state, mailbox, readonly: selects.append((id(state), mailbox, readonly)),
+    )
+
+    with client.session("INBOX", readonly=False):
+        first = client._run(lambda s: s)
+        with client.session("INBOX"):
+            second = client._run(lambda s: s)
+        assert len(client._idle) == 1
+
+    assert first is second
+    assert {sel[0] for sel in selects} == {id(first)}
+    assert client._pinned() is None
+    assert len(client._idle) == 2
+
+
+def test_session_only_resets_connection_on_imap_failures(make_client, monkeypatch):
+    client = make_client(pool_size=1, max_retries=0)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    (state,) = client._idle
+    conn = state.conn
+
+    with pytest.raises(OSError, match="disk full"):
+        with client.session("INBOX"):
+            raise OSError("disk full")  # caller code, not IMAP
+    assert state.conn is conn
+
+    def op(s):
+        raise OSError("connection reset")
+
+    with client.session("INBOX"):
+        with pytest.raises(IMAPError, match="after retries"):
+            client._run(op)
+    assert state.conn is not conn
+
+
+def test_consecutive_calls_prefer_the_threads_last_connection(make_client):
+    client = make_client(pool_size=3)
+
+    first = client._run(lambda s: s)
+    second = client._run(lambda s: s)
+
+    assert second is first
+    assert len(client._idle) == 3
+
+
+def test_checkout_is_lifo_for_threads_without_affinity(make_client):
+    client = make_client(pool_size=3)
+    a, b = client._checkout(), client._checkout()
+
+    client._checkin(a)
+    client._checkin(b)
+
+    assert client._checkout() is b
+    assert client._checkout() is a
+
+
+def test_checkout_prefers_connection_with_mailbox_selected(make_client):
+    client = make_client(pool_size=3)
+    a, b = client._checkout(), client._checkout()
+    a.selected_mailbox, b.selected_mailbox = "Archive", "INBOX"
+    client._checkin(a)
+    client._checkin(b)
+
+    assert client._checkout(prefer=b, mailbox="Archive") is a
+    assert client._checkout(mailbox="Sent") is b
+
+
+@pytest.mark.parametrize("limit, overlap", [(None, True), (1, False)])
+def test_search_concurrency_is_bounded_by_pool_unless_capped(make_client, limit, overlap):
+    client = make_client(pool_size=2, max_concurrent_searches=limit)
+    barrier = threading.Barrier(2, timeout=0.5)
+    met: List[bool] = []
+
+    def op(state):
+        try:
+            barrier.wait()
+            met.append(True)
+        except threading.BrokenBarrierError:
+            met.append(False)
+
+    threads = [threading.Thread(target=client._run_search, args=(op,)) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(met) is overlap
+
+
+def test_capability_is_asked_once_per_server(make_client):
+    client = make_client(pool_size=2)
+    asked: List[int] = []
+
+    class Conn:
+        def capability(self):
+            asked.append(1)
+            return "OK", [b"IMAP4rev1 UIDPLUS MOVE"]
+
+    first, second = client._idle
+    first.conn, second.conn = Conn(), Conn()
+
+    assert "MOVE" in client._capabilities(first)
+    first.capabilities = None  # as after _reset_conn
+    assert (
+        client._capabilities(first)
+        == client._capabilities(second)
+        == {
+            "IMAP4REV1",
+            "UIDPLUS",
+            "MOVE",
+        }
+    )
+    assert len(asked) == 1
+
+
+def test_nested_run_reuses_outer_connection(make_client):
+    client = make_client(pool_size=2)
+
+    outer_inner = client._run(lambda outer: (outer, client._run(lambda inner: inner)))
+
+    assert outer_inner[0] is outer_inner[1]
+    assert len(client._idle) == 2
+
+
+@pytest.mark.parametrize(
+    "paging, expected_status",
+    [({}, 1), ({"after_uid": 10}, 1), ({"before_uid": 500}, 0)],
+)
+def test_progressive_search_polls_uidnext_at_most_once(
+    make_client, monkeypatch, paging, expected_status
+):
+    client = make_client(search_max_rounds=6, search_max_window_uids=10**9)
+    status_calls: List[str] = []
+    windows: List[tuple] = []
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    monkeypatch.setattr(
+        client, "_uidnext", lambda state, mailbox: status_calls.append(mailbox) or 100_001
+    )
+
+    def fake_window(*, state, mailbox, base, base_bytes, win):
+        windows.append((win.start, win.end))
+        return "ALL", []
+
+    monkeypatch.setattr(client, "_search_in_window", fake_window)
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery(), page_size=10, **paging)
+
+    assert len(windows) > 1
+    assert len(status_calls) == expected_status
+
+
+@pytest.mark.parametrize("paging", [{}, {"before_uid": 900}, {"after_uid": 10}])
+def test_progressive_search_keeps_uids_ascending_across_windows(make_client, monkeypatch, paging):
+    client = make_client(search_max_rounds=6, search_max_window_uids=10**9)
+    monkeypatch.setattr(client, "_uidnext", lambda state, mailbox: 1_001)
+
+    def sparse_window(*, state, mailbox, base, base_bytes, win):
+        return "ALL", [u for u in range(win.start, win.end + 1) if u % 97 == 0]
+
+    monkeypatch.setattr(client, "_search_in_window", sparse_window)
+
+    _, uids = client._search_progressive(
+        mailbox="INBOX",
+        query=IMAPQuery(),
+        page_size=2,
+        before_uid=paging.get("before_uid"),
+        after_uid=paging.get("after_uid"),
+    )
+
+    assert len(uids) > 2
+    assert list(uids) == sorted(set(uids))
+
+
+def test_progressive_search_drops_uids_outside_the_window(make_client, monkeypatch):
+    client = make_client(search_max_rounds=6, search_max_window_uids=10**9)
+    monkeypatch.setattr(client, "_uidnext", lambda state, mailbox: 1_001)
+
+    def sloppy_window(*, state, mailbox, base, base_bytes, win):
+        # Every window also reports its neighbours' edge UIDs.
+        return "ALL", [win.start - 1, win.start, win.end, win.end + 1]
+
+    monkeypatch.setattr(client, "_search_in_window", sloppy_window)
+
+    _, uids = client._search_progressive(
+        mailbox="INBOX", query=IMAPQuery(), page_size=50, before_uid=None, after_uid=None
+    )
+
+    # Windows 801:1000 then 1:800; without clipping 800 and 801 would repeat.
+    assert list(uids) == [1, 800, 801, 1000]
+
+
+def test_run_retries_with_capped_exponential_backoff(make_client, monkeypatch):
+    from openmail.imap import client as client_mod
+
+    client = make_client(max_retries=3, backoff_seconds=0.5, backoff_max=1.5)
+    sleeps: List[float] = []
+    monkeypatch.setattr(client_mod.time, "sleep", sleeps.append)
+    monkeypatch.setattr(client_mod.random, "uniform", lambda a, b: 1.0)
+
+    def op(state):
+        raise OSError("connection reset")
+
+    with pytest.raises(IMAPError, match="after retries"):
+        client._run(op)
+
+    assert sleeps == [0.5, 1.0, 1.5]
+
+
+def test_failed_reconnect_is_retried_on_next_checkout(make_client):
+    client = make_client(pool_size=1, max_retries=0)
+    server = {"up": False}
+
+    def reopen():
+        if not server["up"]:
+            raise IMAPError("IMAP network error: connection refused")
+        return "fresh"
+
+    client._open_new_connection = reopen
+
+    def op(state):
+        raise OSError("connection reset")
+
+    with pytest.raises(IMAPError, match="connection refused"):
+        client._run(op)
+    (state,) = client._idle
+    assert state.broken
+
+    server["up"] = True
+    assert client._run(lambda s: s.conn) == "fresh"
+    assert not state.broken
+
+
+@pytest.mark.parametrize("alive, reconnects", [(True, 0), (False, 1)])
+def test_stale_connection_is_checked_with_noop_before_use(make_client, alive, reconnects):
+    client = make_client(pool_size=1, idle_check_seconds=60)
+    opened: List[int] = []
+    client._open_new_connection = lambda: opened.append(1) or object()
+
+    class Conn:
+        def noop(self):
+            if not alive:
+                raise OSError("connection reset")
+            return "OK", [b"done"]
+
+    (state,) = client._idle
+    state.conn = Conn()
+    state.last_used -= 30
+    client._run(lambda s: None)  # recently used: no NOOP
+    assert opened == []
+
+    state.last_used -= 120
+    conn = client._run(lambda s: s.conn)
+
+    assert len(opened) == reconnects
+    assert isinstance(conn, Conn) is alive
+
+
+def test_stale_connection_whose_reconnect_fails_is_not_reused(make_client):
+    client = make_client(pool_size=1, idle_check_seconds=60)
+    server = {"up": False}
+
+    def reopen():
+        if not server["up"]:
+            raise IMAPError("IMAP network error: connection refused")
+        return "fresh"
+
+    class Conn:
+        def noop(self):
+            raise OSError("connection reset")
+
+    client._open_new_connection = reopen
+    (state,) = client._idle
+    state.conn = Conn()
+    state.last_used -= 120
+
+    with pytest.raises(IMAPError, match="connection refused"):
+        client._run(lambda s: s.conn)
+    # Checked back in just now, but still flagged: no waiting out idle_check_seconds.
+    assert state.broken
+
+    server["up"] = True
+    assert client._run(lambda s: s.conn) == "fresh"
+
+
+@pytest.mark.parametrize("uidnext_after, expected", [(42, 41), (43, None)])
+def test_append_without_uidplus_brackets_with_uidnext(
+    make_client, monkeypatch, uidnext_after, expected
+):
+    client = make_client()
+    uidnexts = iter([41, uidnext_after])
+
+    class Conn:
+        def append(self, mailbox, flags, date_time, raw):
+            assert raw == msg.as_bytes()
+            return "OK", [b"APPEND completed"]
+
+    monkeypatch.setattr(client, "_capabilities", lambda state: {"IMAP4REV1"})
+    monkeypatch.setattr(client, "_uidnext", lambda state, mailbox, fresh: next(uidnexts))
+    for state in client._idle:
+        state.conn = Conn()
+
+    msg = PyEmailMessage()
+    msg["Subject"] = "draft"
+
+    if expected is None:
+        with pytest.raises(IMAPError, match="could not determine UID"):
+            client.append("Drafts", msg)
+    else:
+        # Pre-serialized bytes go out as they are.
+        assert client.append("Drafts", msg.as_bytes()) == EmailRef(uid=expected, mailbox="Drafts")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"Message-ID: <a.1@example.com>\r\n\r\n", "<a.1@example.com>"),
+        (b"message-id:<b@x>\r\n\r\n", "<b@x>"),
+        (b"Message-ID:\r\n <folded@x>\r\n\r\n", "<folded@x>"),
+        (b"\r\n", None),
+    ],
+)
+def test_fetch_message_id(make_client, monkeypatch, header, expected):
+    client = make_client()
+
+    class Conn:
+        def uid(self, cmd, uid_set, attrs):
+            meta = b"1 (UID 7 BODY[HEADER.FIELDS (MESSAGE-ID)] {%d}" % len(header)
+            return "OK", [(meta, header), b")"]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    assert client.fetch_message_id(EmailRef(uid=7, mailbox="INBOX")) == expected
+
+
+def test_uidnext_is_reused_until_the_mailbox_changes(make_client):
+    client = make_client()
+    statuses: List[str] = []
+
+    class Conn:
+        def status(self, mailbox, items):
+            statuses.append(mailbox)
+            return "OK", [b'"Archive" (UIDNEXT 42)']
+
+    state = client._idle[0]
+    state.conn = Conn()
+
+    assert client._uidnext(state, "Archive") == 42
+    assert client._uidnext(state, "Archive") == 42
+    assert len(statuses) == 1
+
+    client._invalidate_search_cache("Archive", where=lambda criteria: True)
+    client._uidnext(state, "Archive")
+    assert len(statuses) == 1
+
+    client._invalidate_search_cache("Archive")
+    client._uidnext(state, "Archive")
+    client._uidnext(state, "Archive", fresh=True)
+    assert len(statuses) == 3
+
+
+@pytest.mark.parametrize(
+    "caps, expected",
+    [
+        ({"MOVE"}, ["MOVE"]),
+        ({"UIDPLUS"}, ["COPY", "pipelined STORE", "pipelined EXPUNGE"]),
+        (set(), ["COPY", "STORE", "expunge()"]),
+    ],
+)
+def test_move_follows_server_capabilities(make_client, monkeypatch, caps, expected):
+    client = make_client()
+    sent: List[str] = []
+
+    class Conn:
+        untagged_responses: dict = {}
+
+        def uid(self, command, *args):
+            sent.append(command)
+            return "OK", [b"done"]
+
+        def _command(self, name, command, *args):
+            sent.append(f"pipelined {command}")
+            return f"T{len(sent)}"
+
+        def send(self, data):
+            pass
+
+        def _command_complete(self, name, tag):
+            return "OK", [b"done"]
+
+        def expunge(self):
+            sent.append("expunge()")
+            return "OK", [None]
+
+    monkeypatch.setattr(client, "_capabilities", lambda state: caps)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    client.move([EmailRef(uid=3, mailbox="INBOX")], src_mailbox="INBOX", dst_mailbox="Archive")
+
+    assert sent == expected
+
+
+def test_batch_merges_consecutive_writes_in_order(make_client, monkeypatch):
+    client = make_client()
+    sent: List[tuple] = []
+
+    monkeypatch.setattr(
+        client,
+        "_uid_pipeline",
+        lambda state, commands: sent.append(tuple(args for args, _ in commands)),
+    )
+    monkeypatch.setattr(client, "_capabilities", lambda state: {"MOVE"})
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+
+    with client.batch():
+        for uid in (1, 2, 3):
+            client.add_flags([EmailRef(uid=uid)], flags={"\\Seen"})
+        client.remove_flags([EmailRef(uid=2)], flags={"\\Seen"})
+        for uid in (5, 6):
+            client.move([EmailRef(uid=uid)], src_mailbox="INBOX", dst_mailbox="Archive")
+        assert sent == []
+
+    # Both STOREs share one pipeline.
+    assert sent == [
+        (
+            ("STORE", "1:3", b"+FLAGS", b"(\\Seen)"),
+            ("STORE", "2", b"-FLAGS", b"(\\Seen)"),
+        ),
+        (("MOVE", "5:6", '"Archive"'),),
+    ]
+
+
+def test_batch_drops_queued_writes_when_block_raises(make_client, monkeypatch):
+    client = make_client()
+    monkeypatch.setattr(client, "_acquire", None)  # flushing would fail loudly
+
+    with pytest.raises(RuntimeError):
+        with client.batch():
+            client.copy([EmailRef(uid=1)], src_mailbox="INBOX", dst_mailbox="Archive")
+            raise RuntimeError("boom")
+
+    assert client._queue_op("copy", ("INBOX", "Archive"), [1]) is False
+
+
+@pytest.mark.parametrize(
+    "uids, expected",
+    [([3, 5, 6, 8], "3:8"), ([7], "7"), ([1, 50, 100], None), ([], None), ([1, 2, 4, 8], None)],
+)
+def test_covering_range(uids, expected):
+    assert covering_range(uids) == expected
+
+
+@pytest.mark.parametrize(
+    "uids, expected",
+    [
+        ([5, 1, 2, 3, 9], ["1:3", "5", "9"]),
+        (range(1, 10_001), ["1:10000"]),
+        ([7, 7, 8], ["7:8"]),
+        ([1, 3, 5], ["1", "3", "5"]),
+        ([*range(1, 6), *range(10, 40), 50], ["1:5", "10:39", "50"]),
+        ([], []),
+    ],
+)
+def test_compress_uids(uids, expected):
+    assert compress_uids(uids) == expected
+
+
+def test_expand_uid_set_round_trips_compressed_tokens():
+    assert expand_uid_set("1:3,5,9") == [1, 2, 3, 5, 9]
+    assert expand_uid_set("7:5") == [5, 6, 7]
+    assert expand_uid_set(",".join(compress_uids([4, 1, 2, 8]))) == [1, 2, 4, 8]
+
+
+def test_parse_uid_list_ignores_extra_whitespace():
+    assert parse_uid_list(b" 1  5 9\r\n") == [1, 5, 9]
+    assert parse_uid_list(b"") == []
+
+
+def test_range_helpers():
+    assert merge_ranges([(5, 9), (1, 3), (4, 4), (20, 25)]) == [(1, 9), (20, 25)]
+    assert subtract_ranges(1, 20, [(5, 9), (15, 30)]) == [(1, 4), (10, 14)]
+    assert subtract_ranges(5, 9, [(1, 30)]) == []
+    assert subtract_ranges(5, 9, []) == [(5, 9)]
+
+
+def test_window_search_only_queries_uncovered_ranges(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    matches = [3, 12, 18, 25]
+    sent: List[bytes] = []
+
+    def fake_search(state, criteria):
+        sent.append(criteria)
+        ranges = [tuple(map(int, r.split(b":"))) for r in criteria.split()[-1].split(b",")]
+        return [u for u in matches if any(lo <= u <= hi for lo, hi in ranges)]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    monkeypatch.setattr(client, "_uid_search_uids", fake_search)
+
+    def window(lo: int, hi: int) -> List[int]:
+        return client._search_in_window(
+            state=None, mailbox="INBOX", base="UNSEEN", base_bytes=b"UNSEEN", win=_UIDWindow(lo, hi)
+        )[1]
+
+    assert window(11, 20) == [12, 18]
+    assert window(1, 30) == [3, 12, 18, 25]
+    assert window(5, 15) == [12]
+    assert sent == [b"UNSEEN UID 11:20", b"UNSEEN UID 1:10,21:30"]
+
+    client._invalidate_search_cache("INBOX")
+    window(5, 15)
+    assert sent[-1] == b"UNSEEN UID 5:15"
+
+
+def test_move_prunes_searched_ranges_instead_of_dropping_them(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    sent: List[bytes] = []
+
+    def fake_search(state, criteria):
+        sent.append(criteria)
+        return [3, 12, 18]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    monkeypatch.setattr(client, "_uid_search_uids", fake_search)
+    monkeypatch.setattr(client, "_capabilities", lambda state: {"MOVE"})
+    monkeypatch.setattr(client, "_uid_batch", lambda *args, **kwargs: None)
+
+    def window() -> List[int]:
+        return client._search_in_window(
+            state=None, mailbox="INBOX", base="UNSEEN", base_bytes=b"UNSEEN", win=_UIDWindow(1, 20)
+        )[1]
+
+    assert window() == [3, 12, 18]
+    client.move([EmailRef(uid=12, mailbox="INBOX")], src_mailbox="INBOX", dst_mailbox="Archive")
+
+    assert window() == [3, 18]
+    assert len(sent) == 1
+
+
+def test_fetch_bodies_spreads_messages_over_pool(make_client, monkeypatch):
+    client = make_client(pool_size=2)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+
+    used = set()
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_bulk(state, sections):
+        used.add(id(state))
+        barrier.wait()
+        return {(uid, "1"): (None, f"body {uid}".encode()) for uid in sections}
+
+    monkeypatch.setattr(client, "_fetch_sections_bulk", fake_bulk)
+
+    plans = [
+        _MessagePlan(ref=EmailRef(uid=u, mailbox="INBOX"), header_bytes=b"", internaldate_raw=None)
+        for u in (1, 2)
+    ]
+    for p in plans:
+        p.plain_part = "1"
+
+    client._fetch_bodies("INBOX", plans)
+
+    assert [p.text for p in plans] == ["body 1", "body 2"]
+    assert len(used) == 2
+
+
+def test_fetch_bodies_shards_by_uid(make_client, monkeypatch):
+    client = make_client(pool_size=2)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    shards: List[List[int]] = []
+
+    def fake_bulk(state, sections):
+        shards.append(list(sections))
+        return {}
+
+    monkeypatch.setattr(client, "_fetch_sections_bulk", fake_bulk)
+
+    plans = []
+    for u in (9, 1, 8, 2):
+        p = _MessagePlan(
+            ref=EmailRef(uid=u, mailbox="INBOX"), header_bytes=b"", internaldate_raw=None
+        )
+        p.plain_part = "1"
+        plans.append(p)
+
+    client._fetch_bodies("INBOX", plans)
+
+    assert sorted(shards) == [[1, 2], [8, 9]]
+    assert [p.ref.uid for p in plans] == [9, 1, 8, 2]
+
+
+@pytest.mark.parametrize("pool_size", [1, 2])
+def test_fetch_bodies_raises_when_a_shard_cannot_run(make_client, monkeypatch, pool_size):
+    client = make_client(pool_size=pool_size)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+
+    def fake_bulk(state, sections):
+        if 8 in sections:
+            raise IMAPError("IMAP connection pool exhausted")
+        return {}
+
+    monkeypatch.setattr(client, "_fetch_sections_bulk", fake_bulk)
+
+    plans = []
+    for u in (1, 2, 8, 9):
+        p = _MessagePlan(
+            ref=EmailRef(uid=u, mailbox="INBOX"), header_bytes=b"", internaldate_raw=None
+        )
+        p.plain_part = "1"
+        plans.append(p)
+
+    with pytest.raises(IMAPError, match="pool exhausted"):
+        client._fetch_bodies("INBOX", plans)
+
+
+def test_fetch_bodies_reuses_worker_threads_until_close(make_client, monkeypatch):
+    client = make_client(pool_size=3, max_concurrent_fetches=3)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    threads = set()
+
+    def fake_bulk(state, sections):
+        threads.add(threading.current_thread().name)
+        return {(uid, "1"): (None, b"body") for uid in sections}
+
+    monkeypatch.setattr(client, "_fetch_sections_bulk", fake_bulk)
+
+    def plans():
+        out = []
+        for u in (1, 2, 3, 4, 5, 6):
+            p = _MessagePlan(
+                ref=EmailRef(uid=u, mailbox="INBOX"), header_bytes=b"", internaldate_raw=None
+            )
+            p.plain_part = "1"
+            out.append(p)
+        return out
+
+    first = plans()
+    client._fetch_bodies("INBOX", first)
+    executor = client._fetch_executor
+    client._fetch_bodies("INBOX", plans())
+
+    assert all(p.text == "body" for p in first)
+    assert client._fetch_executor is executor
+    assert threading.current_thread().name in threads
+    assert len(threads) <= 3
+
+    client.close()
+    assert client._fetch_executor is None
+
+
+def test_fetch_bodies_inlines_cid_images_with_one_bulk_fetch(make_client, monkeypatch):
+    client = make_client(pool_size=1)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    requests: List[dict] = []
+    html = b'<img src="cid:logo@x"><img src="cid:logo@x">'
+
+    def fake_bulk(state, sections):
+        requests.append(dict(sections))
+        out = {}
+        for uid, parts in sections.items():
+            for part in parts:
+                if part == "2":
+                    out[(uid, part)] = (b"Content-Type: text/html\r\n\r\n", html)
+                else:
+                    out[(uid, part)] = (b"Content-Transfer-Encoding: base64\r\n\r\n", b"aW1n")
+        return out
+
+    monkeypatch.setattr(client, "_fetch_sections_bulk", fake_bulk)
+
+    plans = []
+    for u in (1, 2):
+        p = _MessagePlan(
+            ref=EmailRef(uid=u, mailbox="INBOX"), header_bytes=b"", internaldate_raw=None
+        )
+        p.html_part = "2"
+        p.attachments = [
+            AttachmentMeta(
+                idx=0,
+                part="3",
+                filename="logo.png",
+                content_type="image/png",
+                size=3,
+                content_id="<logo@x>",
+                is_inline=True,
+            )
+        ]
+        plans.append(p)
+
+    client._fetch_bodies("INBOX", plans)
+
+    assert requests == [{1: ("2",), 2: ("2",)}, {1: ("3",), 2: ("3",)}]
+    assert all(p.html.count("data:image/png;base64,aW1n") == 2 for p in plans)
+    assert all(p.attachments == [] for p in plans)
+
+
+def test_speculative_sections_skip_the_body_round_trip(make_client, monkeypatch):
+    client = make_client(speculative_sections=("1", "2"))
+    commands: List[tuple] = []
+    bs = b'("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 5 1)'
+
+    class Conn:
+        def uid(self, cmd, uid_set, attrs):
+            commands.append((cmd, uid_set, attrs))
+            return "OK", [
+                (b"1 (UID 7 BODYSTRUCTURE " + bs + b" BODY[HEADER] {13}", b"Subject: hi\r\n"),
+                (b" BODY[1.MIME] {28}", b"Content-Type: text/plain\r\n\r\n"),
+                (b" BODY[1] {5}", b"hello"),
+                (b" BODY[2.MIME] NIL BODY[2] {0}", b""),
+                b")",
+            ]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    [msg] = client.fetch([EmailRef(uid=7, mailbox="INBOX")])
+
+    assert msg.text == "hello"
+    assert len(commands) == 1
+    assert commands[0][2].endswith("BODY.PEEK[1.MIME] BODY.PEEK[1] BODY.PEEK[2.MIME] BODY.PEEK[2])")
+
+
+def test_single_part_fetch_takes_one_round_trip_by_default(make_client, monkeypatch):
+    client = make_client()
+    commands: List[tuple] = []
+    bs = b'("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 5 1)'
+
+    class Conn:
+        def uid(self, cmd, uid_set, attrs):
+            commands.append((cmd, uid_set, attrs))
+            return "OK", [
+                (b"1 (UID 7 BODYSTRUCTURE " + bs + b" BODY[HEADER] {13}", b"Subject: hi\r\n"),
+                (b" BODY[1.MIME] {28}", b"Content-Type: text/plain\r\n\r\n"),
+                (b" BODY[1] {5}", b"hello"),
+                b")",
+            ]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    [msg] = client.fetch([EmailRef(uid=7, mailbox="INBOX")])
+
+    assert msg.text == "hello"
+    assert len(commands) == 1
+
+
+def test_fetch_sections_bulk_groups_uids_and_demultiplexes(make_client):
+    client = make_client()
+    commands: List[tuple] = []
+    writes: List[bytes] = []
+
+    class Conn:
+        untagged_responses: dict = {}
+
+        def _command(self, name, cmd, uid_set, want):
+            commands.append((uid_set, want))
+            self.send(f"T{len(commands)} {name} {cmd} {uid_set} {want}\r\n".encode())
+            if "BODY.PEEK[2]" in want:
+                # UID only in the trailing text, after the literals
+                data = [
+                    (b"5 (BODY[1.MIME] {4}", b"m5-1"),
+                    (b" BODY[1] {4}", b"b5-1"),
+                    (b" BODY[2.MIME] {4}", b"m5-2"),
+                    (b" BODY[2] {4}", b"b5-2"),
+                    b" UID 50)",
+                ]
+            else:
+                data = [
+                    (b"1 (UID 10 BODY[1.MIME] {4}", b"m1-1"),
+                    (b" BODY[1] {4}", b"b1-1"),
+                    b")",
+                    b"3 (UID 99 FLAGS (\\Seen))",
+                    (b"2 (UID 11 BODY[1.MIME] {4}", b"m2-1"),
+                    (b" BODY[1] {4}", b"b2-1"),
+                    b")",
+                ]
+            self.untagged_responses.setdefault("FETCH", []).extend(data)
+            return f"T{len(commands)}"
+
+        def send(self, data):
+            writes.append(data)
+
+        def _command_complete(self, name, tag):
+            return "OK", [b"done"]
+
+        def _untagged_response(self, typ, dat, name):
+            return typ, self.untagged_responses.pop(name, [None])
+
+    class State:
+        conn = Conn()
+
+    out = client._fetch_sections_bulk(State(), {10: ("1",), 11: ("1",), 50: ("1", "2")})
+
+    # both commands leave in a single write
+    assert len(writes) == 1 and writes[0].count(b"\r\n") == 2
+    assert sorted(commands) == [
+        ("10:11", "(UID BODY.PEEK[1.MIME] BODY.PEEK[1])"),
+        ("50", "(UID BODY.PEEK[1.MIME] BODY.PEEK[1] BODY.PEEK[2.MIME] BODY.PEEK[2])"),
+    ]
+    assert out == {
+        (10, "1"): (b"m1-1", b"b1-1"),
+        (11, "1"): (b"m2-1", b"b2-1"),
+        (50, "1"): (b"m5-1", b"b5-1"),
+        (50, "2"): (b"m5-2", b"b5-2"),
+    }
+
+
+def test_plan_bodystructure_memoizes_by_raw_string():
+    raw = (
+        '(("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL "7BIT" 5 1)'
+        '("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "7BIT" 9 1) "ALTERNATIVE")'
+    )
+    plan_bodystructure.cache_clear()
+
+    plain, html, atts = plan_bodystructure(raw)
+    again = plan_bodystructure(raw)
+
+    assert (plain.part, html.part, atts) == ("1", "2", ())
+    assert again[0] is plain
+    assert plan_bodystructure.cache_info().hits == 1
+
+
+def test_mailbox_statuses_pipelines_and_matches_by_name(make_client):
+    client = make_client()
+    sent: List[tuple] = []
+
+    class Conn:
+        untagged_responses: dict = {}
+
+        def _command(self, name, mailbox, items):
+            sent.append((name, mailbox))
+            return f"T{len(sent)}"
+
+        def send(self, data):
+            pass
+
+        def _command_complete(self, name, tag):
+            # Replies arrive out of order; only the names tie them back.
+            if tag == "T2":
+                self.untagged_responses["STATUS"] = [
+                    b'"Sent Items" (MESSAGES 2 UNSEEN 0 UIDNEXT 3)',
+                    b"INBOX (MESSAGES 5 UNSEEN 1 UIDNEXT 9 UIDVALIDITY 7)",
+                ]
+            return "OK", [b"done"]
+
+        def _untagged_response(self, typ, dat, name):
+            return typ, self.untagged_responses.pop(name, [None])
+
+    for state in client._idle:
+        state.conn = Conn()
+
+    out = client.mailbox_statuses(["inbox", "Sent Items", "inbox"])
+
+    assert sent == [("STATUS", "INBOX"), ("STATUS", '"Sent Items"')]
+    assert out == {
+        "inbox": {"messages": 5, "unseen": 1, "uidnext": 9, "uidvalidity": 7},
+        "Sent Items": {"messages": 2, "unseen": 0, "uidnext": 3},
+    }
+
+
+@pytest.mark.parametrize("caps", [{"LIST-STATUS"}, set()])
+def test_mailbox_status_all_uses_list_status_when_offered(make_client, monkeypatch, caps):
+    client = make_client()
+    sent: List[tuple] = []
+
+    class Conn:
+        untagged_responses: dict = {}
+
+        def _simple_command(self, name, *args):
+            sent.append((name, *args))
+            self.untagged_responses["LIST"] = [b'(\\HasNoChildren) "/" INBOX']
+            self.untagged_responses["STATUS"] = [
+                b"INBOX (MESSAGES 5 UNSEEN 1)",
+                b'"Old (2019)" (MESSAGES 2 UNSEEN 0)',
+            ]
+            return "OK", [b"done"]
+
+        def _untagged_response(self, typ, dat, name):
+            return typ, self.untagged_responses.pop(name, [None])
+
+        def list(self):
+            sent.append(("LIST",))
+            return "OK", [b'(\\HasNoChildren) "/" INBOX', b'(\\HasNoChildren) "/" "Old (2019)"']
+
+    monkeypatch.setattr(client, "_capabilities", lambda state: caps)
+    monkeypatch.setattr(
+        client, "mailbox_statuses", lambda names: {name: {"messages": 0} for name in names}
+    )
+    for state in client._idle:
+        state.conn = Conn()
+
+    out = client.mailbox_status_all()
+
+    if caps:
+        assert sent == [("LIST", '""', '"*"', "RETURN", f"(STATUS {client._STATUS_ITEMS})")]
+        assert out == {
+            "INBOX": {"messages": 5, "unseen": 1},
+            "Old (2019)": {"messages": 2, "unseen": 0},
+        }
+    else:
+        assert sent == [("LIST",)]
+        assert out == {"INBOX": {"messages": 0}, "Old (2019)": {"messages": 0}}
+
+
+def test_ensure_selected_skips_reselect_and_forgets_failed_select(make_client):
+    client = make_client()
+    selects: List[tuple] = []
+
+    class Conn:
+        fail = False
+
+        def select(self, mailbox, readonly=False):
+            selects.append((mailbox, readonly))
+            return ("NO" if self.fail else "OK"), [b"3"]
+
+        def response(self, code):
+            return code, [b"7"]
+
+    state = client._idle[0]
+    state.conn = Conn()
+
+    client._ensure_selected(state, "INBOX", readonly=False)
+    client._ensure_selected(state, "INBOX", readonly=True)
+    client._ensure_selected(state, "INBOX", readonly=False)
+    assert selects == [("INBOX", False)]
+
+    state.conn.fail = True
+    with pytest.raises(IMAPError):
+        client._ensure_selected(state, "Archive", readonly=True)
+    assert state.selected_mailbox is None
+
+    state.conn.fail = False
+    client._ensure_selected(state, "INBOX", readonly=True)
+    assert selects[-1] == ("INBOX", True)
+
+
+def test_select_readwrite_for_reads_avoids_upgrade(make_client):
+    client = make_client(select_readwrite_for_reads=True)
+    selects: List[tuple] = []
+
+    class Conn:
+        def select(self, mailbox, readonly=False):
+            selects.append((mailbox, readonly))
+            return "OK", [b"3"]
+
+        def response(self, code):
+            return code, [None]
+
+    state = client._idle[0]
+    state.conn = Conn()
+
+    client._ensure_selected(state, "INBOX", readonly=True)
+    client._ensure_selected(state, "INBOX", readonly=False)
+
+    assert selects == [("INBOX", False)]
+
+
+def test_uidvalidity_change_invalidates_search_cache(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60.0)
+    calls = _count_searches(monkeypatch, client)
+
+    client._note_uidvalidity("INBOX", [b"7"])
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    client._note_uidvalidity("INBOX", [b"7"])
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    assert len(calls) == 1
+
+    client._note_uidvalidity("INBOX", [b"8"])
+    client.search_page(mailbox="INBOX", query=IMAPQuery().unseen())
+    assert len(calls) == 2
+
+
+def test_parse_status_reads_last_group_and_maps_keys(make_client):
+    client = make_client()
+
+    raw = b'"Old (2019) UNSEEN 9" (MESSAGES 3 UNSEEN 1 X-GUID 5 MAILBOXID abc uidnext 12)'
+
+    assert client._parse_status(raw) == {"messages": 3, "unseen": 1, "x-guid": 5, "uidnext": 12}
+
+
+def test_list_mailboxes_parses_all_lines_in_one_pass(make_client):
+    client = make_client()
+
+    class Conn:
+        def list(self):
+            return "OK", [
+                b'(\\HasNoChildren) "/" "INBOX"',
+                b'(\\Noselect \\HasChildren) "/" "[Gmail]"',
+                b'(\\HasNoChildren \\All) "/" "[Gmail]/All Mail"',
+                b'(\\HasNoChildren) "." Drafts',
+                b'(\\HasNoChildren) NIL "Say \\"hi\\""',
+                (b'(\\HasNoChildren) "/" {3}', b"Odd"),
+            ]
+
+    for state in client._idle:
+        state.conn = Conn()
+
+    assert client.list_mailboxes() == ["INBOX", "[Gmail]/All Mail", "Drafts", 'Say "hi"']
+
+
+def test_fetch_attachment_takes_one_round_trip(make_client, monkeypatch):
+    client = make_client()
+    sent: List[str] = []
+
+    class Conn:
+        def uid(self, command, uid_set, attrs):
+            sent.append(attrs)
+            return "OK", [
+                (b"1 (UID 7 BODY[2.MIME] {35}", b"Content-Transfer-Encoding: base64\r\n"),
+                (b" BODY[2] {8}", b"aGVsbG8="),
+                b")",
+            ]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    assert client.fetch_attachment(EmailRef(uid=7, mailbox="INBOX"), "2") == b"hello"
+    assert sent == ["(UID BODY.PEEK[2.MIME] BODY.PEEK[2])"]
+
+
+def test_fetch_overview_sends_compressed_uid_ranges(make_client, monkeypatch):
+    client = make_client()
+    sent: List[str] = []
+
+    class Conn:
+        def uid(self, command, uid_set, attrs):
+            sent.append(uid_set)
+            return "OK", [
+                (b"1 (UID 3 FLAGS (\\Seen) BODY[HEADER.FIELDS (SUBJECT)] {9}", b"Subject: a\r\n"),
+                b")",
+            ]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    from openmail.imap import client as client_mod
+
+    idle_while_parsing: List[int] = []
+    real_parse = client_mod.parse_overview
+
+    def parse_overview(*args, **kwargs):
+        idle_while_parsing.append(len(client._idle))
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(client_mod, "parse_overview", parse_overview)
+
+    refs = [EmailRef(uid=u, mailbox="INBOX") for u in (5, 3, 4, 20, 1, 2)]
+    [overview] = client.fetch_overview(refs)
+
+    assert sent == ["1:5,20"]
+    assert overview.ref.uid == 3
+    # parsed after the connection went back to the pool
+    assert idle_while_parsing == [client.pool_size]
+
+    # dense enough: one covering range
+    client.fetch_overview([EmailRef(uid=u, mailbox="INBOX") for u in (5, 3, 4, 9, 1, 2)])
+    assert sent[-1] == "1:9"
+
+
+def test_fetch_overview_parses_each_message_in_ref_order(make_client, monkeypatch):
+    client = make_client()
+
+    class Conn:
+        def uid(self, command, uid_set, attrs):
+            return "OK", [
+                (b"1 (FLAGS (\\Seen) BODY[HEADER.FIELDS (SUBJECT)] {12}", b"Subject: a\r\n\r\n"),
+                b" UID 3)",
+                b"2 (UID 4 FLAGS (\\Flagged))",
+                (b"3 (UID 5 BODY[HEADER.FIELDS (SUBJECT)] {12}", b"Subject: b\r\n\r\n"),
+                b")",
+            ]
+
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    refs = [EmailRef(uid=u, mailbox="INBOX") for u in (5, 4, 3)]
+    overviews = client.fetch_overview(refs)
+
+    assert [o.ref.uid for o in overviews] == [5, 3]
+    assert [o.subject for o in overviews] == ["b", "a"]
+
+
+@pytest.mark.parametrize("caps", [{"UIDPLUS"}, set()])
+def test_expunge_refs_uses_uid_expunge_only(make_client, monkeypatch, caps):
+    client = make_client()
+    sent: List[tuple] = []
+
+    class Conn:
+        untagged_responses: dict = {}
+
+        def uid(self, command, *args):
+            sent.append((command, *args))
+            return "OK", [None]
+
+        def expunge(self):
+            sent.append(("expunge()",))
+            return "OK", [None]
+
+    monkeypatch.setattr(client, "_capabilities", lambda state: caps)
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+    for state in client._idle:
+        state.conn = Conn()
+
+    refs = [EmailRef(uid=u, mailbox="INBOX") for u in (4, 2, 3)]
+    if caps:
+        client.expunge("INBOX", refs)
+        assert sent == [("EXPUNGE", "2:4")]
+    else:
+        with pytest.raises(IMAPError, match="UIDPLUS"):
+            client.expunge("INBOX", refs)
+        assert sent == []
+
+
+def test_close_overlaps_logouts(make_client):
+    client = make_client(pool_size=3)
+    barrier = threading.Barrier(3, timeout=5)
+    logged_out: List[int] = []
+
+    class Conn:
+        def logout(self):
+            # Only returns once all three LOGOUTs are in flight together.
+            barrier.wait()
+            logged_out.append(1)
+
+    for state in client._idle:
+        state.conn = Conn()
+
+    client.close()
+
+    assert len(logged_out) == 3
+    assert not client._idle
+
+
+def test_watch_dispatches_idle_updates_and_invalidates_cache(make_client, monkeypatch):
+    client = make_client(search_cache_ttl=60)
+    calls = _count_searches(monkeypatch, client)
+    lines: queue.Queue[bytes] = queue.Queue()
+    sent: List[bytes] = []
+
+    class Sock:
+        def settimeout(self, t):
+            pass
+
+    class Conn:
+        sock = Sock()
+
+        def select(self, mailbox, readonly=False):
+            return "OK", [b"3"]
+
+        def _new_tag(self):
+            return b"W1"
+
+        def send(self, data):
+            sent.append(data)
+            if data.endswith(b"IDLE\r\n"):
+                lines.put(b"+ idling")
+                lines.put(b"* 4 EXISTS")
+                lines.put(b"* 2 FETCH (FLAGS (\\Seen))")
+            elif data == b"DONE\r\n":
+                lines.put(b"W1 OK IDLE done")
+
+        def _get_line(self):
+            return lines.get(timeout=5)
+
+        def logout(self):
+            pass
+
+    monkeypatch.setattr(IMAPClient, "_open_new_connection", lambda self: Conn())
+    events: queue.Queue = queue.Queue()
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery().from_("a@example.com"))
+    with client.watch(["INBOX"], events.put):
+        first, second = events.get(timeout=5), events.get(timeout=5)
+
+    assert (first.kind, first.number) == ("EXISTS", 4)
+    assert (second.kind, second.number) == ("FETCH", 2)
+    assert sent[0] == b"W1 IDLE\r\n" and sent[-1] == b"DONE\r\n"
+
+    client.search_page(mailbox="INBOX", query=IMAPQuery().from_("a@example.com"))
+    assert len(calls) == 2
+
+
+def test_watch_backs_off_between_reconnects(make_client, monkeypatch):
+    from openmail.imap import idle as idle_mod
+
+    client = make_client()
+    monkeypatch.setattr(idle_mod.random, "uniform", lambda a, b: 1.0)
+
+    def refuse(self):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(IMAPClient, "_open_new_connection", refuse)
+    watcher = MailboxWatcher(
+        client, ["INBOX"], lambda event: None, retry_seconds=1.0, retry_max_seconds=5.0
+    )
+    delays: List[float] = []
+
+    def fake_wait(timeout):
+        delays.append(timeout)
+        if len(delays) == 5:
+            watcher._stop.set()
+        return watcher._stop.is_set()
+
+    monkeypatch.setattr(watcher._stop, "wait", fake_wait)
+    watcher._watch("INBOX")
+
+    assert delays == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_move_accepts_batch_and_rejects_foreign_refs(make_client, monkeypatch):
+    client = make_client()
+    sent: List[tuple] = []
+    monkeypatch.setattr(
+        client,
+        "_uid_batch",
+        lambda state, command, uid_sets, *args, what: sent.append((command, uid_sets)),
+    )
+    monkeypatch.setattr(client, "_capabilities", lambda state: {"MOVE"})
+    monkeypatch.setattr(client, "_ensure_selected", lambda state, mailbox, readonly: None)
+
+    batch = EmailRefBatch.from_uids([9, 7, 8], mailbox="INBOX")
+    client.move(batch, src_mailbox="INBOX", dst_mailbox="Archive")
+    assert sent == [("MOVE", ["7:9"])]
+
+    with pytest.raises(IMAPError, match="must match"):
+        client.move(batch, src_mailbox="Sent", dst_mailbox="Archive")
+    with pytest.raises(IMAPError, match="must match"):
+        client.copy(
+            [EmailRef(uid=1, mailbox="INBOX"), EmailRef(uid=2, mailbox="Sent")],
+            src_mailbox="INBOX",
+            dst_mailbox="Archive",
+        )
+
+
+def test_new_tls_connections_resume_the_last_session(monkeypatch):
+    import openmail.imap.client as client_mod
+
+    opened: List[dict] = []
+
+    class FakeSSL:
+        def __init__(self, host, port, *, timeout, ssl_context, tls_session):
+            opened.append({"ssl_context": ssl_context, "tls_session": tls_session})
+            self.ssl_context = ssl_context or "ctx"
+            self.sock = type("Sock", (), {"session": f"session-{len(opened)}"})()
+
+    class Auth:
+        def apply_imap(self, conn, ctx):
+            pass
+
+    monkeypatch.setattr(client_mod, "_IMAP4_SSL", FakeSSL)
+    IMAPClient(IMAPConfig(host="imap.example.com", auth=Auth()), pool_size=3)
+
+    assert opened == [
+        {"ssl_context": None, "tls_session": None},
+        {"ssl_context": "ctx", "tls_session": "session-1"},
+        {"ssl_context": "ctx", "tls_session": "session-2"},
+    ]
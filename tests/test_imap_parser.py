@@ -0,0 +1,36 @@
+from openmail.imap.parser import parse_headers_and_bodies, parse_overview
+from openmail.types import EmailRef
+
+HEADERS = (
+    b"From: =?utf-8?q?Doe=2C_J=C3=B6hn?= <j@example.com>\r\n"
+    b"To: a@example.com\r\n"
+    b'To: "C, D" <c@example.com>\r\n'
+    b"Subject: =?utf-8?q?Hello?=\r\n world\r\n"
+    b"Date: Mon, 1 Jan 2024 10:00:00 +0000\r\n"
+    b"Message-ID: <m1@example.com>\r\n"
+    b"\r\n"
+)
+
+
+def test_parse_overview_decodes_folded_and_encoded_headers():
+    ov = parse_overview(EmailRef(uid=1), set(), HEADERS)
+
+    assert ov.subject == "Hello world"
+    assert (ov.from_email.name, ov.from_email.email) == ("Doe, Jöhn", "j@example.com")
+    assert [a.email for a in ov.to] == ["a@example.com", "c@example.com"]
+    assert ov.sent_at is not None and ov.sent_at.year == 2024
+    assert ov.headers["Subject"] == "Hello world"
+
+
+def test_parse_headers_and_bodies_handles_8bit_headers():
+    msg = parse_headers_and_bodies(
+        EmailRef(uid=2),
+        "Subject: café\r\nFrom: a@example.com\r\n\r\n".encode(),
+        text="body",
+        html="",
+        attachments=[],
+    )
+
+    assert msg.subject == "café"
+    assert msg.from_email.email == "a@example.com"
+    assert msg.text == "body"
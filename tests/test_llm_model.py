@@ -9,7 +9,7 @@ from openmail.llm.costs import (
     _lookup_price,
     compute_cost_usd,
 )
-from openmail.llm.model import _get_base_llm, get_model
+from openmail.llm.model import _get_base_llm, clear_model_cache, get_model
 
 # ---------------------------------------------------------------------------
 # Fixtures / helpers
@@ -179,6 +179,25 @@ def test_get_base_llm_unknown_provider_raises():
         _get_base_llm("unknown-provider", "some-model", DummyModel)
 
 
+def test_clear_model_cache_rebuilds_chain(monkeypatch):
+    from openmail.llm import model as model_mod
+
+    calls: List[str] = []
+
+    def fake_get_openai(model_name, pydantic_model, temperature, timeout):
+        calls.append(model_name)
+        return object()
+
+    monkeypatch.setattr(model_mod, "get_openai", fake_get_openai)
+
+    first = _get_base_llm("openai", "gpt-5-mini", DummyModel)
+    assert _get_base_llm("openai", "gpt-5-mini", DummyModel) is first
+
+    clear_model_cache()
+    assert _get_base_llm("openai", "gpt-5-mini", DummyModel) is not first
+    assert calls == ["gpt-5-mini", "gpt-5-mini"]
+
+
 def test_lookup_price_known_model_openai():
     prices = _lookup_price("openai", "gpt-5-mini")
     assert prices["input"] > 0
@@ -182,3 +182,21 @@ def test_smtp_failure_when_provider_raises():
 
     assert "SMTP XOAUTH2 auth failed:" in str(excinfo.value)
     assert "kaboom" in str(excinfo.value)
+
+
+def test_xoauth2_payload_is_reused_until_token_changes():
+    auth = OAuth2Auth(
+        username="user@example.com",
+        token_provider=make_token_provider("tok-1"),
+    )
+
+    raw1, b64_1 = auth._xoauth2("tok-1")
+    raw2, b64_2 = auth._xoauth2("tok-1")
+    assert raw1 is raw2
+    assert b64_1 is b64_2
+
+    raw3, _ = auth._xoauth2("tok-2")
+    assert b"auth=Bearer tok-2" in raw3
+
+    # cache does not take part in equality
+    assert auth == OAuth2Auth(username="user@example.com", token_provider=auth.token_provider)
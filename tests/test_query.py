@@ -1,3 +1,5 @@
+import pytest
+
 import openmail.imap.query as qmod
 from openmail.imap.query import IMAPQuery
 
@@ -6,6 +8,14 @@ def test_imap_date_formats_correctly():
     _imap_date = qmod._imap_date
     assert _imap_date("2025-01-02") == "02-Jan-2025"
     assert _imap_date("1999-12-31") == "31-Dec-1999"
+    assert _imap_date("2024-02-29") == "29-Feb-2024"
+
+
+def test_imap_date_rejects_invalid_dates():
+    _imap_date = qmod._imap_date
+    for bad in ("2023-02-29", "2025-13-01", "2025-04-31", "not-a-date"):
+        with pytest.raises(ValueError):
+            _imap_date(bad)
 
 
 def test_q_quotes_and_escapes():
@@ -229,3 +239,25 @@ def test_chaining_builds_expected_query():
     assert q.build() == (
         'FROM "a@example.com" ' 'TO "b@example.com" ' "UNSEEN " "SINCE 01-Jan-2025 " "SMALLER 5000"
     )
+
+
+def test_build_is_cached_and_tracks_mutation():
+    q = IMAPQuery().unseen()
+    first = q.build()
+    assert q.build() is first
+
+    q.from_("a@example.com")
+    assert q.build() == 'UNSEEN FROM "a@example.com"'
+
+    q.parts.append("FLAGGED")
+    assert q.build() == 'UNSEEN FROM "a@example.com" FLAGGED'
+
+
+def test_build_bytes_is_utf8_and_memoized():
+    q = IMAPQuery().unseen().subject("café")
+    b = q.build_bytes()
+    assert b == 'UNSEEN SUBJECT "café"'.encode()
+    assert q.build_bytes() is b
+
+    q.flagged()
+    assert q.build_bytes().endswith(b" FLAGGED")
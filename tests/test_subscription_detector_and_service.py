@@ -14,6 +14,7 @@ from openmail.models import (
 from openmail.subscription.detector import SubscriptionDetector
 from openmail.subscription.service import SubscriptionService
 from openmail.types import EmailRef, SendResult
+from openmail.utils import get_header
 from tests.fake_imap_client import FakeIMAPClient
 from tests.fake_smtp_client import FakeSMTPClient
 
@@ -177,11 +178,22 @@ def test_subscription_detector_builds_candidates_and_uses_query(monkeypatch):
 
 
 def test_get_header_is_case_insensitive():
-    """Small unit test for internal _get_header helper."""
     h = {"List-Unsubscribe": "<mailto:x@example.com>", "Other": "value"}
-    assert detector_mod._get_header(h, "List-Unsubscribe") == "<mailto:x@example.com>"
-    assert detector_mod._get_header(h, "list-unsubscribe") == "<mailto:x@example.com>"
-    assert detector_mod._get_header(h, "missing") == ""
+    assert get_header(h, "List-Unsubscribe") == "<mailto:x@example.com>"
+    assert get_header(h, "list-unsubscribe") == "<mailto:x@example.com>"
+    assert get_header(h, "missing") is None
+
+
+def test_email_message_header_is_case_insensitive():
+    msg = _mk_email_message(
+        subject="s",
+        from_email="a@example.com",
+        headers={"List-Unsubscribe": "<mailto:x@example.com>"},
+    )
+    assert msg.header("List-Unsubscribe") == "<mailto:x@example.com>"
+    assert msg.header("LIST-UNSUBSCRIBE") == "<mailto:x@example.com>"
+    assert msg.header("missing") is None
+    assert msg.header("missing", "") == ""
 
 
 def test_unsubscribe_mailto_sends_email():